@@ -3,9 +3,36 @@ AI-based website review with strict evidence requirements.
 Returns structured scores (0-50 points) with mandatory evidence citations.
 """
 
+import asyncio
+import hashlib
 import json
-from typing import Dict, Any
-from openai import OpenAI
+import os
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+from openai import AsyncOpenAI
+
+from helpers.engine_loop import loop_local, run_sync
+from helpers.cache_store import TTLByteLRU, DiskBlobStore
+from helpers.deadline import Deadline, DeadlineExceeded, cap_timeout
+
+
+AI_MODEL = "gpt-4o"
+AI_TEMPERATURE = 0.3
+
+# Per-request timeout for the review call (further capped by the scoring deadline)
+AI_REQUEST_TIMEOUT = 60.0
+
+# Bump whenever SYSTEM_PROMPT, _build_user_content() or the response handling
+# changes, so reviews cached under the old prompt are no longer served. This is
+# also the AI component version stamped on stored scores (helpers.component_versions)
+PROMPT_VERSION = "1"
+
+# Review cache keyed on the prompt inputs: in-process LRU plus an optional
+# on-disk tier (AI_REVIEW_CACHE_DIR) shared by worker processes
+AI_REVIEW_CACHE_TTL_HOURS = int(os.getenv("AI_REVIEW_CACHE_TTL_HOURS", "168"))
+AI_REVIEW_CACHE_MAX_MB = int(os.getenv("AI_REVIEW_CACHE_MAX_MB", "32"))
+AI_REVIEW_CACHE_DIR = os.getenv("AI_REVIEW_CACHE_DIR", "").strip()
+AI_REVIEW_CACHE_DISK_MAX_MB = int(os.getenv("AI_REVIEW_CACHE_DISK_MAX_MB", "256"))
 
 
 SYSTEM_PROMPT = """You are a website audit expert helping entrepreneurs identify sales opportunities for web development and AI integration services.
@@ -23,27 +50,14 @@ CRITICAL RULES:
 5. Focus on business impact and sales opportunities"""
 
 
-def score_with_ai(
+def _build_user_content(
     site_content: Dict[str, Any],
     heuristic_evidence: Dict[str, Any],
     final_url: str,
     rendering_limitations: bool,
     technographics: Dict[str, Any] = None
-) -> Dict[str, Any]:
-    """
-    Call OpenAI to score website based on extracted content and heuristics.
-    
-    Args:
-        site_content: Extracted HTML elements (title, h1s, CTAs, etc.)
-        heuristic_evidence: Evidence from deterministic checks
-        final_url: Final URL after redirects
-        rendering_limitations: Whether HTML appears incomplete
-        technographics: Detected technology stack data
-        
-    Returns:
-        Dict with category scores, justifications, confidence
-    """
-    
+) -> str:
+    """Build the user prompt from extracted content, heuristic evidence and technographics."""
     tech_section = ""
     if technographics and technographics.get("detected"):
         cms = technographics.get("cms", {})
@@ -143,84 +157,259 @@ IMPORTANT: Write the plain_english_report in simple, clear language that helps i
 If content is sparse but quality indicators exist (good title, clear H1, HTTPS, contact info), don't penalize heavily - just lower confidence.
 If you cannot find evidence for a category, score it low and explain in justifications."""
 
+    return user_content
+
+
+_review_cache = TTLByteLRU(
+    max_bytes=AI_REVIEW_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=AI_REVIEW_CACHE_TTL_HOURS * 3600
+)
+_review_disk_cache: Optional[DiskBlobStore] = None
+_review_disk_cache_failed = False
+_review_stats = {"api_calls": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def _get_review_disk_cache() -> Optional[DiskBlobStore]:
+    """Shared on-disk review cache, or None when AI_REVIEW_CACHE_DIR is unset or unusable."""
+    global _review_disk_cache, _review_disk_cache_failed
+    if _review_disk_cache is None and AI_REVIEW_CACHE_DIR and not _review_disk_cache_failed:
+        try:
+            _review_disk_cache = DiskBlobStore(
+                AI_REVIEW_CACHE_DIR,
+                ttl_seconds=AI_REVIEW_CACHE_TTL_HOURS * 3600,
+                max_bytes=AI_REVIEW_CACHE_DISK_MAX_MB * 1024 * 1024
+            )
+        except OSError as e:
+            _review_disk_cache_failed = True
+            print(f"AI review disk cache disabled ({AI_REVIEW_CACHE_DIR}): {e}")
+    return _review_disk_cache
+
+
+def _canonical_site(url: str) -> str:
+    """URL reduced to host (without www.) and path, so scheme/www variants share reviews."""
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def review_cache_key(
+    site_content: Dict[str, Any],
+    heuristic_evidence: Dict[str, Any],
+    final_url: str,
+    rendering_limitations: bool,
+    technographics: Dict[str, Any] = None
+) -> str:
+    """
+    Content address for an AI review: a hash of the model, prompt version,
+    system prompt and the exact user prompt (with the URL canonicalized).
+    """
+    user_content = _build_user_content(
+        site_content, heuristic_evidence, _canonical_site(final_url), rendering_limitations, technographics
+    )
+    digest = hashlib.sha256()
+    for part in (AI_MODEL, str(AI_TEMPERATURE), PROMPT_VERSION, SYSTEM_PROMPT, user_content):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+async def _get_cached_review(key: str) -> Optional[Dict[str, Any]]:
+    review = _review_cache.get(key)
+    if review is not None:
+        _review_stats["memory_hits"] += 1
+        return review
+    disk_cache = _get_review_disk_cache()
+    if disk_cache is not None:
+        review = await asyncio.to_thread(disk_cache.get, key)
+        if review is not None:
+            _review_stats["disk_hits"] += 1
+            _review_cache.set(key, review)
+            return review
+    _review_stats["misses"] += 1
+    return None
+
+
+async def _store_review(key: str, review: Dict[str, Any]):
+    _review_cache.set(key, review)
+    disk_cache = _get_review_disk_cache()
+    if disk_cache is not None:
+        await asyncio.to_thread(disk_cache.put, key, review)
+
+
+def _get_async_openai_client() -> AsyncOpenAI:
+    """Shared AsyncOpenAI client for the running event loop."""
+    return loop_local("ai_scorer.openai", AsyncOpenAI)
+
+
+def _clamp_ai_result(result: Dict[str, Any], heuristic_evidence: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and clamp a parsed AI response into the review structure."""
+    # Validate and clamp scores
+    category_scores = result.get("category_scores", {})
+    clamped_scores = {
+        "brand": max(0, min(12, category_scores.get("brand", 0))),
+        "visual": max(0, min(10, category_scores.get("visual", 0))),
+        "conversion": max(0, min(12, category_scores.get("conversion", 0))),
+        "trust": max(0, min(10, category_scores.get("trust", 0))),
+        "a11y": max(0, min(6, category_scores.get("a11y", 0)))
+    }
+    
+    # Handle insufficient evidence with grace
+    insufficient = result.get("insufficient_evidence", False)
+    confidence = result.get("confidence", 0.7)
+    
+    # If insufficient evidence but heuristic scores are decent, maintain minimum AI score
+    total_ai = sum(clamped_scores.values())
+    if insufficient and total_ai < 20 and heuristic_evidence.get("text_word_count", 0) > 150:
+        # Bump to minimum viable score
+        adjustment = (20 - total_ai) / 5
+        for key in clamped_scores:
+            clamped_scores[key] = int(clamped_scores[key] + adjustment)
+    
+    return {
+        "category_scores": clamped_scores,
+        "justifications": result.get("justifications", {}),
+        "plain_english_report": result.get("plain_english_report", {}),
+        "insufficient_evidence": insufficient,
+        "confidence": max(0.0, min(1.0, confidence))
+    }
+
+
+def _ai_error_result(message: str) -> Dict[str, Any]:
+    """Zero-score review returned when the AI call or its JSON fails."""
+    return {
+        "category_scores": {
+            "brand": 0,
+            "visual": 0,
+            "conversion": 0,
+            "trust": 0,
+            "a11y": 0
+        },
+        "justifications": {
+            "error": message
+        },
+        "insufficient_evidence": True,
+        "confidence": 0.0
+    }
+
+
+async def score_with_ai_async(
+    site_content: Dict[str, Any],
+    heuristic_evidence: Dict[str, Any],
+    final_url: str,
+    rendering_limitations: bool,
+    technographics: Dict[str, Any] = None,
+    use_cache: bool = True,
+    deadline: Optional[Deadline] = None
+) -> Dict[str, Any]:
+    """
+    Call OpenAI to score website based on extracted content and heuristics.
+    Identical prompt inputs are answered from the review cache without an API call.
+    
+    Args:
+        site_content: Extracted HTML elements (title, h1s, CTAs, etc.)
+        heuristic_evidence: Evidence from deterministic checks
+        final_url: Final URL after redirects
+        rendering_limitations: Whether HTML appears incomplete
+        technographics: Detected technology stack data
+        use_cache: Whether to use/update the review cache (default True)
+        deadline: Scoring deadline; the API call's timeout is capped to it
+        
+    Returns:
+        Dict with category scores, justifications, confidence
+        
+    Raises:
+        DeadlineExceeded: If the deadline passes before or during the API call
+    """
+    cache_key = None
+    if use_cache:
+        cache_key = review_cache_key(
+            site_content, heuristic_evidence, final_url, rendering_limitations, technographics
+        )
+        cached = await _get_cached_review(cache_key)
+        if cached is not None:
+            return json.loads(json.dumps(cached))
+    
+    user_content = _build_user_content(
+        site_content, heuristic_evidence, final_url, rendering_limitations, technographics
+    )
+    
+    if deadline is not None:
+        deadline.check("AI review")
+    
     try:
-        client = OpenAI()
+        client = _get_async_openai_client()
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
+        _review_stats["api_calls"] += 1
+        response = await client.chat.completions.create(
+            model=AI_MODEL,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_content}
             ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
+            temperature=AI_TEMPERATURE,
+            response_format={"type": "json_object"},
+            timeout=cap_timeout(deadline, AI_REQUEST_TIMEOUT)
         )
         
         result_text = response.choices[0].message.content
         result = json.loads(result_text)
         
-        # Validate and clamp scores
-        category_scores = result.get("category_scores", {})
-        clamped_scores = {
-            "brand": max(0, min(12, category_scores.get("brand", 0))),
-            "visual": max(0, min(10, category_scores.get("visual", 0))),
-            "conversion": max(0, min(12, category_scores.get("conversion", 0))),
-            "trust": max(0, min(10, category_scores.get("trust", 0))),
-            "a11y": max(0, min(6, category_scores.get("a11y", 0)))
-        }
-        
-        # Handle insufficient evidence with grace
-        insufficient = result.get("insufficient_evidence", False)
-        confidence = result.get("confidence", 0.7)
-        
-        # If insufficient evidence but heuristic scores are decent, maintain minimum AI score
-        total_ai = sum(clamped_scores.values())
-        if insufficient and total_ai < 20 and heuristic_evidence.get("text_word_count", 0) > 150:
-            # Bump to minimum viable score
-            adjustment = (20 - total_ai) / 5
-            for key in clamped_scores:
-                clamped_scores[key] = int(clamped_scores[key] + adjustment)
-        
-        return {
-            "category_scores": clamped_scores,
-            "justifications": result.get("justifications", {}),
-            "plain_english_report": result.get("plain_english_report", {}),
-            "insufficient_evidence": insufficient,
-            "confidence": max(0.0, min(1.0, confidence))
-        }
+        review = _clamp_ai_result(result, heuristic_evidence)
+        if cache_key is not None:
+            await _store_review(cache_key, review)
+        return review
         
     except json.JSONDecodeError as e:
         # AI didn't return valid JSON
-        return {
-            "category_scores": {
-                "brand": 0,
-                "visual": 0,
-                "conversion": 0,
-                "trust": 0,
-                "a11y": 0
-            },
-            "justifications": {
-                "error": f"AI response was not valid JSON: {str(e)}"
-            },
-            "insufficient_evidence": True,
-            "confidence": 0.0
-        }
+        return _ai_error_result(f"AI response was not valid JSON: {str(e)}")
     except Exception as e:
+        if deadline is not None and deadline.expired():
+            # Out of time - not an AI failure worth a zero score
+            raise DeadlineExceeded(f"Scoring deadline ({deadline.budget:g}s) exceeded during AI review") from e
         # OpenAI error
-        return {
-            "category_scores": {
-                "brand": 0,
-                "visual": 0,
-                "conversion": 0,
-                "trust": 0,
-                "a11y": 0
-            },
-            "justifications": {
-                "error": f"AI scoring failed: {str(e)}"
-            },
-            "insufficient_evidence": True,
-            "confidence": 0.0
-        }
+        return _ai_error_result(f"AI scoring failed: {str(e)}")
+
+
+def score_with_ai(
+    site_content: Dict[str, Any],
+    heuristic_evidence: Dict[str, Any],
+    final_url: str,
+    rendering_limitations: bool,
+    technographics: Dict[str, Any] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """Blocking wrapper around score_with_ai_async() for sync callers."""
+    return run_sync(score_with_ai_async(
+        site_content, heuristic_evidence, final_url, rendering_limitations, technographics,
+        use_cache=use_cache
+    ))
+
+
+def clear_review_cache():
+    """Clear all cached AI reviews (memory and, if enabled, disk)."""
+    _review_cache.clear()
+    disk_cache = _get_review_disk_cache()
+    if disk_cache is not None:
+        disk_cache.clear()
+
+
+def get_review_cache_stats() -> Dict[str, Any]:
+    """Get statistics about the AI review cache and how many API calls it saved."""
+    _review_cache.purge_expired()
+    hits = _review_stats["memory_hits"] + _review_stats["disk_hits"]
+    lookups = hits + _review_stats["misses"]
+    disk_cache = _get_review_disk_cache()
+    return {
+        **_review_stats,
+        "hit_ratio": round(hits / lookups, 4) if lookups else None,
+        "prompt_version": PROMPT_VERSION,
+        "model": AI_MODEL,
+        "ttl_hours": AI_REVIEW_CACHE_TTL_HOURS,
+        "memory": _review_cache.get_stats(),
+        "disk": disk_cache.get_stats() if disk_cache is not None else None
+    }
 
 
 def combine_scores(heuristic: Dict[str, Any], ai_review: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,403 @@
+"""
+Bounded cache building blocks for the scoring engine.
+TTLByteLRU is an in-process LRU capped by total bytes with per-entry expiry;
+DiskBlobStore is a compressed, content-addressed directory that every worker
+process on the host can share.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional: DiskBlobStore(codec="zstd") falls back to zlib
+    zstandard = None
+
+
+# Every zstd frame starts with these bytes; zlib streams never do
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_DECOMPRESS_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def compress_blob(data: bytes, codec: str = "zlib", level: int = 6) -> bytes:
+    """Compress with zstd or zlib ("zstd" falls back to zlib when zstandard is missing)."""
+    if codec == "zstd" and zstandard is not None:
+        return zstandard.compress(data, level)
+    return zlib.compress(data, level)
+
+
+def decompress_blob(data: bytes) -> bytes:
+    """
+    Inverse of compress_blob(), whichever codec wrote the data.
+
+    Raises:
+        ValueError: For zstd data when zstandard is not installed
+    """
+    if data[:4] == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ValueError("zstd-compressed blob but the zstandard package is not installed")
+        return zstandard.decompress(data)
+    return zlib.decompress(data)
+
+
+def _default_size_of(value: Any) -> int:
+    """Approximate in-memory size of a cached value in bytes."""
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_default_size_of(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_default_size_of(v) for v in value) + 8 * len(value)
+    return 64
+
+
+class TTLByteLRU:
+    """
+    Thread-safe LRU mapping bounded by total value size in bytes.
+
+    Entries older than ttl_seconds are dropped on access, and set() sweeps out
+    every expired entry at most once per PURGE_INTERVAL_SECONDS.
+    When an insert pushes the total over max_bytes, least recently used entries
+    are evicted until it fits. Values larger than max_bytes are never stored.
+    """
+
+    PURGE_INTERVAL_SECONDS = 600
+
+    def __init__(self, max_bytes: int, ttl_seconds: float,
+                 size_of: Optional[Callable[[Any], int]] = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._size_of = size_of or _default_size_of
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._last_purge = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _drop(self, key: str):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value and mark it recently used, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at, _ = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, stored_at: Optional[float] = None):
+        """Insert or replace a value, evicting LRU entries to stay under max_bytes."""
+        size = self._size_of(value)
+        with self._lock:
+            if time.time() - self._last_purge > self.PURGE_INTERVAL_SECONDS:
+                self._purge_expired_locked()
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, stored_at if stored_at is not None else time.time(), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+
+    def _purge_expired_locked(self) -> int:
+        self._last_purge = time.time()
+        cutoff = self._last_purge - self.ttl_seconds
+        expired = [key for key, (_, stored_at, _) in self._entries.items() if stored_at < cutoff]
+        for key in expired:
+            self._drop(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def purge_expired(self) -> int:
+        """Remove every expired entry; returns how many were removed."""
+        with self._lock:
+            return self._purge_expired_locked()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class DiskBlobStore:
+    """
+    Compressed, content-addressed JSON store on local disk.
+
+    Payloads are written once under objects/<sha256> (compressed with codec,
+    "zlib" or "zstd"; reads accept either) and looked up through small key
+    files under keys/<sha256(key)>, so identical
+    content stored under different keys is kept only once. Writes go through a
+    temp file and os.replace(), which makes the store safe to share between
+    processes. Entries expire ttl_seconds after they were written, and
+    sweep() trims the oldest keys once the objects exceed max_bytes.
+    """
+
+    SWEEP_INTERVAL_SECONDS = 300
+    # put() writes (or touches) the object before its key, so an object this
+    # recent may belong to a key another process is still writing
+    ORPHAN_GRACE_SECONDS = 600
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int,
+                 compression_level: int = 6, codec: str = "zlib"):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.codec = "zstd" if codec == "zstd" and zstandard is not None else "zlib"
+        self._keys_dir = os.path.join(directory, "keys")
+        self._objects_dir = os.path.join(directory, "objects")
+        os.makedirs(self._keys_dir, exist_ok=True)
+        os.makedirs(self._objects_dir, exist_ok=True)
+        self._last_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def _key_path(self, key: str) -> str:
+        return os.path.join(self._keys_dir, self._digest(key.encode()))
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self._objects_dir, content_hash[:2], content_hash)
+
+    def _atomic_write(self, path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def get(self, key: str) -> Optional[Any]:
+        """Load a value written by put(), or None if missing, expired or unreadable."""
+        key_path = self._key_path(key)
+        try:
+            if time.time() - os.path.getmtime(key_path) > self.ttl_seconds:
+                self.misses += 1
+                return None
+            with open(key_path, "r") as f:
+                content_hash = f.read().strip()
+            with open(self._object_path(content_hash), "rb") as f:
+                value = json.loads(decompress_blob(f.read()))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) + _DECOMPRESS_ERRORS as e:
+            self.errors += 1
+            self.misses += 1
+            print(f"Disk cache read failed for {key_path}: {str(e)[:100]}")
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        """Compress and store a JSON-serializable value under key."""
+        try:
+            payload = json.dumps(value, sort_keys=True, default=str).encode()
+            content_hash = self._digest(payload)
+            object_path = self._object_path(content_hash)
+            if os.path.exists(object_path):
+                # Same content already stored - refresh its age for the sweeper
+                os.utime(object_path)
+            else:
+                self._atomic_write(object_path, compress_blob(payload, self.codec, self.compression_level))
+            self._atomic_write(self._key_path(key), content_hash.encode())
+        except (OSError, TypeError, ValueError) as e:
+            self.errors += 1
+            print(f"Disk cache write failed: {str(e)[:100]}")
+            return
+        self._maybe_sweep()
+
+    def delete(self, key: str):
+        try:
+            os.unlink(self._key_path(key))
+        except FileNotFoundError:
+            pass
+
+    def _maybe_sweep(self):
+        if time.time() - self._last_sweep < self.SWEEP_INTERVAL_SECONDS:
+            return
+        if self._sweep_lock.acquire(blocking=False):
+            try:
+                self.sweep()
+            finally:
+                self._sweep_lock.release()
+
+    def _scan(self, directory: str):
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, st
+
+    def sweep(self) -> Dict[str, int]:
+        """
+        Remove expired keys, trim the oldest keys while objects exceed max_bytes,
+        then delete objects no key points at. Objects written or touched within
+        ORPHAN_GRACE_SECONDS of the sweep are kept even when unreferenced, since
+        a concurrent put() may not have written their key yet.
+
+        Returns:
+            Dict with counts of expired keys, evicted keys and removed objects
+        """
+        self._last_sweep = time.time()
+        cutoff = self._last_sweep - self.ttl_seconds
+        expired = 0
+        live_keys = []
+        for path, st in self._scan(self._keys_dir):
+            if os.path.basename(path).startswith(".tmp-"):
+                if st.st_mtime < self._last_sweep - 3600:
+                    self._unlink(path)
+                continue
+            if st.st_mtime < cutoff:
+                self._unlink(path)
+                expired += 1
+            else:
+                live_keys.append((st.st_mtime, path))
+
+        referenced = {}
+        for _, path in live_keys:
+            try:
+                with open(path, "r") as f:
+                    referenced.setdefault(f.read().strip(), []).append(path)
+            except OSError:
+                continue
+
+        grace_cutoff = self._last_sweep - self.ORPHAN_GRACE_SECONDS
+        objects = {}
+        recent_objects = set()
+        removed_objects = 0
+        for path, st in self._scan(self._objects_dir):
+            name = os.path.basename(path)
+            if name.startswith(".tmp-"):
+                # Abandoned partial write
+                if st.st_mtime < self._last_sweep - 3600:
+                    self._unlink(path)
+                continue
+            if st.st_mtime >= grace_cutoff:
+                recent_objects.add(name)
+            if name not in referenced:
+                if name not in recent_objects:
+                    self._unlink(path)
+                    removed_objects += 1
+            else:
+                objects[name] = st.st_size
+
+        total = sum(objects.values())
+        evicted = 0
+        if total > self.max_bytes:
+            # Oldest keys go first; an object is freed once none of its keys remain
+            live_keys.sort()
+            remaining_refs = {h: len(paths) for h, paths in referenced.items()}
+            key_to_hash = {p: h for h, paths in referenced.items() for p in paths}
+            for _, key_path in live_keys:
+                if total <= self.max_bytes:
+                    break
+                content_hash = key_to_hash.get(key_path)
+                self._unlink(key_path)
+                evicted += 1
+                if content_hash is None:
+                    continue
+                remaining_refs[content_hash] -= 1
+                if remaining_refs[content_hash] == 0 and content_hash in objects:
+                    total -= objects.pop(content_hash)
+                    if content_hash in recent_objects:
+                        # Left for a later sweep, but counted as freed here
+                        continue
+                    self._unlink(self._object_path(content_hash))
+                    removed_objects += 1
+        self.evictions += evicted
+        return {"expired": expired, "evicted": evicted, "removed_objects": removed_objects}
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for directory in (self._keys_dir, self._objects_dir):
+            for path, _ in list(self._scan(directory)):
+                self._unlink(path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        object_bytes = 0
+        object_count = 0
+        for _, st in self._scan(self._objects_dir):
+            object_bytes += st.st_size
+            object_count += 1
+        key_count = sum(1 for _ in self._scan(self._keys_dir))
+        lookups = self.hits + self.misses
+        return {
+            "directory": self.directory,
+            "codec": self.codec,
+            "keys": key_count,
+            "objects": object_count,
+            "bytes": object_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
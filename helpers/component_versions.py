@@ -0,0 +1,46 @@
+"""
+Version stamps for the scoring components.
+Each analyzer declares its own version (site_heuristics.HEURISTICS_VERSION,
+ai_scorer.PROMPT_VERSION, technographics.TECHNOGRAPHICS_VERSION). Scores record
+the versions that produced them, so when one component changes only that
+component has to be re-run (see helpers.rescore).
+"""
+
+from typing import Dict, List, Optional
+
+from helpers.ai_scorer import PROMPT_VERSION
+from helpers.site_heuristics import HEURISTICS_VERSION
+from helpers.technographics import TECHNOGRAPHICS_VERSION
+
+
+COMPONENTS = ("heuristics", "ai", "technographics")
+
+# Scores stored before results were stamped were produced by these versions
+LEGACY_COMPONENT_VERSIONS = {"heuristics": "1", "ai": "1", "technographics": "1"}
+
+
+def current_component_versions(ai: bool = True) -> Dict[str, Optional[str]]:
+    """
+    Versions stamped on a fresh score.
+
+    Args:
+        ai: False for results without an AI review (triage), stamped ai=None
+    """
+    return {
+        "heuristics": HEURISTICS_VERSION,
+        "ai": PROMPT_VERSION if ai else None,
+        "technographics": TECHNOGRAPHICS_VERSION,
+    }
+
+
+def stale_components(versions: Optional[Dict[str, Optional[str]]]) -> List[str]:
+    """
+    Components whose stored version differs from the current one.
+
+    Args:
+        versions: Stamp stored with a score, or None for a score stored before
+            stamping (treated as LEGACY_COMPONENT_VERSIONS)
+    """
+    stored = versions if versions is not None else LEGACY_COMPONENT_VERSIONS
+    current = current_component_versions()
+    return [component for component in COMPONENTS if stored.get(component) != current[component]]
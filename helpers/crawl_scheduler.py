@@ -0,0 +1,258 @@
+"""
+Politeness scheduler for outbound site fetches.
+Every request to a prospect's website takes a permit for its host and for the
+IP the host resolves to (shared hosting puts many sites behind one address).
+Each gate has a concurrency cap and a token bucket that spaces requests, and
+a 429/503 with Retry-After pauses the host until the server asks us back.
+One process-wide scheduler serves worker threads and the engine loop alike.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+# Per-host limits: concurrent requests, sustained requests/second, burst size
+CRAWL_HOST_CONCURRENCY = int(os.getenv("CRAWL_HOST_CONCURRENCY", "4"))
+CRAWL_HOST_RATE = float(os.getenv("CRAWL_HOST_RATE", "4"))
+CRAWL_HOST_BURST = int(os.getenv("CRAWL_HOST_BURST", "8"))
+
+# Per-IP limits, shared by every host behind one address
+CRAWL_IP_CONCURRENCY = int(os.getenv("CRAWL_IP_CONCURRENCY", "8"))
+CRAWL_IP_RATE = float(os.getenv("CRAWL_IP_RATE", "8"))
+CRAWL_IP_BURST = int(os.getenv("CRAWL_IP_BURST", "16"))
+
+# Pause applied after a 429/503 without Retry-After, and the longest pause honoured
+CRAWL_DEFAULT_BACKOFF = 2.0
+CRAWL_MAX_RETRY_AFTER = float(os.getenv("CRAWL_MAX_RETRY_AFTER", "60"))
+
+# Re-check interval for a waiter blocked on a gate's concurrency cap (async waiters)
+_CONCURRENCY_POLL = 0.05
+
+# Gates idle this long are dropped
+_GATE_IDLE_SECONDS = 600
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class TokenBucket:
+    """Refills at rate tokens per second up to burst; one token per request."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = max(rate, 0.001)
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _Gate:
+    def __init__(self, rate: float, burst: int, max_concurrency: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.active = 0
+        self.blocked_until = 0.0
+        self.last_used = time.monotonic()
+
+
+class CrawlScheduler:
+    """
+    Per-host and per-IP admission for site fetches.
+
+    A request is admitted only when both of its gates have a free concurrency
+    slot, a token, and no Retry-After pause in force; otherwise the caller
+    waits (blocking threads via slot_sync(), coroutines via slot()).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._gates: Dict[Tuple[str, str], _Gate] = {}
+        self._last_prune = time.monotonic()
+        self.admitted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.retry_after_pauses = 0
+
+    def _gate(self, key: Tuple[str, str]) -> _Gate:
+        gate = self._gates.get(key)
+        if gate is None:
+            if key[0] == "ip":
+                gate = _Gate(CRAWL_IP_RATE, CRAWL_IP_BURST, CRAWL_IP_CONCURRENCY)
+            else:
+                gate = _Gate(CRAWL_HOST_RATE, CRAWL_HOST_BURST, CRAWL_HOST_CONCURRENCY)
+            self._gates[key] = gate
+        return gate
+
+    def _prune_locked(self, now: float):
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        idle = [key for key, gate in self._gates.items()
+                if gate.active == 0 and now - gate.last_used > _GATE_IDLE_SECONDS]
+        for key in idle:
+            del self._gates[key]
+
+    def _try_admit_locked(self, keys: List[Tuple[str, str]]) -> float:
+        """Admit and return 0, or return the seconds to wait before trying again."""
+        now = time.monotonic()
+        self._prune_locked(now)
+        gates = [self._gate(key) for key in keys]
+        wait = 0.0
+        for gate in gates:
+            if gate.active >= gate.max_concurrency:
+                wait = max(wait, _CONCURRENCY_POLL)
+            wait = max(wait, gate.bucket.delay(now), gate.blocked_until - now)
+        if wait > 0:
+            return wait
+        for gate in gates:
+            gate.bucket.take(now)
+            gate.active += 1
+            gate.last_used = now
+        self.admitted += 1
+        return 0.0
+
+    def _release(self, keys: List[Tuple[str, str]]):
+        with self._lock:
+            for key in keys:
+                gate = self._gates.get(key)
+                if gate is not None:
+                    gate.active -= 1
+                    gate.last_used = time.monotonic()
+            self._released.notify_all()
+
+    def _record_wait(self, started: float):
+        with self._lock:
+            self.throttled += 1
+            self.wait_seconds += time.monotonic() - started
+
+    @staticmethod
+    def _host_port(url: str) -> Tuple[str, int]:
+        parsed = urlparse(url)
+        return (parsed.hostname or "").lower(), parsed.port or (443 if parsed.scheme == "https" else 80)
+
+    @staticmethod
+    def _keys(host: str, ip: Optional[str]) -> List[Tuple[str, str]]:
+        keys = [("host", host)]
+        if ip and ip != host:
+            keys.append(("ip", ip))
+        return keys
+
+    @contextmanager
+    def slot_sync(self, url: str):
+        """Hold a fetch permit for url's host and IP (blocking)."""
+        from helpers.http_client import resolve_host
+
+        host, port = self._host_port(url)
+        addresses = resolve_host(host, port)
+        keys = self._keys(host, addresses[0] if addresses else None)
+        started = time.monotonic()
+        throttled = False
+        with self._lock:
+            while True:
+                wait = self._try_admit_locked(keys)
+                if wait == 0:
+                    break
+                throttled = True
+                self._released.wait(timeout=wait)
+        if throttled:
+            self._record_wait(started)
+        try:
+            yield
+        finally:
+            self._release(keys)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold a fetch permit for url's host and IP (awaiting)."""
+        from helpers.http_client import resolve_host_async
+
+        host, port = self._host_port(url)
+        addresses = await resolve_host_async(host, port)
+        keys = self._keys(host, addresses[0] if addresses else None)
+        started = time.monotonic()
+        throttled = False
+        while True:
+            with self._lock:
+                wait = self._try_admit_locked(keys)
+            if wait == 0:
+                break
+            throttled = True
+            await asyncio.sleep(wait)
+        if throttled:
+            self._record_wait(started)
+        try:
+            yield
+        finally:
+            self._release(keys)
+
+    def note_response(self, url: str, status: int, headers: Any) -> Optional[float]:
+        """
+        Pause the host after a 429/503 for its Retry-After (or CRAWL_DEFAULT_BACKOFF).
+
+        Returns:
+            The server's Retry-After in seconds (uncapped), or None if it sent none
+        """
+        if status not in (429, 503):
+            return None
+        retry_after = parse_retry_after(headers.get("retry-after") if headers is not None else None)
+        pause = min(retry_after if retry_after is not None else CRAWL_DEFAULT_BACKOFF, CRAWL_MAX_RETRY_AFTER)
+        host, _ = self._host_port(url)
+        with self._lock:
+            gate = self._gate(("host", host))
+            gate.blocked_until = max(gate.blocked_until, time.monotonic() + pause)
+            self.retry_after_pauses += 1
+        return retry_after
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "admitted": self.admitted,
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "retry_after_pauses": self.retry_after_pauses,
+                "hosts_tracked": sum(1 for kind, _ in self._gates if kind == "host"),
+                "ips_tracked": sum(1 for kind, _ in self._gates if kind == "ip"),
+                "hosts_paused": sum(1 for (kind, _), gate in self._gates.items()
+                                    if kind == "host" and gate.blocked_until > now),
+                "limits": {
+                    "host": {"concurrency": CRAWL_HOST_CONCURRENCY, "rate": CRAWL_HOST_RATE, "burst": CRAWL_HOST_BURST},
+                    "ip": {"concurrency": CRAWL_IP_CONCURRENCY, "rate": CRAWL_IP_RATE, "burst": CRAWL_IP_BURST},
+                },
+            }
+
+
+_scheduler = CrawlScheduler()
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    return _scheduler
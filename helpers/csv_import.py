@@ -264,6 +264,7 @@ def get_import_status(import_id: str, user_id: int) -> Optional[Dict]:
 
         leads = session.query(LeadModel).filter_by(import_id=import_id, user_id=user_id).all()
         scored = sum(1 for l in leads if l.import_status == "scored")
+        triaged = sum(1 for l in leads if l.import_status == "triaged")
         unreachable = sum(1 for l in leads if l.import_status == "unreachable")
         pending = sum(1 for l in leads if l.import_status in ("queued", "scoring"))
         pending_credits = sum(1 for l in leads if l.import_status == "pending_credits")
@@ -283,6 +284,7 @@ def get_import_status(import_id: str, user_id: int) -> Optional[Dict]:
             "status": csv_import.status,
             "total": total,
             "scored": scored,
+            "triaged": triaged,
             "unreachable": unreachable,
             "pending": pending,
             "pending_credits": pending_credits
@@ -291,25 +293,38 @@ def get_import_status(import_id: str, user_id: int) -> Optional[Dict]:
         session.close()
 
 
-def score_import_leads_background(lead_ids: List[str], import_id: str, user_id: int):
+def score_import_leads_background(lead_ids: List[str], import_id: str, user_id: int,
+                                  mode: str = "full", ai_top_n: Optional[int] = None,
+                                  ai_min_score: Optional[int] = None):
+    """
+    Score imported leads on a background thread.
+    mode="triage" first gives every lead a provisional heuristic-only score, then
+    runs the full AI scoring only for the leads picked by ai_top_n / ai_min_score;
+    the rest finish as "triaged".
+    """
     thread = threading.Thread(
         target=_run_scoring_thread,
-        args=(lead_ids, import_id, user_id),
+        args=(lead_ids, import_id, user_id, mode, ai_top_n, ai_min_score),
         daemon=True
     )
     thread.start()
 
 
-def _run_scoring_thread(lead_ids: List[str], import_id: str, user_id: int):
-    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning
+def _run_scoring_thread(lead_ids: List[str], import_id: str, user_id: int,
+                        mode: str = "full", ai_top_n: Optional[int] = None,
+                        ai_min_score: Optional[int] = None):
+    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning, select_for_ai_review, get_cached_scores
     import concurrent.futures
+    import contextlib
     import time as time_module
 
     semaphore = threading.Semaphore(10)
     PER_LEAD_TIMEOUT = 45
+    triage_scores = {}
 
-    def score_single_lead(lead_id: str):
-        with semaphore:
+    def score_single_lead(lead_id: str, lead_mode: str = "full", cached_result: Optional[dict] = None):
+        # Cached results need no scoring run, so they do not take a worker slot
+        with semaphore if cached_result is None else contextlib.nullcontext():
             session = SessionLocal()
             try:
                 lead = session.query(LeadModel).filter_by(id=lead_id, user_id=user_id).first()
@@ -320,9 +335,7 @@ def _run_scoring_thread(lead_ids: List[str], import_id: str, user_id: int):
                 session.commit()
 
                 try:
-                    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                        future = executor.submit(score_website_hybrid, lead.website, True)
-                        hybrid_result = future.result(timeout=PER_LEAD_TIMEOUT)
+                    hybrid_result = cached_result or score_website_hybrid(lead.website, True, timeout=PER_LEAD_TIMEOUT, mode=lead_mode)
 
                     score_reasoning = create_backward_compatible_reasoning(hybrid_result)
                     render_pathway = hybrid_result.get("render_pathway", "")
@@ -345,6 +358,20 @@ def _run_scoring_thread(lead_ids: List[str], import_id: str, user_id: int):
                         session.commit()
                         return
 
+                    if hybrid_result.get("provisional"):
+                        # Stays "scoring" until the AI review selection is made
+                        lead.score = score_reasoning.get("total_score", 0)
+                        lead.score_reasoning = score_reasoning
+                        lead.heuristic_score = hybrid_result.get("heuristic_score")
+                        lead.ai_score = 0
+                        lead.score_breakdown = hybrid_result.get("breakdown")
+                        lead.score_confidence = hybrid_result.get("confidence")
+                        lead.technographics = hybrid_result.get("technographics")
+                        lead.component_versions = hybrid_result.get("component_versions")
+                        session.commit()
+                        triage_scores[lead_id] = hybrid_result.get("heuristic_score", 0)
+                        return
+
                     has_credits, _, _ = credit_manager.has_sufficient_credits(user_id, "ai_scoring", 1)
                     if not has_credits:
                         lead.import_status = "pending_credits"
@@ -361,6 +388,7 @@ def _run_scoring_thread(lead_ids: List[str], import_id: str, user_id: int):
                     lead.score_confidence = hybrid_result.get("confidence")
                     lead.last_scored_at = datetime.now()
                     lead.technographics = hybrid_result.get("technographics")
+                    lead.component_versions = hybrid_result.get("component_versions")
                     lead.import_status = "scored"
                     session.commit()
 
@@ -378,10 +406,43 @@ def _run_scoring_thread(lead_ids: List[str], import_id: str, user_id: int):
             finally:
                 session.close()
 
+    # One cache lookup for the whole import: cached leads are stored right away
+    # and only the rest go to the worker pool
+    session = SessionLocal()
+    try:
+        websites = dict(session.query(LeadModel.id, LeadModel.website).filter(
+            LeadModel.id.in_(lead_ids), LeadModel.user_id == user_id
+        ).all())
+    finally:
+        session.close()
+    cached_scores = get_cached_scores(list(websites.values()))
+    uncached_ids = []
+    for lid in lead_ids:
+        cached_result = cached_scores.get(websites.get(lid))
+        if cached_result:
+            score_single_lead(lid, mode, cached_result)
+        else:
+            uncached_ids.append(lid)
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(score_single_lead, lid) for lid in lead_ids]
+        futures = [executor.submit(score_single_lead, lid, mode) for lid in uncached_ids]
         concurrent.futures.wait(futures)
 
+    if triage_scores:
+        selected = select_for_ai_review(triage_scores, top_n=ai_top_n, min_score=ai_min_score)
+        session = SessionLocal()
+        try:
+            for lead in session.query(LeadModel).filter(LeadModel.id.in_(list(triage_scores))).all():
+                lead.import_status = "queued" if lead.id in selected else "triaged"
+            session.commit()
+        finally:
+            session.close()
+        print(f"CSV import {import_id}: triaged {len(triage_scores)} leads, {len(selected)} queued for AI review")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+            futures = [executor.submit(score_single_lead, lid) for lid in selected]
+            concurrent.futures.wait(futures)
+
     session = SessionLocal()
     try:
         csv_import = session.query(CsvImportModel).filter_by(id=import_id).first()
@@ -0,0 +1,58 @@
+"""
+Per-lead time budgets for the scoring pipeline.
+A Deadline is created once per scoring request and passed down through the
+fetch, render and AI stages; each stage sizes its own timeouts from the budget
+that is left and skips optional work that no longer fits, so a 30s budget
+really ends the work after 30s.
+"""
+
+import time
+from typing import Optional
+
+
+# How long after its deadline a blocked caller keeps waiting for the engine to
+# wind the work down before giving up on it (run_sync / wait_for backstop)
+DEADLINE_GRACE_SECONDS = 2.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """The scoring budget ran out. A TimeoutError, so existing timeout handlers catch it."""
+
+
+class Deadline:
+    """A fixed point in (monotonic) time by which a scoring run must finish."""
+
+    def __init__(self, seconds: float):
+        self.budget = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self._expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self._expires_at
+
+    def allows(self, seconds: float) -> bool:
+        """True if at least this many seconds are left."""
+        return self.remaining() >= seconds
+
+    def cap(self, timeout: float) -> float:
+        """A stage timeout shortened to the remaining budget."""
+        return min(timeout, self.remaining())
+
+    def check(self, stage: str):
+        """
+        Raises:
+            DeadlineExceeded: If the budget is spent before stage starts
+        """
+        if self.expired():
+            raise DeadlineExceeded(f"Scoring deadline ({self.budget:g}s) exceeded before {stage}")
+
+    def __repr__(self) -> str:
+        return f"Deadline(budget={self.budget:g}s, remaining={self.remaining():.2f}s)"
+
+
+def cap_timeout(deadline: Optional[Deadline], timeout: float) -> float:
+    """timeout, shortened to the deadline's remaining budget when there is one."""
+    return deadline.cap(timeout) if deadline is not None else timeout
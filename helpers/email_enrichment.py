@@ -1,10 +1,11 @@
 import os
 import re
-import requests
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, urljoin
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from helpers.http_client import crawl_get, get_session, BASIC_BROWSER_HEADERS
+
 HUNTER_API_KEY = os.getenv("HUNTER_API_KEY", "")
 
 EMAIL_REGEX = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
@@ -51,13 +52,7 @@ GENERIC_PREFIXES = [
 CONTACT_PAGE_PATHS = ['/contact', '/contact-us', '/about', '/about-us']
 
 # Standard headers for requests
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-    'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
-    'Accept-Encoding': 'gzip, deflate',
-    'Connection': 'keep-alive',
-}
+HEADERS = BASIC_BROWSER_HEADERS
 
 def extract_domain(website: str) -> Optional[str]:
     """Extract domain from website URL."""
@@ -77,7 +72,7 @@ def extract_domain(website: str) -> Optional[str]:
 def _fetch_page(url: str, timeout: int = 10) -> Tuple[str, str]:
     """Fetch a single page and return (url, html_content)."""
     try:
-        response = requests.get(url, timeout=timeout, headers=HEADERS, verify=True, allow_redirects=True)
+        response = crawl_get(url, timeout=timeout, headers=HEADERS, verify=True, allow_redirects=True)
         if response.status_code == 200:
             return (url, response.text)
     except Exception:
@@ -159,15 +154,57 @@ def _filter_emails(emails: set) -> List[str]:
     return list(set(filtered))
 
 
-def extract_emails_from_website(website: str, timeout: int = 10) -> List[str]:
+def _snapshot_pages(website: str) -> List[str]:
+    """HTML kept from the site's last scoring run (helpers.snapshot_store), if any."""
+    from helpers.snapshot_store import load_snapshot
+    
+    try:
+        snapshot = load_snapshot(website)
+    except Exception as e:
+        print(f"Snapshot lookup failed for {website}: {e}")
+        return []
+    if not snapshot:
+        return []
+    return [html for html in (snapshot.get("static_html"), snapshot.get("rendered_html")) if html]
+
+
+def _phones_from_pages(all_html: List[str]) -> Optional[str]:
+    all_phones = set()
+    for html in all_html:
+        all_phones.update(_extract_phones_from_html(html))
+        # Also check for tel: links
+        tel_matches = re.findall(r'href=["\']tel:([^"\']+)["\']', html, re.IGNORECASE)
+        for tel in tel_matches:
+            cleaned = re.sub(r'[^\d+]', '', tel)
+            if len(cleaned) >= 10:
+                all_phones.add(tel.strip())
+    
+    # Return the first valid phone
+    if all_phones:
+        return list(all_phones)[0]
+    
+    return None
+
+
+def extract_emails_from_website(website: str, timeout: int = 10, use_snapshot: bool = True) -> List[str]:
     """
     Extract email addresses from a business website using PARALLEL fetching.
     Checks homepage + contact pages simultaneously for speed.
     Returns a list of unique email addresses found.
+    With use_snapshot, the pages kept from the site's last scoring run are
+    checked first and the site is only fetched when they have no email.
     """
     if not website:
         return []
     
+    if use_snapshot:
+        snapshot_emails = set()
+        for html in _snapshot_pages(website):
+            snapshot_emails.update(_extract_emails_from_html(html))
+        filtered = _filter_emails(snapshot_emails)
+        if filtered:
+            return filtered
+    
     try:
         if not website.startswith(('http://', 'https://')):
             website = f'https://{website}'
@@ -221,15 +258,22 @@ def choose_best_email(candidates: List[str]) -> Optional[str]:
     return candidates[0]
 
 
-def extract_phone_from_website(website: str, timeout: int = 10) -> Optional[str]:
+def extract_phone_from_website(website: str, timeout: int = 10, use_snapshot: bool = True) -> Optional[str]:
     """
     Extract phone number from a business website using PARALLEL fetching.
     Checks homepage + contact pages simultaneously for speed.
     Returns the first valid phone number found.
+    With use_snapshot, the pages kept from the site's last scoring run are
+    checked first and the site is only fetched when they have no phone.
     """
     if not website:
         return None
     
+    if use_snapshot:
+        snapshot_phone = _phones_from_pages(_snapshot_pages(website))
+        if snapshot_phone:
+            return snapshot_phone
+    
     try:
         if not website.startswith(('http://', 'https://')):
             website = f'https://{website}'
@@ -249,22 +293,7 @@ def extract_phone_from_website(website: str, timeout: int = 10) -> Optional[str]
                 except Exception:
                     continue
         
-        # Extract phones from all HTML content using regex
-        all_phones = set()
-        for html in all_html:
-            all_phones.update(_extract_phones_from_html(html))
-            # Also check for tel: links
-            tel_matches = re.findall(r'href=["\']tel:([^"\']+)["\']', html, re.IGNORECASE)
-            for tel in tel_matches:
-                cleaned = re.sub(r'[^\d+]', '', tel)
-                if len(cleaned) >= 10:
-                    all_phones.add(tel.strip())
-        
-        # Return the first valid phone
-        if all_phones:
-            return list(all_phones)[0]
-        
-        return None
+        return _phones_from_pages(all_html)
     
     except Exception as e:
         print(f"Error extracting phone from {website}: {e}")
@@ -289,7 +318,7 @@ def enrich_from_hunter(domain: str, max_results: int = 3, hunter_api_key: Option
             "limit": max_results
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = get_session().get(url, params=params, timeout=10)
         
         if response.status_code == 401:
             return {"success": False, "error": "Invalid Hunter API key", "emails": []}
@@ -0,0 +1,95 @@
+"""
+Shared asyncio event loop for the scoring engine.
+Sync callers (worker threads, background tasks) hand coroutines to one long-lived
+loop so HTTP connections, browsers and the OpenAI client are reused across leads.
+"""
+
+import asyncio
+import threading
+import weakref
+import concurrent.futures
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+_engine_loop: Optional[asyncio.AbstractEventLoop] = None
+_engine_thread: Optional[threading.Thread] = None
+_engine_lock = threading.Lock()
+
+# Per-loop singletons (HTTP clients, OpenAI client, browsers) - these objects are
+# bound to the loop that created them and must never be shared across loops.
+_loop_locals: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def get_engine_loop() -> asyncio.AbstractEventLoop:
+    """Return the scoring engine loop, starting its thread on first use."""
+    global _engine_loop, _engine_thread
+    with _engine_lock:
+        if _engine_loop is None or _engine_loop.is_closed():
+            _engine_loop = asyncio.new_event_loop()
+            _engine_thread = threading.Thread(
+                target=_run_loop,
+                args=(_engine_loop,),
+                name="scoring-engine",
+                daemon=True
+            )
+            _engine_thread.start()
+        return _engine_loop
+
+
+def in_engine_thread() -> bool:
+    """True when called from the engine loop's own thread."""
+    return _engine_thread is not None and threading.current_thread() is _engine_thread
+
+
+def submit(coro: Coroutine) -> concurrent.futures.Future:
+    """Schedule a coroutine on the engine loop and return a thread-safe future."""
+    return asyncio.run_coroutine_threadsafe(coro, get_engine_loop())
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the engine loop and block the calling thread for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Optional seconds to wait; the engine task is cancelled on timeout
+
+    Returns:
+        The coroutine's result
+    """
+    if in_engine_thread():
+        coro.close()
+        raise RuntimeError("run_sync() called from the engine loop - await the async variant instead")
+
+    future = submit(coro)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+async def run_async(coro: Coroutine) -> Any:
+    """
+    Await a coroutine on the engine loop from a different event loop (e.g. FastAPI's).
+    Cancelling the awaiting task cancels the engine task as well.
+    """
+    if asyncio.get_running_loop() is get_engine_loop():
+        return await coro
+    return await asyncio.wrap_future(submit(coro))
+
+
+def loop_local(key: str, factory: Callable[[], Any]) -> Any:
+    """Return a per-event-loop singleton, creating it with factory() on first use."""
+    loop = asyncio.get_running_loop()
+    store = _loop_locals.get(loop)
+    if store is None:
+        store = {}
+        _loop_locals[loop] = store
+    if key not in store:
+        store[key] = factory()
+    return store[key]
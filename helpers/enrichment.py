@@ -4,6 +4,8 @@ from bs4 import BeautifulSoup
 from openai import OpenAI
 from typing import Dict, Optional
 
+from helpers.http_client import crawl_get
+
 def get_openai_client():
     base_url = os.getenv("AI_INTEGRATIONS_OPENAI_BASE_URL")
     api_key = os.getenv("AI_INTEGRATIONS_OPENAI_API_KEY")
@@ -37,7 +39,7 @@ def analyze_website(url: str) -> Dict:
     analysis["has_ssl"] = url.startswith("https://")
     
     try:
-        response = requests.get(url, timeout=10, allow_redirects=True, verify=True)
+        response = crawl_get(url, timeout=10, allow_redirects=True, verify=True)
         analysis["status_code"] = response.status_code
         
         if response.status_code == 200:
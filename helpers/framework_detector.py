@@ -3,22 +3,25 @@ Framework detector to identify JavaScript-heavy websites.
 Determines which sites need full rendering vs. static HTML analysis.
 """
 
-from typing import Dict, List, Any
-from bs4 import BeautifulSoup
+from typing import Dict, List, Any, Optional
 import re
 
+from helpers.parsed_page import ParsedPage
 
-def detect_js_framework(html: str) -> Dict[str, Any]:
+
+def detect_js_framework(html: str, page: Optional[ParsedPage] = None) -> Dict[str, Any]:
     """
     Detect if a website uses modern JavaScript frameworks that require rendering.
     
     Args:
         html: Raw HTML content from initial fetch
+        page: Already-parsed document for html (parsed here if omitted)
         
     Returns:
         Dict with detection results, confidence, and signals
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    page = page or ParsedPage(html)
+    soup = page.soup
     
     # Initialize detection signals
     signals = []
@@ -63,7 +66,7 @@ def detect_js_framework(html: str) -> Dict[str, Any]:
         ]
     }
     
-    html_lower = html.lower()
+    html_lower = page.html_lower
     for framework, signatures in framework_signatures.items():
         for sig in signatures:
             if sig.lower() in html_lower:
@@ -90,16 +93,11 @@ def detect_js_framework(html: str) -> Dict[str, Any]:
             break
     
     # 3. Analyze DOM structure
-    # Remove scripts and styles for text analysis
-    for tag in soup(['script', 'style', 'noscript']):
-        tag.decompose()
-    
-    visible_text = soup.get_text(separator=' ', strip=True)
+    # Visible text excludes scripts, styles and noscript fallbacks
+    visible_text = page.visible_text
     text_word_count = len(visible_text.split())
     
-    # Restore soup for script analysis
-    soup = BeautifulSoup(html, 'html.parser')
-    scripts = soup.find_all('script')
+    scripts = page.scripts
     script_count = len(scripts)
     
     # Calculate total script size
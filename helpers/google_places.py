@@ -5,6 +5,8 @@ import logging
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from helpers.http_client import get_session
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://maps.googleapis.com/maps/api/place"
@@ -34,7 +36,7 @@ def search_places(business_type: str, location: str, limit: int = 20, page_token
     try:
         print(f"[PLACES] Text search request: query='{query}', limit={limit}")
         t0 = time.time()
-        response = requests.get(url, params=params, timeout=15)
+        response = get_session().get(url, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         elapsed = time.time() - t0
@@ -119,7 +121,7 @@ def get_place_details(place_id: str, api_key: str = None) -> Optional[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = get_session().get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         
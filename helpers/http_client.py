@@ -0,0 +1,425 @@
+"""
+Shared outbound HTTP clients.
+Every site fetch goes through one pooled crawl requests.Session (sync callers)
+or the per-loop httpx.AsyncClient (engine coroutines), so connections and TLS
+sessions to a host are reused, and hostname lookups are cached for
+DNS_CACHE_TTL seconds. API calls use get_session(), without the DNS cache.
+None of the shared clients keep cookies between requests.
+Requests to prospects' websites use crawl_get()/crawl_get_async(), which apply
+the per-host and per-IP limits of the crawl scheduler.
+"""
+
+import asyncio
+import ipaddress
+import os
+import random
+import socket
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from helpers.crawl_scheduler import get_crawl_scheduler
+from helpers.engine_loop import loop_local
+
+
+def _accepted_encodings() -> str:
+    """
+    Content codings we can decode: gzip/deflate always, br and zstd when the
+    optional brotli (or brotlicffi) / zstandard packages are installed. httpx and
+    urllib3 both pick up the same packages, but httpx only decodes zstd from
+    0.27.1, so zstd is also checked against the decoders httpx actually has.
+    """
+    encodings = ["gzip", "deflate"]
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+            encodings.append("br")
+            break
+        except ImportError:
+            continue
+    try:
+        import zstandard  # noqa: F401
+        from httpx._decoders import SUPPORTED_DECODERS
+        if "zstd" in SUPPORTED_DECODERS:
+            encodings.append("zstd")
+    except ImportError:
+        pass
+    return ", ".join(encodings)
+
+
+# Never advertise a coding we cannot decode - the body would arrive as binary
+ACCEPT_ENCODING = _accepted_encodings()
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+]
+
+# Plain desktop-browser profile used by enrichment page fetches
+BASIC_BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+}
+
+# Connection limits for the shared async client (one per engine loop)
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+
+# Connection pools kept by the shared requests.Session: number of hosts, and
+# connections per host
+SESSION_POOL_HOSTS = 100
+SESSION_POOL_PER_HOST = 10
+
+HTTP2_ENABLED = os.getenv("HTTP_CLIENT_HTTP2", "").lower() in ("1", "true", "yes")
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+DNS_CACHE_MAX_ENTRIES = 4096
+
+
+def browser_headers(domain: str) -> Dict[str, str]:
+    """Full browser-like request headers (rotated User-Agent) for scoring fetches."""
+    return {
+        'User-Agent': random.choice(USER_AGENTS),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
+        'Accept-Encoding': ACCEPT_ENCODING,
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'cross-site',
+        'Sec-Fetch-User': '?1',
+        'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+        'Sec-Ch-Ua-Mobile': '?0',
+        'Sec-Ch-Ua-Platform': '"Windows"',
+        'Cache-Control': 'no-cache',
+        'Referer': 'https://www.google.com/',
+        'Origin': domain,
+    }
+
+
+# ============== DNS CACHE ==============
+# Only the crawl clients (a urllib3 connection class for the crawl session, a
+# network backend for the async client) and the crawl scheduler resolve through
+# this cache; the database, OpenAI, Stripe and other API clients keep the
+# system resolver.
+
+_dns_cache: Dict[Tuple, Tuple[float, List[str]]] = {}
+_dns_lock = threading.Lock()
+_dns_stats = {"hits": 0, "misses": 0}
+
+
+def _cached_addresses(host: str, port: int) -> Optional[List[str]]:
+    """Cached addresses for host, or None on a miss."""
+    now = time.monotonic()
+    with _dns_lock:
+        entry = _dns_cache.get((host, port))
+        if entry is not None and entry[0] > now:
+            _dns_stats["hits"] += 1
+            return entry[1]
+    return None
+
+
+def resolve_host(host: str, port: int) -> List[str]:
+    """
+    Addresses for host in getaddrinfo order, cached for DNS_CACHE_TTL seconds
+    (the crawl scheduler keys its per-IP limits on the first one).
+
+    Returns:
+        The addresses, or an empty list for IP literals and failed lookups
+        (callers then connect by name and report the error as usual)
+    """
+    if _is_ip_literal(host):
+        return []
+    if DNS_CACHE_TTL > 0:
+        addresses = _cached_addresses(host, port)
+        if addresses is not None:
+            return addresses
+    with _dns_lock:
+        _dns_stats["misses"] += 1
+    try:
+        infos = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    except (OSError, UnicodeError):
+        return []
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    if DNS_CACHE_TTL > 0:
+        with _dns_lock:
+            if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+                _dns_cache.clear()
+            _dns_cache[(host, port)] = (time.monotonic() + DNS_CACHE_TTL, addresses)
+    return addresses
+
+
+async def resolve_host_async(host: str, port: int) -> List[str]:
+    """resolve_host() for coroutines: cache hits inline, lookups in a worker thread."""
+    if DNS_CACHE_TTL > 0 and not _is_ip_literal(host):
+        addresses = _cached_addresses(host, port)
+        if addresses is not None:
+            return addresses
+    return await asyncio.to_thread(resolve_host, host, port)
+
+
+def _is_ip_literal(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return True
+    except ValueError:
+        return False
+
+
+class _CachedDNSConnectionMixin:
+    """urllib3 connection that connects to cached addresses (TLS still verifies self.host)."""
+
+    def _new_conn(self):
+        host = self._dns_host
+        addresses = resolve_host(host, self.port)
+        if not addresses:
+            return super()._new_conn()
+        last_error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    last_error = e
+        finally:
+            self._dns_host = host
+        raise last_error
+
+
+class _CachedDNSHTTPConnection(_CachedDNSConnectionMixin, HTTPConnection):
+    pass
+
+
+class _CachedDNSHTTPSConnection(_CachedDNSConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _CachedDNSHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDNSHTTPConnection
+
+
+class _CachedDNSHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDNSHTTPSConnection
+
+
+class _CachedDNSAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDNSHTTPConnectionPool,
+            "https": _CachedDNSHTTPSConnectionPool,
+        }
+
+
+class _CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that connects to cached addresses (SNI still uses the hostname)."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = await resolve_host_async(host, port)
+        last_error = None
+        for address in addresses or [host]:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+def clear_dns_cache():
+    with _dns_lock:
+        _dns_cache.clear()
+
+
+# ============== CLIENTS ==============
+
+_session: Optional[requests.Session] = None
+_crawl_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _new_session(adapter: HTTPAdapter) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    # One session serves many unrelated sites and APIs, so its own jar keeps no
+    # cookies. Redirects still carry them: requests follows a redirect chain
+    # with the request's own copy of the jar, which accepts them.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide requests.Session (API calls) with per-host keep-alive connection pools."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _new_session(HTTPAdapter(
+                    pool_connections=SESSION_POOL_HOSTS,
+                    pool_maxsize=SESSION_POOL_PER_HOST
+                ))
+    return _session
+
+
+def _get_crawl_session() -> requests.Session:
+    """Session for prospects' websites: like get_session(), plus the DNS cache."""
+    global _crawl_session
+    if _crawl_session is None:
+        with _session_lock:
+            if _crawl_session is None:
+                _crawl_session = _new_session(_CachedDNSAdapter(
+                    pool_connections=SESSION_POOL_HOSTS,
+                    pool_maxsize=SESSION_POOL_PER_HOST
+                ))
+    return _crawl_session
+
+
+def _http2_available() -> bool:
+    if not HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        print("HTTP_CLIENT_HTTP2 is set but the h2 package is not installed - using HTTP/1.1")
+        return False
+
+
+def get_async_client(verify: bool = True) -> httpx.AsyncClient:
+    """
+    Shared async HTTP client (crawling only) for the running event loop.
+    A second client with certificate verification disabled backs the SSL fallback.
+    """
+    def _factory():
+        transport = httpx.AsyncHTTPTransport(
+            verify=verify,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        pool = getattr(transport, "_pool", None)
+        if DNS_CACHE_TTL > 0 and hasattr(pool, "_network_backend"):
+            pool._network_backend = _CachedDNSBackend(pool._network_backend)
+        client = httpx.AsyncClient(transport=transport, follow_redirects=True)
+        # Crawl redirects carry cookies in a jar of their own (_send_crawl_get)
+        client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return client
+    return loop_local(f"http_client.async.{'verified' if verify else 'insecure'}", _factory)
+
+
+def crawl_get(url: str, **kwargs) -> requests.Response:
+    """GET a prospect's page through the shared session, under the crawl scheduler's limits."""
+    scheduler = get_crawl_scheduler()
+    with scheduler.slot_sync(url):
+        response = _get_crawl_session().get(url, **kwargs)
+    scheduler.note_response(url, response.status_code, response.headers)
+    return response
+
+
+async def _send_crawl_get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """
+    Streamed GET that follows redirects with a cookie jar of its own: a cookie
+    set on one hop (consent and geo redirects) reaches the next, and nothing is
+    kept on the shared client for the next site. The caller closes the response.
+    """
+    follow_redirects = kwargs.pop("follow_redirects", True)
+    cookies = httpx.Cookies()
+    request = client.build_request("GET", url, **kwargs)
+    history: List[httpx.Response] = []
+    while True:
+        response = await client.send(request, stream=True, follow_redirects=False)
+        cookies.extract_cookies(response)
+        response.history = list(history)
+        if not follow_redirects or response.next_request is None:
+            return response
+        await response.aclose()
+        if len(history) >= client.max_redirects:
+            raise httpx.TooManyRedirects("Exceeded maximum allowed redirects.", request=request)
+        history.append(response)
+        request = response.next_request
+        # The hop's headers are copied from the last request: send only the
+        # cookies that match the new URL
+        request.headers.pop("Cookie", None)
+        cookies.set_cookie_header(request)
+
+
+async def crawl_get_async(url: str, verify: bool = True, **kwargs) -> httpx.Response:
+    """GET a prospect's page through the shared async client, under the crawl scheduler's limits."""
+    scheduler = get_crawl_scheduler()
+    async with scheduler.slot(url):
+        response = await _send_crawl_get(get_async_client(verify=verify), url, **kwargs)
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+    scheduler.note_response(url, response.status_code, response.headers)
+    return response
+
+
+async def crawl_get_capped_async(url: str, max_bytes: int, verify: bool = True,
+                                 **kwargs) -> Tuple[httpx.Response, bytes, bool]:
+    """
+    Streamed crawl_get_async() that stops reading after max_bytes of decoded body.
+
+    Returns:
+        (response, body bytes, truncated) - the response body itself is not loaded
+    """
+    scheduler = get_crawl_scheduler()
+    async with scheduler.slot(url):
+        response = await _send_crawl_get(get_async_client(verify=verify), url, **kwargs)
+        chunks = []
+        size = 0
+        truncated = False
+        try:
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > max_bytes:
+                    truncated = True
+                    break
+        finally:
+            await response.aclose()
+    scheduler.note_response(url, response.status_code, response.headers)
+    body = b"".join(chunks)
+    return response, body[:max_bytes] if truncated else body, truncated
+
+
+def get_client_stats() -> Dict[str, Any]:
+    """DNS cache counters, crawl scheduler counters and client configuration."""
+    with _dns_lock:
+        stats = {
+            "http2": HTTP2_ENABLED,
+            "accept_encoding": ACCEPT_ENCODING,
+            "dns_cache_enabled": DNS_CACHE_TTL > 0,
+            "dns_cache_entries": len(_dns_cache),
+            "dns_cache_hits": _dns_stats["hits"],
+            "dns_cache_misses": _dns_stats["misses"],
+        }
+    stats["crawl_scheduler"] = get_crawl_scheduler().get_stats()
+    return stats
@@ -3,12 +3,56 @@ Hybrid website scoring orchestration.
 Combines deterministic heuristics with AI review and manages caching.
 """
 
+import asyncio
+import copy
 import hashlib
+import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from urllib.parse import urlparse, urlunparse
 
-from helpers.models import ScoreCache, SessionLocal
+from helpers.cache_store import TTLByteLRU
+from helpers.component_versions import LEGACY_COMPONENT_VERSIONS, current_component_versions, stale_components
+from helpers.deadline import DEADLINE_GRACE_SECONDS, Deadline, DeadlineExceeded, cap_timeout
+from helpers.engine_loop import run_sync
+from helpers.models import ScoreCache, SessionLocal, UnreachableDomain, engine
+from helpers.single_flight import LEASE_MAX_WAIT_SECONDS, acquire_lease_or_result, coalesce, release_lease
+from helpers.stage_timings import StageTimer, record_timings
+
+# Expired cache entries younger than this are revalidated with conditional
+# requests instead of being re-scored; older ones always get a full re-score
+REVALIDATE_MAX_AGE_DAYS = 30
+
+# Negative cache: once a domain's scoring has ended fetch_failed or bot_blocked
+# NEGATIVE_CACHE_MIN_FAILURES times in a row it is not retried for
+# NEGATIVE_CACHE_TTL_MINUTES, doubling with each further failure up to
+# NEGATIVE_CACHE_MAX_TTL_HOURS
+NEGATIVE_CACHE_TTL_MINUTES = int(os.getenv("NEGATIVE_CACHE_TTL_MINUTES", "60"))
+NEGATIVE_CACHE_MAX_TTL_HOURS = int(os.getenv("NEGATIVE_CACHE_MAX_TTL_HOURS", "48"))
+NEGATIVE_CACHE_MIN_FAILURES = 2
+
+# Escalation renders are optional - with a deadline they only start when this
+# many seconds remain for the renders plus the AI review
+ESCALATION_MIN_BUDGET = 15.0
+
+# Rows per IN (...) lookup / multi-row upsert statement in the bulk cache API
+SCORE_CACHE_BATCH_SIZE = 500
+
+# In-process tier in front of the ScoreCache table: hot URLs are served without
+# a pool checkout or a query. Entries are dropped when this process writes the
+# row; rows rewritten by other workers are picked up once the TTL runs out.
+SCORE_MEMO_MAX_MB = int(os.getenv("SCORE_MEMO_MAX_MB", "32"))
+SCORE_MEMO_TTL_SECONDS = int(os.getenv("SCORE_MEMO_TTL_SECONDS", "300"))
+
+# Cache hits are counted in memory and added to ScoreCache.hit_count at most
+# this often, so serving a hit never costs a write
+SCORE_HIT_FLUSH_SECONDS = 60
+
+# Triage mode: provisional heuristic score (0-50) at or above which a lead is
+# queued for the full AI review when no explicit top-N/threshold is given
+TRIAGE_AI_MIN_HEURISTIC = 25
 
 
 def normalize_url(url: str) -> str:
@@ -62,20 +106,164 @@ def url_to_hash(url: str) -> str:
     return hashlib.sha256(url.encode('utf-8')).hexdigest()
 
 
-def get_cached_score(url: str, max_age_hours: int = 24) -> Optional[Dict[str, Any]]:
+def _cache_entry_to_result(cache_entry: ScoreCache) -> Dict[str, Any]:
+    """Rebuild a scoring result dict (same shape as fresh scoring) from a cache row."""
+    heuristic_data = cache_entry.heuristic_result or {}
+    ai_data = cache_entry.ai_result or {}
+    
+    # Calculate scores from cached data
+    heuristic_score = heuristic_data.get("total_heuristic", 0)
+    ai_category_scores = ai_data.get("category_scores", {})
+    ai_score = min(50, sum(ai_category_scores.values()))
+    
+    return {
+        "final_score": cache_entry.final_score,
+        "confidence": cache_entry.confidence,
+        "heuristic_score": heuristic_score,  # ← Add top-level score!
+        "ai_score": int(ai_score),  # ← Add top-level score!
+        "breakdown": {  # ← Reconstruct breakdown!
+            "heuristic": heuristic_data.get("scores", {}),
+            "ai": ai_category_scores
+        },
+        "evidence": heuristic_data.get("evidence", {}),
+        "ai_justifications": ai_data.get("justifications", {}),
+        "plain_english_report": ai_data.get("plain_english_report", {}),
+        "rendering_limitations": heuristic_data.get("rendering_limitations", False),
+        "has_errors": cache_entry.has_errors,
+        "errors": cache_entry.error_messages or [],
+        "render_pathway": cache_entry.render_pathway,
+        "js_detected": cache_entry.js_detected,
+        "js_confidence": cache_entry.js_confidence,
+        "detection_signals": cache_entry.detection_signals or [],
+        "framework_hints": cache_entry.framework_hints or [],
+        "technographics": cache_entry.technographics,
+        "component_versions": cache_entry.component_versions or dict(LEGACY_COMPONENT_VERSIONS),
+        "cached": True,
+        "cached_at": cache_entry.fetched_at.isoformat() if cache_entry.fetched_at else None
+    }
+
+
+_score_memo = TTLByteLRU(
+    max_bytes=SCORE_MEMO_MAX_MB * 1024 * 1024,
+    ttl_seconds=SCORE_MEMO_TTL_SECONDS
+)
+# Bumped on every invalidation, so a lookup that read the row before a write
+# does not put the old row back in the memo
+_score_memo_generation = 0
+_score_memo_lock = threading.Lock()
+_score_cache_stats = {"db_lookups": 0, "db_hits": 0}
+_pending_hits: Dict[str, int] = {}
+_pending_hits_lock = threading.Lock()
+_last_hit_flush = time.monotonic()
+
+
+def _record_cache_hit(url_hash: str) -> None:
+    with _pending_hits_lock:
+        _pending_hits[url_hash] = _pending_hits.get(url_hash, 0) + 1
+
+
+def flush_cache_hits(force: bool = False) -> int:
+    """
+    Add the hits counted since the last flush to ScoreCache.hit_count / last_hit_at.
+    
+    Args:
+        force: Flush even if SCORE_HIT_FLUSH_SECONDS have not passed
+        
+    Returns:
+        Number of entries updated
+    """
+    global _last_hit_flush
+    with _pending_hits_lock:
+        if not _pending_hits or (not force and time.monotonic() - _last_hit_flush < SCORE_HIT_FLUSH_SECONDS):
+            return 0
+        pending = dict(_pending_hits)
+        _pending_hits.clear()
+        _last_hit_flush = time.monotonic()
+    
+    # One UPDATE per distinct increment and chunk of entries
+    hashes_by_count: Dict[int, List[str]] = {}
+    for url_hash, count in pending.items():
+        hashes_by_count.setdefault(count, []).append(url_hash)
+    
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        for count, hashes in hashes_by_count.items():
+            for start in range(0, len(hashes), SCORE_CACHE_BATCH_SIZE):
+                db.query(ScoreCache).filter(
+                    ScoreCache.url_hash.in_(hashes[start:start + SCORE_CACHE_BATCH_SIZE])
+                ).update({
+                    ScoreCache.hit_count: ScoreCache.hit_count + count,
+                    ScoreCache.last_hit_at: now,
+                }, synchronize_session=False)
+        db.commit()
+        return len(pending)
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to record cache hits: {str(e)}")
+        return 0
+    finally:
+        db.close()
+
+
+def _invalidate_score_memo(url_hash: str) -> None:
+    """Drop url_hash from the memo; writers call this before and after their commit."""
+    global _score_memo_generation
+    with _score_memo_lock:
+        _score_memo_generation += 1
+        _score_memo.delete(url_hash)
+
+
+def _memo_lookup(url_hash: str, max_age_hours: int) -> Optional[Dict[str, Any]]:
+    """Memoized cache entry for url_hash if it is still fresh and current (a copy), else None."""
+    memo = _score_memo.get(url_hash)
+    if memo is None:
+        return None
+    fetched_at, result = memo
+    if fetched_at < datetime.now() - timedelta(hours=max_age_hours):
+        return None
+    if stale_components(result["component_versions"]):
+        return None
+    _record_cache_hit(url_hash)
+    # Callers annotate the result they get back
+    return copy.deepcopy(result)
+
+
+def peek_cached_score(url: str, max_age_hours: int = 24) -> Optional[Dict[str, Any]]:
+    """
+    The in-process tier of get_cached_score() alone: no database access, so it
+    is cheap enough to call from the event loop before falling back to
+    get_cached_score() in a thread.
+    """
+    return _memo_lookup(url_to_hash(normalize_url(url)), max_age_hours)
+
+
+def get_cached_score(url: str, max_age_hours: int = 24,
+                     use_memory: bool = True) -> Optional[Dict[str, Any]]:
     """
     Retrieve cached score if fresh enough.
+    Entries produced by an outdated component version count as misses.
     
     Args:
         url: Website URL
         max_age_hours: Maximum age of cache in hours (default 24)
+        use_memory: Check the in-process tier before the table; pass False to
+            see rows other workers wrote since this process last read them
         
     Returns:
         Cached score data or None if not found/expired
     """
     normalized = normalize_url(url)
     url_hash = url_to_hash(normalized)
+    flush_cache_hits()
     
+    if use_memory:
+        memoized = _memo_lookup(url_hash, max_age_hours)
+        if memoized is not None:
+            return memoized
+    
+    generation = _score_memo_generation
+    _score_cache_stats["db_lookups"] += 1
     db = SessionLocal()
     try:
         cache_entry = db.query(ScoreCache).filter(
@@ -90,49 +278,88 @@ def get_cached_score(url: str, max_age_hours: int = 24) -> Optional[Dict[str, An
         if cache_entry.fetched_at < cutoff:
             return None
         
-        # Reconstruct format to match fresh scoring results
-        heuristic_data = cache_entry.heuristic_result or {}
-        ai_data = cache_entry.ai_result or {}
+        if stale_components(cache_entry.component_versions):
+            return None
         
-        # Calculate scores from cached data
-        heuristic_score = heuristic_data.get("total_heuristic", 0)
-        ai_category_scores = ai_data.get("category_scores", {})
-        ai_score = min(50, sum(ai_category_scores.values()))
+        result = _cache_entry_to_result(cache_entry)
+        _score_cache_stats["db_hits"] += 1
+        _record_cache_hit(url_hash)
+        with _score_memo_lock:
+            if generation == _score_memo_generation:
+                _score_memo.set(url_hash, (cache_entry.fetched_at, copy.deepcopy(result)))
+        return result
+    finally:
+        db.close()
+
+
+def get_cached_scores(urls: List[str], max_age_hours: int = 24) -> Dict[str, Dict[str, Any]]:
+    """
+    Bulk get_cached_score(): one IN (...) query per SCORE_CACHE_BATCH_SIZE URLs
+    for everything the in-process tier does not already hold.
+    
+    Args:
+        urls: Website URLs (duplicates and empty values are fine)
+        max_age_hours: Maximum age of cache in hours (default 24)
         
-        return {
-            "final_score": cache_entry.final_score,
-            "confidence": cache_entry.confidence,
-            "heuristic_score": heuristic_score,  # ← Add top-level score!
-            "ai_score": int(ai_score),  # ← Add top-level score!
-            "breakdown": {  # ← Reconstruct breakdown!
-                "heuristic": heuristic_data.get("scores", {}),
-                "ai": ai_category_scores
-            },
-            "evidence": heuristic_data.get("evidence", {}),
-            "ai_justifications": ai_data.get("justifications", {}),
-            "plain_english_report": ai_data.get("plain_english_report", {}),
-            "rendering_limitations": heuristic_data.get("rendering_limitations", False),
-            "has_errors": cache_entry.has_errors,
-            "errors": cache_entry.error_messages or [],
-            "render_pathway": cache_entry.render_pathway,
-            "js_detected": cache_entry.js_detected,
-            "js_confidence": cache_entry.js_confidence,
-            "detection_signals": cache_entry.detection_signals or [],
-            "framework_hints": cache_entry.framework_hints or [],
-            "cached": True,
-            "cached_at": cache_entry.fetched_at.isoformat() if cache_entry.fetched_at else None
-        }
+    Returns:
+        {url: cached score data} for the URLs with a fresh, current entry
+    """
+    flush_cache_hits()
+    results: Dict[str, Dict[str, Any]] = {}
+    urls_by_hash: Dict[str, List[str]] = {}
+    for url in urls:
+        if not url or url in results:
+            continue
+        url_hash = url_to_hash(normalize_url(url))
+        memoized = _memo_lookup(url_hash, max_age_hours)
+        if memoized is not None:
+            results[url] = memoized
+        else:
+            urls_by_hash.setdefault(url_hash, []).append(url)
+    
+    if not urls_by_hash:
+        return results
+    
+    generation = _score_memo_generation
+    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    hashes = list(urls_by_hash)
+    db = SessionLocal()
+    try:
+        for start in range(0, len(hashes), SCORE_CACHE_BATCH_SIZE):
+            chunk = hashes[start:start + SCORE_CACHE_BATCH_SIZE]
+            _score_cache_stats["db_lookups"] += len(chunk)
+            entries = db.query(ScoreCache).filter(
+                ScoreCache.url_hash.in_(chunk),
+                ScoreCache.fetched_at >= cutoff
+            ).all()
+            for cache_entry in entries:
+                if stale_components(cache_entry.component_versions):
+                    continue
+                result = _cache_entry_to_result(cache_entry)
+                _score_cache_stats["db_hits"] += 1
+                _record_cache_hit(cache_entry.url_hash)
+                with _score_memo_lock:
+                    if generation == _score_memo_generation:
+                        _score_memo.set(cache_entry.url_hash, (cache_entry.fetched_at, copy.deepcopy(result)))
+                # Spellings of the same site share an entry, but each gets its own copy
+                for i, url in enumerate(urls_by_hash[cache_entry.url_hash]):
+                    results[url] = result if i == 0 else copy.deepcopy(result)
     finally:
         db.close()
+    return results
 
 
-def save_score_to_cache(url: str, score_data: Dict[str, Any]) -> None:
+def get_revalidation_candidate(url: str, max_age_days: int = REVALIDATE_MAX_AGE_DAYS
+                               ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
     """
-    Save or update score in cache.
+    Find an expired cache entry that can be reused if the site has not changed.
     
     Args:
         url: Website URL
-        score_data: Combined score data to cache
+        max_age_days: Entries older than this are always re-scored in full
+        
+    Returns:
+        (cached score data, page validators) or None if there is nothing to revalidate
     """
     normalized = normalize_url(url)
     url_hash = url_to_hash(normalized)
@@ -143,82 +370,470 @@ def save_score_to_cache(url: str, score_data: Dict[str, Any]) -> None:
             ScoreCache.url_hash == url_hash
         ).first()
         
-        if cache_entry:
-            # Update existing
-            cache_entry.heuristic_result = score_data.get("heuristic")
-            cache_entry.ai_result = score_data.get("ai_review")
-            cache_entry.final_score = score_data.get("final_score", 0)
-            cache_entry.confidence = score_data.get("confidence", 0.5)
-            cache_entry.has_errors = score_data.get("has_errors", False)
-            cache_entry.error_messages = score_data.get("errors", [])
-            cache_entry.render_pathway = score_data.get("render_pathway")
-            cache_entry.js_detected = score_data.get("js_detected", False)
-            cache_entry.js_confidence = score_data.get("js_confidence")
-            cache_entry.detection_signals = score_data.get("detection_signals")
-            cache_entry.framework_hints = score_data.get("framework_hints")
-            cache_entry.fetched_at = datetime.now()
-        else:
-            # Create new
-            cache_entry = ScoreCache(
-                url_hash=url_hash,
-                normalized_url=normalized,
-                heuristic_result=score_data.get("heuristic"),
-                ai_result=score_data.get("ai_review"),
-                final_score=score_data.get("final_score", 0),
-                confidence=score_data.get("confidence", 0.5),
-                has_errors=score_data.get("has_errors", False),
-                error_messages=score_data.get("errors", []),
-                render_pathway=score_data.get("render_pathway"),
-                js_detected=score_data.get("js_detected", False),
-                js_confidence=score_data.get("js_confidence"),
-                detection_signals=score_data.get("detection_signals"),
-                framework_hints=score_data.get("framework_hints"),
-                fetched_at=datetime.now()
+        if not cache_entry or not cache_entry.page_validators:
+            return None
+        
+        if cache_entry.fetched_at < datetime.now() - timedelta(days=max_age_days):
+            return None
+        
+        # Unchanged pages do not make an outdated heuristic or AI result current
+        if stale_components(cache_entry.component_versions):
+            return None
+        
+        return _cache_entry_to_result(cache_entry), cache_entry.page_validators
+    finally:
+        db.close()
+
+
+def touch_cached_score(url: str) -> None:
+    """Mark a cached score as fresh again after a successful revalidation."""
+    normalized = normalize_url(url)
+    url_hash = url_to_hash(normalized)
+    _invalidate_score_memo(url_hash)
+    
+    db = SessionLocal()
+    try:
+        db.query(ScoreCache).filter(
+            ScoreCache.url_hash == url_hash
+        ).update({ScoreCache.fetched_at: datetime.now()})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to refresh cached score: {str(e)}")
+    finally:
+        db.close()
+        _invalidate_score_memo(url_hash)
+
+
+def update_cached_components(url: str, heuristic: Dict[str, Any], final_score: int,
+                             confidence: float, component_versions: Dict[str, Any],
+                             technographics: Optional[Dict[str, Any]]) -> None:
+    """
+    Store a partial re-score (see helpers.rescore) on an existing cache entry.
+    fetched_at is left alone: the AI review the entry holds is no newer than before.
+    """
+    normalized = normalize_url(url)
+    url_hash = url_to_hash(normalized)
+    _invalidate_score_memo(url_hash)
+    
+    db = SessionLocal()
+    try:
+        db.query(ScoreCache).filter(
+            ScoreCache.url_hash == url_hash
+        ).update({
+            ScoreCache.heuristic_result: heuristic,
+            ScoreCache.final_score: final_score,
+            ScoreCache.confidence: confidence,
+            ScoreCache.component_versions: component_versions,
+            ScoreCache.technographics: technographics,
+        }, synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to update cached score: {str(e)}")
+    finally:
+        db.close()
+        _invalidate_score_memo(url_hash)
+
+
+def _score_cache_row(url: str, score_data: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    """ScoreCache column values for a scoring result."""
+    normalized = normalize_url(url)
+    return {
+        "url_hash": url_to_hash(normalized),
+        "normalized_url": normalized,
+        "heuristic_result": score_data.get("heuristic"),
+        "ai_result": score_data.get("ai_review"),
+        "final_score": score_data.get("final_score", 0),
+        "confidence": score_data.get("confidence", 0.5),
+        "has_errors": score_data.get("has_errors", False),
+        "error_messages": score_data.get("errors", []),
+        "render_pathway": score_data.get("render_pathway"),
+        "js_detected": score_data.get("js_detected", False),
+        "js_confidence": score_data.get("js_confidence"),
+        "detection_signals": score_data.get("detection_signals"),
+        "framework_hints": score_data.get("framework_hints"),
+        "page_validators": score_data.get("page_validators"),
+        "technographics": score_data.get("technographics"),
+        "component_versions": score_data.get("component_versions"),
+        "fetched_at": now,
+        "created_at": now,
+    }
+
+
+def save_scores_to_cache(entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """
+    Save or update many scores with one INSERT ... ON CONFLICT (url_hash) DO
+    UPDATE per SCORE_CACHE_BATCH_SIZE rows, in a single transaction.
+    
+    Args:
+        entries: (website URL, combined score data) pairs; for URLs that
+            normalize to the same entry the last pair wins
+    """
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    
+    now = datetime.now()
+    rows: Dict[str, Dict[str, Any]] = {}
+    for url, score_data in entries:
+        row = _score_cache_row(url, score_data, now)
+        rows[row["url_hash"]] = row
+    if not rows:
+        return
+    
+    for url_hash in rows:
+        _invalidate_score_memo(url_hash)
+    
+    batch = list(rows.values())
+    db = SessionLocal()
+    try:
+        for start in range(0, len(batch), SCORE_CACHE_BATCH_SIZE):
+            stmt = insert(ScoreCache).values(batch[start:start + SCORE_CACHE_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ScoreCache.url_hash],
+                # created_at keeps the first write
+                set_={column: stmt.excluded[column] for column in batch[0] if column not in ("url_hash", "created_at")}
             )
-            db.add(cache_entry)
+            db.execute(stmt)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to cache {len(batch)} score(s): {str(e)}")
+    finally:
+        db.close()
+        # Again once the write is visible: a reader that loaded the old row
+        # while it was in flight must not keep it memoised
+        for url_hash in rows:
+            _invalidate_score_memo(url_hash)
+
+
+def save_score_to_cache(url: str, score_data: Dict[str, Any]) -> None:
+    """
+    Save or update score in cache.
+    
+    Args:
+        url: Website URL
+        score_data: Combined score data to cache
+    """
+    save_scores_to_cache([(url, score_data)])
+
+
+def _url_domain(url: str) -> str:
+    return urlparse(normalize_url(url)).netloc
+
+
+def negative_cache_ttl(failure_count: int) -> timedelta:
+    """Backoff before retrying a domain after failure_count consecutive failures."""
+    if failure_count < NEGATIVE_CACHE_MIN_FAILURES:
+        return timedelta(0)
+    base = timedelta(minutes=NEGATIVE_CACHE_TTL_MINUTES)
+    ceiling = timedelta(hours=NEGATIVE_CACHE_MAX_TTL_HOURS)
+    return min(base * (2 ** min(failure_count - NEGATIVE_CACHE_MIN_FAILURES, 16)), ceiling)
+
+
+def _render_failed_on_our_side(render_result: Dict[str, Any]) -> bool:
+    """True if a render result says nothing about the site (skipped under load or
+    deadline, or the browser itself failed)."""
+    if render_result.get("overloaded") or render_result.get("deadline_exceeded"):
+        return True
+    return any(error.startswith("Rendering error") for error in render_result.get("errors", []))
+
+
+def get_unreachable_domain(url: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up the negative cache entry for a URL's domain.
+    
+    Args:
+        url: Website URL
         
+    Returns:
+        Dict with the stored failure "result", "retry_after" and "in_backoff",
+        or None if the domain has no recorded failures
+    """
+    db = SessionLocal()
+    try:
+        entry = db.query(UnreachableDomain).filter(
+            UnreachableDomain.domain == _url_domain(url)
+        ).first()
+        if not entry:
+            return None
+        return {
+            "result": entry.last_result or {},
+            "render_pathway": entry.render_pathway,
+            "failure_count": entry.failure_count,
+            "retry_after": entry.retry_after,
+            "in_backoff": entry.retry_after > datetime.now()
+        }
+    finally:
+        db.close()
+
+
+def record_unreachable_domain(url: str, failure: Dict[str, Any]) -> None:
+    """Record a fetch_failed/bot_blocked result and push the domain's retry time back."""
+    domain = _url_domain(url)
+    stored = {k: v for k, v in failure.items() if k != "timings"}
+    
+    db = SessionLocal()
+    try:
+        entry = db.query(UnreachableDomain).filter(UnreachableDomain.domain == domain).first()
+        now = datetime.now()
+        if entry:
+            entry.failure_count += 1
+            entry.render_pathway = failure.get("render_pathway")
+            entry.last_result = stored
+            entry.last_failed_at = now
+            entry.retry_after = now + negative_cache_ttl(entry.failure_count)
+        else:
+            entry = UnreachableDomain(
+                domain=domain,
+                render_pathway=failure.get("render_pathway"),
+                failure_count=1,
+                last_result=stored,
+                last_failed_at=now,
+                retry_after=now + negative_cache_ttl(1)
+            )
+            db.add(entry)
+        db.commit()
+        print(f"Negative-cached {domain} ({entry.render_pathway}, {entry.failure_count} failures) until {entry.retry_after:%Y-%m-%d %H:%M}")
+    except Exception as e:
+        db.rollback()
+        print(f"Failed to record unreachable domain: {str(e)}")
+    finally:
+        db.close()
+
+
+def clear_unreachable_domain(url: str) -> None:
+    """Forget a domain's failures (after it scored successfully)."""
+    db = SessionLocal()
+    try:
+        db.query(UnreachableDomain).filter(
+            UnreachableDomain.domain == _url_domain(url)
+        ).delete(synchronize_session=False)
         db.commit()
     except Exception as e:
         db.rollback()
-        print(f"Failed to cache score: {str(e)}")
+        print(f"Failed to clear unreachable domain: {str(e)}")
+    finally:
+        db.close()
+
+
+def get_negative_cache_stats() -> Dict[str, Any]:
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        return {
+            "domains": db.query(UnreachableDomain).count(),
+            "domains_in_backoff": db.query(UnreachableDomain).filter(UnreachableDomain.retry_after > now).count(),
+            "ttl_minutes": NEGATIVE_CACHE_TTL_MINUTES,
+            "max_ttl_hours": NEGATIVE_CACHE_MAX_TTL_HOURS,
+        }
     finally:
         db.close()
 
 
-def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
+def get_score_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the in-process score memo and the ScoreCache lookups behind it."""
+    _score_memo.purge_expired()
+    return {
+        "memory": _score_memo.get_stats(),
+        "memory_ttl_seconds": SCORE_MEMO_TTL_SECONDS,
+        "db_lookups": _score_cache_stats["db_lookups"],
+        "db_hits": _score_cache_stats["db_hits"],
+        "pending_hit_updates": len(_pending_hits),
+    }
+
+
+def _triage_result(heuristic: Dict[str, Any], detection: Dict[str, Any],
+                   technographics: Dict[str, Any]) -> Dict[str, Any]:
+    """Provisional heuristic-only result returned by mode="triage"."""
+    from helpers.ai_scorer import combine_scores
+    
+    result = combine_scores(heuristic, {})
+    result["provisional"] = True
+    result["scoring_mode"] = "triage"
+    result["cached"] = False
+    result["has_errors"] = False
+    result["errors"] = []
+    result["render_pathway"] = "triage"
+    result["js_detected"] = detection.get("is_js_heavy", False)
+    result["js_confidence"] = detection.get("confidence", 0.0)
+    result["framework_hints"] = detection.get("framework_hints", [])
+    result["detection_signals"] = detection.get("signals", [])
+    result["rendering_limitations"] = (
+        heuristic.get("rendering_limitations", False) or detection.get("is_js_heavy", False)
+    )
+    result["technographics"] = technographics
+    result["component_versions"] = current_component_versions(ai=False)
+    return result
+
+
+def _with_timings(result: Dict[str, Any], timer: StageTimer, render_pathway: str) -> Dict[str, Any]:
+    """Attach the run's stage timings to the result and add them to the histograms."""
+    result["timings"] = timer.as_dict()
+    record_timings(render_pathway, result["timings"])
+    return result
+
+
+async def score_website_hybrid_async(url: str, use_cache: bool = True,
+                                     priority: str = "bulk", mode: str = "full",
+                                     deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Score a website using hybrid approach with selective rendering.
+    Network stages (fetch, render, AI) are awaited on the shared engine loop;
+    CPU-bound HTML analysis and cache I/O run in worker threads.
     
     Flow:
-    1. Check cache
+    1. Check cache (revalidating expired entries with conditional requests)
     2. Fetch static HTML
     3. Detect JavaScript frameworks
     4. Selectively render if JS-heavy
     5. Score using best available content
     6. Save results with detection metadata
     
+    Each stage is timed; durations in milliseconds are returned under
+    "timings" and aggregated per render pathway (see stage_timings).
+    
+    Concurrent calls for the same normalized URL, mode, use_cache and priority
+    share one run: in process through single_flight.coalesce(), and across
+    worker processes through a scoring lease - waiters pick up the leader's
+    cache write. Interactive callers never wait on another run's lease, so
+    they are not held up behind a bulk run's render lane.
+    
+    With a deadline, every stage sizes its timeouts from the remaining budget,
+    optional renders are skipped when it runs short, and the run is cancelled
+    (raising DeadlineExceeded) once it passes.
+    
     Args:
         url: Website URL to score
         use_cache: Whether to use/update cache (default True)
+        priority: Render lane - "interactive" for single-lead requests a user is
+            waiting on, "bulk" for batch and import scoring
+        mode: "full" (default) or "triage" - static fetch, heuristics and
+            technographics only, returning a provisional score with no
+            rendering, AI review or cache write
+        deadline: Optional scoring budget (see helpers.deadline); a coalesced
+            run keeps the budget of the caller that started it
         
     Returns:
         Dict with final_score, confidence, breakdown, detection metadata
+        
+    Raises:
+        DeadlineExceeded: If the deadline passes before scoring completes
     """
-    from helpers.site_fetcher import fetch_multiple_pages, extract_site_content_for_ai
-    from helpers.site_heuristics import score_site_heuristics
-    from helpers.ai_scorer import score_with_ai, combine_scores
-    from helpers.framework_detector import detect_js_framework, get_detection_summary
-    from helpers.rendering_service import render_if_needed
-    from helpers.technographics import detect_technographics, classify_tech_health
+    # A forced re-score must not pick up a cached-path run's result, and an
+    # interactive caller must not wait in a bulk run's render lane
+    key = f"{mode}:{'cached' if use_cache else 'fresh'}:{priority}:{url_to_hash(normalize_url(url))}"
+    timeout = asyncio.timeout(deadline.remaining() if deadline is not None else None)
+    try:
+        async with timeout:
+            result, coalesced = await coalesce(
+                key, lambda: _score_website_hybrid_async(url, use_cache, priority, mode, deadline)
+            )
+    except DeadlineExceeded:
+        raise
+    except TimeoutError as e:
+        # Only our own budget becomes DeadlineExceeded; other timeouts propagate
+        if deadline is None or not timeout.expired():
+            raise
+        raise DeadlineExceeded(f"Scoring deadline ({deadline.budget:g}s) exceeded for {url}") from e
+    # Every caller gets its own copy of the shared result (nested dicts included)
+    result = copy.deepcopy(result)
+    if coalesced:
+        result["coalesced"] = True
+    return result
+
+
+def _get_score_cached_since(url: str, since: datetime) -> Optional[Dict[str, Any]]:
+    """Cached score written at or after since (another worker's fresh result), or None."""
+    cached = get_cached_score(url, use_memory=False)
+    if cached and cached.get("cached_at") and datetime.fromisoformat(cached["cached_at"]) >= since:
+        return cached
+    return None
+
+
+async def _score_website_hybrid_async(url: str, use_cache: bool, priority: str,
+                                      mode: str, deadline: Optional[Deadline]) -> Dict[str, Any]:
+    """Cache lookup, then a fresh score under the cross-process scoring lease."""
+    from helpers.site_fetcher import revalidate_pages_async
+    
+    timer = StageTimer()
     
     # Check cache first
     if use_cache:
-        cached = get_cached_score(url)
+        with timer.stage("cache_lookup"):
+            cached = peek_cached_score(url)
+            if cached is None:
+                cached = await asyncio.to_thread(get_cached_score, url, 24, False)
         if cached:
-            return cached
+            return _with_timings(cached, timer, "cache_hit")
+        
+        # Expired entry: if every page is unchanged, reuse the previous heuristic and AI results
+        with timer.stage("cache_lookup"):
+            candidate = await asyncio.to_thread(get_revalidation_candidate, url)
+        if candidate:
+            cached, validators = candidate
+            with timer.stage("revalidation"):
+                unchanged = await revalidate_pages_async(validators)
+            if unchanged:
+                with timer.stage("cache_write"):
+                    await asyncio.to_thread(touch_cached_score, url)
+                cached["revalidated"] = True
+                cached["cached_at"] = datetime.now().isoformat()
+                return _with_timings(cached, timer, "revalidated")
+    
+    # Known-unreachable domain: return the recorded failure until its backoff expires
+    with timer.stage("cache_lookup"):
+        unreachable = await asyncio.to_thread(get_unreachable_domain, url)
+    if unreachable and unreachable["in_backoff"]:
+        failure = dict(unreachable["result"])
+        failure["negative_cached"] = True
+        failure["retry_after"] = unreachable["retry_after"].isoformat()
+        return _with_timings(failure, timer, "negative_cache_hit")
+    
+    # Triage results are never cached, so there is nothing for other workers to wait on
+    if mode == "triage":
+        return await _score_uncached_async(url, use_cache, priority, mode, timer, deadline)
+    
+    url_hash = url_to_hash(normalize_url(url))
+    lease_requested_at = datetime.now()
+    with timer.stage("lease_wait"):
+        token, shared = await acquire_lease_or_result(
+            url_hash, lambda: _get_score_cached_since(url, lease_requested_at),
+            max_wait=0.0 if priority == "interactive" else cap_timeout(deadline, LEASE_MAX_WAIT_SECONDS)
+        )
+    if shared is not None:
+        return _with_timings(shared, timer, "lease_shared")
+    try:
+        result = await _score_uncached_async(url, use_cache, priority, mode, timer, deadline)
+    finally:
+        if token:
+            await asyncio.to_thread(release_lease, url_hash, token)
+    
+    # Reachable again: reset the domain's backoff
+    if unreachable and result.get("render_pathway") not in ("fetch_failed", "bot_blocked"):
+        await asyncio.to_thread(clear_unreachable_domain, url)
+    return result
+
+
+async def _score_uncached_async(url: str, use_cache: bool, priority: str, mode: str,
+                                timer: StageTimer, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """Fetch, analyze and (in full mode) render, AI-review and cache one website."""
+    from helpers.site_fetcher import (
+        fetch_multiple_pages_async, extract_site_content_for_ai, build_page_validators
+    )
+    from helpers.site_heuristics import score_site_heuristics
+    from helpers.ai_scorer import score_with_ai_async, combine_scores
+    from helpers.framework_detector import detect_js_framework, get_detection_summary
+    from helpers.rendering_service import render_if_needed_async, render_with_playwright_async
+    from helpers.technographics import detect_technographics, classify_tech_health
+    from helpers.parsed_page import ParsedPage
+    from helpers.snapshot_store import save_snapshot
     
     # Step 1: Fetch website pages (static HTML)
-    fetch_result = fetch_multiple_pages(url, max_pages=3)
+    with timer.stage("fetch"):
+        fetch_result = await fetch_multiple_pages_async(url, max_pages=3, deadline=deadline)
     
     final_url = fetch_result.get("final_url", url)
     static_html = fetch_result.get("combined_html", "")
@@ -231,10 +846,11 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
     
     # If blocked, failed to fetch, or needs browser rendering, try Playwright
     if not static_html or is_blocked or needs_browser_render:
-        print(f"Static fetch failed/blocked for {url} (status: {fetch_status}). Attempting Playwright render...")
-        from helpers.rendering_service import render_with_playwright
-        
-        fallback_render = render_with_playwright(final_url or url)
+        fallback_render = {}
+        if mode != "triage":
+            print(f"Static fetch failed/blocked for {url} (status: {fetch_status}). Attempting Playwright render...")
+            with timer.stage("fallback_render"):
+                fallback_render = await render_with_playwright_async(final_url or url, priority=priority, deadline=deadline)
         
         if fallback_render.get("html"):
             rendered_html = fallback_render["html"]
@@ -267,14 +883,14 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
                 "existing web presences and development teams."
             ) if is_blocked else ""
             
-            return {
+            failure = {
                 "final_score": 0,
                 "confidence": 0.3,
                 "heuristic_score": 0,
                 "ai_score": 0,
                 "breakdown": {},
                 "has_errors": True,
-                "errors": fetch_result.get("errors", []) + (fallback_render.get("errors", []) if 'fallback_render' in dir() else []),
+                "errors": fetch_result.get("errors", []) + fallback_render.get("errors", []),
                 "rendering_limitations": True,
                 "render_pathway": "bot_blocked" if is_blocked else "fetch_failed",
                 "js_detected": False,
@@ -288,12 +904,40 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
                 } if is_blocked else {},
                 "cached": False
             }
+            # Only record failures the site caused: triage skips the Playwright fallback,
+            # and a run that ran out of time or whose render was skipped or crashed on
+            # our side proves nothing about the site
+            if (mode == "full" and fallback_render
+                    and not _render_failed_on_our_side(fallback_render)
+                    and not (deadline is not None and deadline.expired())):
+                with timer.stage("cache_write"):
+                    await asyncio.to_thread(record_unreachable_domain, url, failure)
+            return _with_timings(failure, timer, failure["render_pathway"])
     
-    # Step 2: Detect JavaScript frameworks
-    detection = detect_js_framework(static_html)
+    # Step 2: Detect JavaScript frameworks (parse once, shared by every analyzer below)
+    with timer.stage("parse"):
+        static_page = await asyncio.to_thread(ParsedPage, static_html, final_url)
+    with timer.stage("framework_detection"):
+        detection = await asyncio.to_thread(detect_js_framework, static_html, static_page)
     detection_summary = get_detection_summary(detection)
     print(f"Framework detection for {url}: {detection_summary}")
     
+    # Pages cut off at the fetch byte cap are reported with the heuristic evidence
+    truncated_pages = fetch_result.get("truncated_pages", [])
+    
+    # Triage: heuristics and technographics on the static HTML only (no rendering or AI)
+    if mode == "triage":
+        with timer.stage("heuristics"):
+            heuristic = await asyncio.to_thread(score_site_heuristics, static_html, final_url, static_page)
+        if truncated_pages:
+            heuristic.setdefault("evidence", {})["truncated_pages"] = truncated_pages
+        with timer.stage("technographics"):
+            technographics_data = await asyncio.to_thread(detect_technographics, static_html, final_url, None, static_page)
+        if use_cache:
+            with timer.stage("snapshot_write"):
+                await asyncio.to_thread(save_snapshot, url, final_url, static_html, None, "triage", truncated_pages, False)
+        return _with_timings(_triage_result(heuristic, detection, technographics_data), timer, "triage")
+    
     # Step 3: Conditionally render if JS-heavy (skip if we already rendered via fallback)
     if used_fallback_render:
         # Already rendered with Playwright - skip additional rendering
@@ -302,15 +946,19 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
         render_result = {"html": static_html, "pathway": "rendered", "errors": []}
     else:
         # Normal flow - conditionally render based on JS detection
-        render_result = render_if_needed(final_url, static_html, detection)
+        with timer.stage("render"):
+            render_result = await render_if_needed_async(final_url, static_html, detection, priority=priority, deadline=deadline)
         html_to_score = render_result.get("html", static_html)
         render_pathway = render_result.get("pathway", "static")
     
     # Step 4: Run heuristic scoring on best available HTML
-    heuristic = score_site_heuristics(html_to_score, final_url)
+    with timer.stage("parse"):
+        page = static_page if html_to_score == static_html else await asyncio.to_thread(ParsedPage, html_to_score, final_url)
+    with timer.stage("heuristics"):
+        heuristic = await asyncio.to_thread(score_site_heuristics, html_to_score, final_url, page)
     
     # Step 4.5: ESCALATION CHECK - If contact info is weak but content is rich, try Playwright
-    if not used_fallback_render and render_pathway != "rendered":
+    if not used_fallback_render and render_pathway not in ("rendered", "render_skipped_overload", "render_skipped_deadline"):
         contact_score = heuristic.get("scores", {}).get("contact", 0)
         word_count = heuristic.get("evidence", {}).get("text_word_count", 0)
         contact_summary = heuristic.get("evidence", {}).get("contact_detection_summary", {})
@@ -330,10 +978,12 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
             should_escalate = True
             escalation_reason = "No emails/forms found but page has content - may be JavaScript-loaded"
         
+        if should_escalate and deadline is not None and not deadline.allows(ESCALATION_MIN_BUDGET):
+            print(f"Skipping escalation for {url}: {deadline.remaining():.1f}s of scoring budget left")
+            should_escalate = False
+        
         if should_escalate:
             print(f"Escalating to Playwright for {url}: {escalation_reason}")
-            from helpers.rendering_service import render_with_playwright
-            
             priority_links = heuristic.get("evidence", {}).get("priority_links", [])
             priority_links_from_fetch = fetch_result.get("priority_links_discovered", [])
             all_priority_links = list(set(priority_links + priority_links_from_fetch))
@@ -344,22 +994,44 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
                     pages_to_render.append(link)
             
             escalated_html = ""
-            for render_url in pages_to_render[:3]:
-                escalation_render = render_with_playwright(render_url)
+            with timer.stage("escalation_render"):
+                escalation_renders = await asyncio.gather(
+                    *(render_with_playwright_async(render_url, priority=priority, deadline=deadline)
+                      for render_url in pages_to_render[:3])
+                )
+            for render_url, escalation_render in zip(pages_to_render[:3], escalation_renders):
                 if escalation_render.get("html"):
                     escalated_html += f"\n\n<!-- Rendered: {render_url} -->\n{escalation_render['html']}"
             
             if escalated_html and len(escalated_html) > len(html_to_score):
                 html_to_score = escalated_html
                 render_pathway = "escalated_render"
-                heuristic = score_site_heuristics(html_to_score, final_url)
+                with timer.stage("parse"):
+                    page = await asyncio.to_thread(ParsedPage, html_to_score, final_url)
+                with timer.stage("heuristics"):
+                    heuristic = await asyncio.to_thread(score_site_heuristics, html_to_score, final_url, page)
                 print(f"✓ Escalation render successful for {url} ({len(pages_to_render)} pages) - new contact score: {heuristic.get('scores', {}).get('contact', 0)}")
     
+    if truncated_pages:
+        heuristic.setdefault("evidence", {})["truncated_pages"] = truncated_pages
+    
+    # Keep the analyzed pages so later re-analysis needs no refetch (helpers.snapshot_store)
+    if use_cache:
+        with timer.stage("snapshot_write"):
+            await asyncio.to_thread(
+                save_snapshot, url, final_url, static_html,
+                html_to_score if html_to_score != static_html else None, render_pathway, truncated_pages,
+                # A run whose render was skipped must not replace a rendered snapshot
+                render_pathway not in ("render_skipped_overload", "render_skipped_deadline")
+            )
+    
     # Step 5: Extract content for AI
-    site_content = extract_site_content_for_ai(html_to_score, max_chars=6000)
+    with timer.stage("content_extraction"):
+        site_content = await asyncio.to_thread(extract_site_content_for_ai, html_to_score, 6000, page)
     
     # Step 5.5: Detect technographics from existing HTML (no new requests)
-    technographics_data = detect_technographics(html_to_score, final_url)
+    with timer.stage("technographics"):
+        technographics_data = await asyncio.to_thread(detect_technographics, html_to_score, final_url, None, page)
     
     # Determine rendering limitations
     rendering_limitations = (
@@ -368,13 +1040,16 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
     )
     
     # Step 6: Run AI scoring
-    ai_review = score_with_ai(
-        site_content=site_content,
-        heuristic_evidence=heuristic.get("evidence", {}),
-        final_url=final_url,
-        rendering_limitations=rendering_limitations,
-        technographics=technographics_data
-    )
+    with timer.stage("ai"):
+        ai_review = await score_with_ai_async(
+            site_content=site_content,
+            heuristic_evidence=heuristic.get("evidence", {}),
+            final_url=final_url,
+            rendering_limitations=rendering_limitations,
+            technographics=technographics_data,
+            use_cache=use_cache,
+            deadline=deadline
+        )
     
     # Step 7: Combine scores
     result = combine_scores(heuristic, ai_review)
@@ -390,9 +1065,10 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
     result["detection_signals"] = detection.get("signals", [])
     result["rendering_limitations"] = rendering_limitations
     result["technographics"] = technographics_data
+    result["component_versions"] = current_component_versions()
     
-    # Step 8: Save to cache
-    if use_cache:
+    # Step 8: Save to cache (overload/deadline-degraded scores are not worth keeping for 24h)
+    if use_cache and render_pathway not in ("render_skipped_overload", "render_skipped_deadline"):
         cache_data = {
             "heuristic": heuristic,
             "ai_review": ai_review,
@@ -405,11 +1081,58 @@ def score_website_hybrid(url: str, use_cache: bool = True) -> Dict[str, Any]:
             "js_confidence": detection.get("confidence", 0.0),
             "detection_signals": detection.get("signals", []),
             "framework_hints": detection.get("framework_hints", []),
-            "technographics": technographics_data
+            "technographics": technographics_data,
+            "page_validators": build_page_validators(fetch_result),
+            "component_versions": result["component_versions"]
         }
-        save_score_to_cache(url, cache_data)
+        with timer.stage("cache_write"):
+            await asyncio.to_thread(save_score_to_cache, url, cache_data)
     
-    return result
+    return _with_timings(result, timer, render_pathway)
+
+
+def score_website_hybrid(url: str, use_cache: bool = True, timeout: Optional[float] = None,
+                         priority: str = "bulk", mode: str = "full") -> Dict[str, Any]:
+    """
+    Blocking wrapper around score_website_hybrid_async() for sync callers.
+    The work runs on the shared engine loop, not on the calling thread.
+    
+    Args:
+        url: Website URL to score
+        use_cache: Whether to use/update cache (default True)
+        timeout: Optional scoring budget in seconds, enforced as a Deadline on
+            the engine loop; raises DeadlineExceeded (a TimeoutError) when spent
+        priority: Render lane, "interactive" or "bulk" (default)
+        mode: "full" (default) or "triage" for a provisional heuristic-only score
+    """
+    deadline = Deadline(timeout) if timeout is not None else None
+    return run_sync(
+        score_website_hybrid_async(url, use_cache=use_cache, priority=priority, mode=mode, deadline=deadline),
+        timeout=timeout + DEADLINE_GRACE_SECONDS if timeout is not None else None
+    )
+
+
+def select_for_ai_review(triage_scores: Dict[str, int], top_n: Optional[int] = None,
+                         min_score: Optional[int] = None) -> List[str]:
+    """
+    Pick which triaged leads get the full AI review.
+    
+    Args:
+        triage_scores: Lead id -> provisional heuristic score (0-50)
+        top_n: Always include the N highest-scoring leads
+        min_score: Include every lead scoring at least this much
+            (defaults to TRIAGE_AI_MIN_HEURISTIC when top_n is not given)
+        
+    Returns:
+        Selected lead ids, highest provisional score first
+    """
+    if top_n is None and min_score is None:
+        min_score = TRIAGE_AI_MIN_HEURISTIC
+    ranked = sorted(triage_scores, key=lambda lead_id: triage_scores[lead_id], reverse=True)
+    selected = set(ranked[:top_n]) if top_n else set()
+    if min_score is not None:
+        selected.update(lead_id for lead_id in ranked if triage_scores[lead_id] >= min_score)
+    return [lead_id for lead_id in ranked if lead_id in selected]
 
 
 def create_backward_compatible_reasoning(hybrid_result: Dict[str, Any]) -> Dict[str, Any]:
@@ -478,6 +1201,10 @@ def create_backward_compatible_reasoning(hybrid_result: Dict[str, Any]) -> Dict[
         "detection_signals": hybrid_result.get("detection_signals", []),
         "cached": hybrid_result.get("cached", False),
         
+        # Triage mode: heuristic-only score awaiting AI review
+        "provisional": hybrid_result.get("provisional", False),
+        "scoring_mode": hybrid_result.get("scoring_mode", "full"),
+        
         # Bot blocking detection
         "bot_blocked": hybrid_result.get("bot_blocked", False),
         "sophistication_message": hybrid_result.get("sophistication_message", ""),
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine, Column, String, Integer, Float, DateTime, JSON, Text, ForeignKey, Boolean
+from sqlalchemy import create_engine, text, Column, String, Integer, Float, DateTime, JSON, Text, ForeignKey, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -205,6 +205,8 @@ class Lead(Base):
     js_confidence = Column(Float, nullable=True)
     framework_hints = Column(JSON, nullable=True)
     technographics = Column(JSON, nullable=True)
+    # {"heuristics", "ai", "technographics"} versions that produced the score
+    component_versions = Column(JSON, nullable=True)
     
     source = Column(String, default="search")
     import_id = Column(String, ForeignKey("csv_imports.id"), nullable=True)
@@ -261,10 +263,45 @@ class ScoreCache(Base):
     has_errors = Column(Boolean, default=False)
     error_messages = Column(JSON, nullable=True)
     
-    fetched_at = Column(DateTime, default=datetime.now, nullable=False)
+    # {page_url: {"etag", "last_modified", "content_hash"}} for conditional revalidation
+    page_validators = Column(JSON, nullable=True)
+    
+    # Reused by partial re-scores (helpers.rescore) while the technographics version is current
+    technographics = Column(JSON, nullable=True)
+    
+    # {"heuristics", "ai", "technographics"} versions that produced the entry
+    component_versions = Column(JSON, nullable=True)
+    
+    # Lookups served from the entry (flushed in batches, see hybrid_scorer.flush_cache_hits)
+    hit_count = Column(Integer, default=0, nullable=False)
+    last_hit_at = Column(DateTime, nullable=True)
+    
+    # Indexed for the retention job (helpers.score_cache_retention)
+    fetched_at = Column(DateTime, default=datetime.now, nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.now)
 
 
+class UnreachableDomain(Base):
+    """Negative score cache: domains whose last scoring ended fetch_failed or bot_blocked."""
+    __tablename__ = "unreachable_domains"
+    
+    domain = Column(String, primary_key=True)
+    render_pathway = Column(String, nullable=False)
+    failure_count = Column(Integer, default=1, nullable=False)
+    last_result = Column(JSON, nullable=True)
+    last_failed_at = Column(DateTime, default=datetime.now, nullable=False)
+    retry_after = Column(DateTime, nullable=False, index=True)
+
+
+class ScoringLease(Base):
+    """Cross-process single-flight lease: one worker scores a URL, the rest wait for its cache write."""
+    __tablename__ = "scoring_leases"
+    
+    url_hash = Column(String, primary_key=True)
+    owner = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+
 class GlobalState(Base):
     __tablename__ = "global_state"
     
@@ -385,19 +422,43 @@ class Waitlist(Base):
     invited_at = Column(DateTime, nullable=True)
 
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
-    connect_args={"connect_timeout": 10}
-)
+if DATABASE_URL.startswith("sqlite"):
+    # Local benchmark / scratch databases (see scoring_benchmark.py); the pool
+    # and connect_timeout settings below are Postgres-only
+    engine = create_engine(DATABASE_URL, connect_args={"timeout": 30})
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=10,
+        max_overflow=20,
+        connect_args={"connect_timeout": 10}
+    )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Columns added to existing tables after they were first created. create_all()
+# never alters existing tables, so init_db() applies these idempotently.
+SCHEMA_PATCHES = [
+    "ALTER TABLE score_cache ADD COLUMN IF NOT EXISTS page_validators JSON",
+    "ALTER TABLE score_cache ADD COLUMN IF NOT EXISTS component_versions JSON",
+    "ALTER TABLE leads ADD COLUMN IF NOT EXISTS component_versions JSON",
+    "ALTER TABLE score_cache ADD COLUMN IF NOT EXISTS hit_count INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE score_cache ADD COLUMN IF NOT EXISTS last_hit_at TIMESTAMP",
+    "CREATE INDEX IF NOT EXISTS ix_score_cache_fetched_at ON score_cache (fetched_at)",
+    "ALTER TABLE score_cache ADD COLUMN IF NOT EXISTS technographics JSON",
+]
+
+
 def init_db():
-    """Create all tables in the database."""
+    """Create all tables in the database and apply SCHEMA_PATCHES."""
     Base.metadata.create_all(bind=engine)
+    for statement in SCHEMA_PATCHES:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(statement))
+        except Exception as e:
+            print(f"Schema patch skipped ({statement}): {str(e)[:100]}")
     
 def get_db():
     """Get database session."""
@@ -0,0 +1,205 @@
+"""
+Parse-once document model shared by the scoring analyzers.
+Each fetched/rendered HTML document is parsed a single time and the tree,
+visible text, script inventory, links and meta tags are reused by
+framework detection, heuristics, technographics and AI content extraction.
+"""
+
+import os
+from typing import Any, Dict, List, Optional, Set
+from bs4 import BeautifulSoup, Tag
+from bs4.builder import builder_registry
+
+
+# Elements whose contents never reach the rendered page text
+INVISIBLE_TAGS = ('script', 'style', 'noscript')
+
+# BeautifulSoup tree builders in order of preference. The fastest installed one
+# is used unless HTML_PARSER_BACKEND pins a specific backend.
+PARSER_BACKENDS = ('lxml', 'html.parser')
+
+_parser_backend: Optional[str] = None
+
+
+def available_parser_backends() -> List[str]:
+    """Parser backends from PARSER_BACKENDS that are installed in this environment."""
+    return [name for name in PARSER_BACKENDS if builder_registry.lookup(name) is not None]
+
+
+def get_parser_backend() -> str:
+    """Backend used for new ParsedPage objects (env override, else fastest installed)."""
+    global _parser_backend
+    if _parser_backend is None:
+        available = available_parser_backends()
+        requested = os.getenv("HTML_PARSER_BACKEND", "").strip()
+        if requested and requested in available:
+            _parser_backend = requested
+        else:
+            if requested:
+                print(f"HTML parser backend '{requested}' not available, using {available[0]}")
+            _parser_backend = available[0]
+    return _parser_backend
+
+
+def set_parser_backend(name: Optional[str]) -> None:
+    """
+    Pin the parser backend for this process (None re-runs auto-detection).
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    global _parser_backend
+    if name is not None and name not in available_parser_backends():
+        raise ValueError(f"HTML parser backend '{name}' is not available")
+    _parser_backend = name
+
+
+class ParsedPage:
+    """
+    A single parsed HTML document.
+
+    Expensive views (text, scripts, links, meta tags) are computed lazily on
+    first access and cached. The underlying tree is never mutated, so the same
+    page can be handed to every analyzer in turn.
+    """
+
+    def __init__(self, html: str, url: str = "", parser: Optional[str] = None):
+        self.html = html or ""
+        self.url = url
+        self.parser = parser or get_parser_backend()
+        self.soup = BeautifulSoup(self.html, self.parser)
+        self._cache: Dict[str, Any] = {}
+
+    def _cached(self, key: str, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    @property
+    def html_lower(self) -> str:
+        """Lower-cased raw HTML for substring signature checks."""
+        return self._cached("html_lower", self.html.lower)
+
+    @property
+    def text(self) -> str:
+        """All document text, equivalent to soup.get_text(separator=' ', strip=True)."""
+        self._collect_text()
+        return self._cache["text"]
+
+    @property
+    def visible_text(self) -> str:
+        """Document text with script, style and noscript contents removed."""
+        self._collect_text()
+        return self._cache["visible_text"]
+
+    def _hidden_ids(self) -> Set[int]:
+        """ids of every node that sits inside a script, style or noscript element."""
+        def compute():
+            hidden = set()
+            for tag in self.soup.find_all(INVISIBLE_TAGS):
+                hidden.add(id(tag))
+                hidden.update(id(node) for node in tag.descendants)
+            return hidden
+        return self._cached("hidden_ids", compute)
+
+    def _collect_text(self):
+        """Build text and visible_text in one traversal of the tree."""
+        if "text" in self._cache:
+            return
+        hidden = self._hidden_ids()
+        all_strings = []
+        visible_strings = []
+        for string in self._strings(self.soup):
+            stripped = string.strip()
+            if not stripped:
+                continue
+            all_strings.append(stripped)
+            if id(string) not in hidden:
+                visible_strings.append(stripped)
+        self._cache["text"] = ' '.join(all_strings)
+        self._cache["visible_text"] = ' '.join(visible_strings)
+
+    @staticmethod
+    def _strings(tag: Tag):
+        """Yield the same text nodes Tag.get_text() would consider."""
+        types = tag.interesting_string_types
+        for node in tag.descendants:
+            node_type = type(node)
+            if isinstance(types, type):
+                if node_type is not types:
+                    continue
+            elif types is not None and node_type not in types:
+                continue
+            yield node
+
+    def is_visible(self, element) -> bool:
+        """True unless the element sits inside a script, style or noscript element."""
+        return id(element) not in self._hidden_ids()
+
+    def visible_text_of(self, tag: Tag, separator: str = "", strip: bool = False) -> str:
+        """get_text() for a single element, ignoring any noscript/script/style descendants."""
+        hidden = self._hidden_ids()
+        parts = []
+        for string in self._strings(tag):
+            if id(string) in hidden:
+                continue
+            if strip:
+                string = string.strip()
+                if not string:
+                    continue
+            parts.append(string)
+        return separator.join(parts)
+
+    def find_visible(self, name, **kwargs) -> Optional[Tag]:
+        """First matching element outside script/style/noscript."""
+        found = self.find_all_visible(name, limit=1, **kwargs)
+        return found[0] if found else None
+
+    def find_all_visible(self, name, limit: Optional[int] = None, within: Optional[Tag] = None,
+                         **kwargs) -> List[Tag]:
+        """Matching elements outside script/style/noscript, optionally scoped to `within`."""
+        root = within if within is not None else self.soup
+        hidden = self._hidden_ids()
+        results = []
+        for element in root.find_all(name, **kwargs):
+            if id(element) in hidden:
+                continue
+            results.append(element)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    @property
+    def scripts(self) -> List[Tag]:
+        """Every <script> element in document order."""
+        return self._cached("scripts", lambda: self.soup.find_all('script'))
+
+    @property
+    def script_srcs(self) -> List[str]:
+        """src attributes of external scripts."""
+        return self._cached("script_srcs", lambda: [s.get('src', '') for s in self.scripts if s.get('src')])
+
+    @property
+    def anchors(self) -> List[Tag]:
+        """Every <a> element in document order."""
+        return self._cached("anchors", lambda: self.soup.find_all('a'))
+
+    @property
+    def links(self) -> List[Tag]:
+        """<a> elements that carry an href attribute."""
+        return self._cached("links", lambda: [a for a in self.anchors if a.has_attr('href')])
+
+    @property
+    def meta_tags(self) -> List[Tag]:
+        """Every <meta> element in document order."""
+        return self._cached("meta_tags", lambda: self.soup.find_all('meta'))
+
+    def find_meta(self, name: Optional[str] = None, property: Optional[str] = None) -> Optional[Tag]:
+        """First <meta> whose name (or property) attribute matches exactly."""
+        for meta in self.meta_tags:
+            if name is not None and meta.get('name') != name:
+                continue
+            if property is not None and meta.get('property') != property:
+                continue
+            return meta
+        return None
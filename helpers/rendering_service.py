@@ -3,27 +3,489 @@ Playwright-based rendering service for JavaScript-heavy websites.
 Provides selective rendering with caching and error handling.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import asyncio
 import hashlib
+import heapq
+import itertools
+import os
 import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
+from helpers.deadline import Deadline
+from helpers.engine_loop import run_sync, loop_local
+from helpers.cache_store import TTLByteLRU, DiskBlobStore
+from helpers.stage_timings import percentile
+
 _playwright_imported = False
-sync_playwright = None
+async_playwright = None
 PlaywrightTimeout = None
 
 def _ensure_playwright():
-    global _playwright_imported, sync_playwright, PlaywrightTimeout
+    global _playwright_imported, async_playwright, PlaywrightTimeout
     if not _playwright_imported:
-        from playwright.sync_api import sync_playwright as _sp, TimeoutError as _pt
-        sync_playwright = _sp
+        from playwright.async_api import async_playwright as _ap, TimeoutError as _pt
+        async_playwright = _ap
         PlaywrightTimeout = _pt
         _playwright_imported = True
 
 
-# In-memory cache for rendered content (24h TTL)
-_render_cache: Dict[str, Dict[str, Any]] = {}
+# Browser pool sizing and recycling policy
+BROWSER_POOL_SIZE = int(os.getenv("RENDER_BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES = int(os.getenv("RENDER_BROWSER_MAX_PAGES", "50"))
+BROWSER_MAX_RSS_MB = int(os.getenv("RENDER_BROWSER_MAX_RSS_MB", "1500"))
+
+BROWSER_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+]
+
+RENDER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def _process_parents() -> Optional[Dict[int, int]]:
+    """{pid: parent pid} of every process, read from /proc (None where there is no /proc)."""
+    try:
+        names = os.listdir("/proc")
+    except OSError:
+        return None
+    parents = {}
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces: state and ppid follow its closing parenthesis
+        parents[int(name)] = int(stat[stat.rfind(b")") + 1:].split()[1])
+    return parents
+
+
+def _process_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _find_browser_pid(marker: str) -> Optional[int]:
+    """Root process of the browser launched with marker among its switches, or None."""
+    needle = marker.encode()
+    try:
+        names = os.listdir("/proc")
+    except OSError:
+        return None
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/cmdline", "rb") as f:
+                args = f.read().split(b"\0")
+        except OSError:
+            continue
+        # Renderer, GPU and utility processes all run with a --type= switch
+        if needle in args and not any(arg.startswith(b"--type=") for arg in args):
+            return int(name)
+    return None
+
+
+def _browser_tree_rss_mb(pid: int) -> Optional[float]:
+    """
+    Resident memory of one browser (its root process plus renderer, GPU and
+    utility children) in MB, or None where there is no /proc or the process
+    is gone.
+    """
+    parents = _process_parents()
+    if parents is None or pid not in parents:
+        return None
+    children: Dict[int, List[int]] = {}
+    for child, parent in parents.items():
+        children.setdefault(parent, []).append(child)
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        total_kb += _process_rss_kb(current)
+        pending.extend(children.get(current, ()))
+    return total_kb / 1024
+
+
+def _slot_rss_mb(slot: "_BrowserSlot") -> Optional[float]:
+    if slot.pid is None:
+        return None
+    rss_mb = _browser_tree_rss_mb(slot.pid)
+    return round(rss_mb, 1) if rss_mb is not None else None
+
+
+class _BrowserSlot:
+    """One warm browser and the number of renders it has served."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        # Root process of the browser, for its memory check (None where there is no /proc)
+        self.pid: Optional[int] = None
+        self.pages_served = 0
+        self.launched_at: Optional[float] = None
+
+
+class BrowserPool:
+    """
+    Pool of warm headless Chromium browsers bound to the engine loop.
+
+    Each render gets its own incognito context on a pooled browser, so cookies
+    and storage never leak between sites. Browsers are relaunched after
+    BROWSER_MAX_PAGES renders, when that browser's process tree crosses
+    BROWSER_MAX_RSS_MB, or when they disconnect.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, max_pages: int = BROWSER_MAX_PAGES,
+                 max_rss_mb: int = BROWSER_MAX_RSS_MB):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._playwright = None
+        self._start_lock = asyncio.Lock()
+        self._idle: "asyncio.Queue[_BrowserSlot]" = asyncio.Queue()
+        self._slots: List[_BrowserSlot] = []
+        self._closed = False
+        self.stats = {
+            "renders": 0,
+            "launches": 0,
+            "recycled_max_pages": 0,
+            "recycled_rss": 0,
+            "recycled_disconnected": 0,
+            "launch_failures": 0,
+        }
+
+    async def _start(self):
+        async with self._start_lock:
+            if self._playwright is not None:
+                return
+            _ensure_playwright()
+            self._playwright = await async_playwright().start()
+            self._slots = [_BrowserSlot(i) for i in range(self.size)]
+            for slot in self._slots:
+                self._idle.put_nowait(slot)
+
+    async def _launch(self, slot: _BrowserSlot):
+        # Playwright does not expose the browser's pid: a unique switch (ignored
+        # by Chromium) identifies its process, even with other pools launching
+        marker = f"--lead-gen-browser={uuid.uuid4().hex}"
+        try:
+            slot.browser = await self._playwright.chromium.launch(
+                headless=True,
+                args=BROWSER_LAUNCH_ARGS + [marker]
+            )
+        except Exception:
+            self.stats["launch_failures"] += 1
+            raise
+        slot.pid = await asyncio.to_thread(_find_browser_pid, marker)
+        slot.pages_served = 0
+        slot.launched_at = time.time()
+        self.stats["launches"] += 1
+
+    async def _retire(self, slot: _BrowserSlot, reason: str):
+        browser, slot.browser = slot.browser, None
+        slot.pid = None
+        self.stats[f"recycled_{reason}"] += 1
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"Browser pool: error closing browser {slot.index}: {str(e)[:100]}")
+
+    async def _release(self, slot: _BrowserSlot):
+        if slot.browser is not None:
+            if not slot.browser.is_connected():
+                await self._retire(slot, "disconnected")
+            elif slot.pages_served >= self.max_pages:
+                await self._retire(slot, "max_pages")
+            elif slot.pid is not None:
+                rss_mb = await asyncio.to_thread(_browser_tree_rss_mb, slot.pid)
+                if rss_mb is not None and rss_mb > self.max_rss_mb:
+                    await self._retire(slot, "rss")
+        if self._closed and slot.browser is not None:
+            try:
+                await slot.browser.close()
+            except Exception:
+                pass
+            slot.browser = None
+        self._idle.put_nowait(slot)
+
+    @asynccontextmanager
+    async def context(self, **context_options):
+        """
+        Borrow a browser and yield a fresh incognito context on it.
+        The context is always closed and the browser returned to the pool.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        await self._start()
+        slot = await self._idle.get()
+        try:
+            if slot.browser is None or not slot.browser.is_connected():
+                if slot.browser is not None:
+                    await self._retire(slot, "disconnected")
+                await self._launch(slot)
+            context = await slot.browser.new_context(**context_options)
+            slot.pages_served += 1
+            self.stats["renders"] += 1
+            try:
+                yield context
+            finally:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+        finally:
+            await self._release(slot)
+
+    async def close(self):
+        """Close every idle browser and stop Playwright; busy browsers close on release."""
+        self._closed = True
+        while not self._idle.empty():
+            slot = self._idle.get_nowait()
+            if slot.browser is not None:
+                try:
+                    await slot.browser.close()
+                except Exception:
+                    pass
+                slot.browser = None
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, occupancy and recycle counters."""
+        return {
+            "pool_size": self.size,
+            "started": self._playwright is not None,
+            "closed": self._closed,
+            "warm_browsers": sum(1 for slot in self._slots if slot.browser is not None),
+            "idle_slots": self._idle.qsize(),
+            "busy_slots": len(self._slots) - self._idle.qsize() if self._slots else 0,
+            "pages_per_browser": [slot.pages_served for slot in self._slots],
+            "rss_mb_per_browser": [_slot_rss_mb(slot) for slot in self._slots],
+            "max_pages_per_browser": self.max_pages,
+            "max_rss_mb": self.max_rss_mb,
+            **self.stats,
+        }
+
+
+_browser_pools: List[BrowserPool] = []
+
+
+def get_browser_pool() -> BrowserPool:
+    """Browser pool for the running event loop (one per loop, created on first use)."""
+    def create():
+        pool = BrowserPool()
+        _browser_pools.append(pool)
+        return pool
+    return loop_local("rendering_service.browser_pool", create)
+
+
+async def close_browser_pool_async():
+    """Shut down the running loop's browser pool, if one was created."""
+    pool = get_browser_pool()
+    await pool.close()
+    _browser_pools.remove(pool)
+
+
+def close_browser_pool(timeout: float = 10.0):
+    """Blocking shutdown of the engine loop's browser pool (call on app shutdown)."""
+    if not _browser_pools:
+        return
+    run_sync(close_browser_pool_async(), timeout=timeout)
+
+
+# Render admission control: a global cap on concurrent renders, and a bounded
+# wait queue where interactive scoring always goes ahead of bulk work.
+RENDER_MAX_CONCURRENCY = int(os.getenv("RENDER_MAX_CONCURRENCY", str(BROWSER_POOL_SIZE)))
+RENDER_MAX_QUEUE_DEPTH = int(os.getenv("RENDER_MAX_QUEUE_DEPTH", "20"))
+
+RENDER_PRIORITY_INTERACTIVE = "interactive"
+RENDER_PRIORITY_BULK = "bulk"
+RENDER_LANES = (RENDER_PRIORITY_INTERACTIVE, RENDER_PRIORITY_BULK)
+
+# Seconds of scoring budget a render needs to be worth starting
+RENDER_MIN_BUDGET = 3.0
+
+# Number of recent queue waits kept per lane for percentile metrics
+_WAIT_SAMPLE_SIZE = 500
+
+
+class RenderOverloaded(Exception):
+    """Raised when the render queue is full and a render is refused admission."""
+
+
+class RenderScheduler:
+    """
+    Priority-aware admission control for renders on one event loop.
+
+    At most max_concurrency renders run at once. Further requests wait in a
+    priority queue (interactive before bulk, FIFO within a lane) that holds at
+    most max_queue_depth entries; beyond that, slot() raises RenderOverloaded
+    so callers can fall back to static HTML instead of piling up.
+    """
+
+    def __init__(self, max_concurrency: int = RENDER_MAX_CONCURRENCY,
+                 max_queue_depth: int = RENDER_MAX_QUEUE_DEPTH):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue_depth = max(0, max_queue_depth)
+        self._active = 0
+        self._waiters: List[Any] = []
+        self._sequence = itertools.count()
+        self._lane_depth = {lane: 0 for lane in RENDER_LANES}
+        self._admitted = {lane: 0 for lane in RENDER_LANES}
+        self._rejected = {lane: 0 for lane in RENDER_LANES}
+        self._waits = {lane: deque(maxlen=_WAIT_SAMPLE_SIZE) for lane in RENDER_LANES}
+        self._max_wait = {lane: 0.0 for lane in RENDER_LANES}
+
+    @staticmethod
+    def _lane(priority: str) -> str:
+        return priority if priority in RENDER_LANES else RENDER_PRIORITY_BULK
+
+    def _record_wait(self, lane: str, waited: float):
+        self._admitted[lane] += 1
+        self._waits[lane].append(waited)
+        self._max_wait[lane] = max(self._max_wait[lane], waited)
+
+    def _wake_next(self):
+        """Hand the freed slot directly to the highest-priority live waiter."""
+        while self._waiters:
+            _, _, lane, future = heapq.heappop(self._waiters)
+            self._lane_depth[lane] -= 1
+            if not future.done():
+                self._active += 1
+                future.set_result(True)
+                return
+
+    async def _acquire(self, lane: str):
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self._record_wait(lane, 0.0)
+            return
+        if len(self._waiters) >= self.max_queue_depth:
+            self._rejected[lane] += 1
+            raise RenderOverloaded(
+                f"Render queue full ({len(self._waiters)} waiting, {self._active} rendering)"
+            )
+        future = asyncio.get_running_loop().create_future()
+        rank = RENDER_LANES.index(lane)
+        entry = (rank, next(self._sequence), lane, future)
+        heapq.heappush(self._waiters, entry)
+        self._lane_depth[lane] += 1
+        started = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted just as we were cancelled - pass it on
+                self._release()
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._lane_depth[lane] -= 1
+            raise
+        self._record_wait(lane, time.monotonic() - started)
+
+    def _release(self):
+        self._active -= 1
+        self._wake_next()
+
+    @asynccontextmanager
+    async def slot(self, priority: str = RENDER_PRIORITY_BULK):
+        """
+        Hold one render slot for the duration of the block.
+
+        Raises:
+            RenderOverloaded: If the wait queue is already full
+        """
+        await self._acquire(self._lane(priority))
+        try:
+            yield
+        finally:
+            self._release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Concurrency, queue depth and wait-time metrics per lane."""
+        lanes = {}
+        for lane in RENDER_LANES:
+            waits = list(self._waits[lane])
+            lanes[lane] = {
+                "queued": self._lane_depth[lane],
+                "admitted": self._admitted[lane],
+                "rejected_overload": self._rejected[lane],
+                "wait_p50_s": percentile(waits, 50),
+                "wait_p95_s": percentile(waits, 95),
+                "wait_max_s": round(self._max_wait[lane], 3),
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue_depth": self.max_queue_depth,
+            "active": self._active,
+            "queue_depth": len(self._waiters),
+            "lanes": lanes,
+        }
+
+
+_render_schedulers: List[RenderScheduler] = []
+
+
+def get_render_scheduler() -> RenderScheduler:
+    """Render scheduler for the running event loop (one per loop, created on first use)."""
+    def create():
+        scheduler = RenderScheduler()
+        _render_schedulers.append(scheduler)
+        return scheduler
+    return loop_local("rendering_service.render_scheduler", create)
+
+
+# Rendered content cache (24h TTL): a byte-bounded in-memory LRU, plus an
+# optional compressed on-disk tier under RENDER_CACHE_DIR that every worker
+# process on the host shares.
 CACHE_TTL_HOURS = 24
+RENDER_CACHE_MAX_MB = int(os.getenv("RENDER_CACHE_MAX_MB", "128"))
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "").strip()
+RENDER_CACHE_DISK_MAX_MB = int(os.getenv("RENDER_CACHE_DISK_MAX_MB", "1024"))
+
+_render_cache = TTLByteLRU(
+    max_bytes=RENDER_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=CACHE_TTL_HOURS * 3600
+)
+_render_disk_cache: Optional[DiskBlobStore] = None
+_render_disk_cache_failed = False
+
+
+def _get_disk_cache() -> Optional[DiskBlobStore]:
+    """Shared on-disk render cache, or None when RENDER_CACHE_DIR is unset or unusable."""
+    global _render_disk_cache, _render_disk_cache_failed
+    if _render_disk_cache is None and RENDER_CACHE_DIR and not _render_disk_cache_failed:
+        try:
+            _render_disk_cache = DiskBlobStore(
+                RENDER_CACHE_DIR,
+                ttl_seconds=CACHE_TTL_HOURS * 3600,
+                max_bytes=RENDER_CACHE_DISK_MAX_MB * 1024 * 1024
+            )
+        except OSError as e:
+            _render_disk_cache_failed = True
+            print(f"Render disk cache disabled ({RENDER_CACHE_DIR}): {e}")
+    return _render_disk_cache
 
 
 def _get_cache_key(url: str) -> str:
@@ -42,32 +504,60 @@ def _is_cache_valid(cache_entry: Dict[str, Any]) -> bool:
     return datetime.now() < expiry_time
 
 
-def render_with_playwright(
+async def _get_cached_render(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Look up a render in memory, then on disk (promoting disk hits into memory)."""
+    cached = _render_cache.get(cache_key)
+    if cached is None:
+        disk_cache = _get_disk_cache()
+        if disk_cache is None:
+            return None
+        cached = await asyncio.to_thread(disk_cache.get, cache_key)
+        if not _is_cache_valid(cached):
+            return None
+        _render_cache.set(cache_key, cached, stored_at=cached["timestamp"])
+    return {**cached, "from_cache": True}
+
+
+async def _store_render(cache_key: str, result: Dict[str, Any]):
+    """Write a successful render to both cache tiers."""
+    _render_cache.set(cache_key, result)
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        await asyncio.to_thread(disk_cache.put, cache_key, result)
+
+
+async def render_with_playwright_async(
     url: str,
     timeout: int = 8000,
     wait_for_selector: Optional[str] = None,
-    use_cache: bool = True
+    use_cache: bool = True,
+    priority: str = RENDER_PRIORITY_BULK,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """
-    Render a JavaScript-heavy website using headless Chromium.
+    Render a JavaScript-heavy website on a pooled headless Chromium (async Playwright).
     
     Args:
         url: URL to render
         timeout: Page load timeout in milliseconds (default 8000ms)
         wait_for_selector: Optional CSS selector to wait for before capturing
         use_cache: Whether to use cached results (default True)
+        priority: Render lane, RENDER_PRIORITY_INTERACTIVE or RENDER_PRIORITY_BULK
+        deadline: Scoring deadline; the render (queueing included) is abandoned
+            when it passes, and not started with less than RENDER_MIN_BUDGET left
         
     Returns:
-        Dict with rendered HTML, status, errors, and metadata
+        Dict with rendered HTML, status, errors, and metadata. "overloaded" is
+        True when the render queue was full and nothing was rendered;
+        "deadline_exceeded" when the scoring deadline cut the render short.
     """
     _ensure_playwright()
     cache_key = _get_cache_key(url)
     
     # Check cache first
-    if use_cache and cache_key in _render_cache:
-        cached = _render_cache[cache_key]
-        if _is_cache_valid(cached):
-            cached["from_cache"] = True
+    if use_cache:
+        cached = await _get_cached_render(cache_key)
+        if cached:
             return cached
     
     result = {
@@ -79,36 +569,35 @@ def render_with_playwright(
         "errors": [],
         "metadata": {},
         "timestamp": time.time(),
-        "from_cache": False
+        "from_cache": False,
+        "overloaded": False,
+        "deadline_exceeded": False
     }
     
+    if deadline is not None:
+        if not deadline.allows(RENDER_MIN_BUDGET):
+            result["deadline_exceeded"] = True
+            result["errors"].append("Render skipped: scoring deadline too close")
+            return result
+        timeout = min(timeout, int(deadline.remaining() * 1000))
+    
     try:
-        with sync_playwright() as p:
-            # Launch browser with stealth settings
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                ]
-            )
-            
-            # Create context with realistic settings
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                ignore_https_errors=True,
-                java_script_enabled=True
-            )
-            
+        # Wait for a render slot, then use a fresh incognito context with
+        # realistic settings on a pooled browser
+        async with asyncio.timeout(deadline.remaining() if deadline is not None else None), \
+                get_render_scheduler().slot(priority), \
+                get_browser_pool().context(
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent=RENDER_USER_AGENT,
+                    ignore_https_errors=True,
+                    java_script_enabled=True
+                ) as context:
             # Create page
-            page = context.new_page()
+            page = await context.new_page()
             
             # Navigate with timeout
             try:
-                response = page.goto(url, timeout=timeout, wait_until='networkidle')
+                response = await page.goto(url, timeout=timeout, wait_until='networkidle')
                 
                 if response:
                     result["status_code"] = response.status
@@ -117,22 +606,22 @@ def render_with_playwright(
                 # Wait for specific selector if provided
                 if wait_for_selector:
                     try:
-                        page.wait_for_selector(wait_for_selector, timeout=2000)
+                        await page.wait_for_selector(wait_for_selector, timeout=2000)
                     except PlaywrightTimeout:
                         result["errors"].append(f"Selector '{wait_for_selector}' not found")
                 
                 # Additional wait for dynamic content
-                page.wait_for_timeout(1000)
+                await page.wait_for_timeout(1000)
                 
                 # Capture rendered HTML
-                result["html"] = page.content()
+                result["html"] = await page.content()
                 
                 # Extract text content
-                result["text_content"] = page.evaluate("document.body.innerText")
+                result["text_content"] = await page.evaluate("document.body.innerText")
                 
                 # Capture metadata
                 result["metadata"] = {
-                    "title": page.title(),
+                    "title": await page.title(),
                     "url": page.url,
                     "viewport": page.viewport_size,
                 }
@@ -143,24 +632,43 @@ def render_with_playwright(
                 result["errors"].append("Page load timeout")
             except Exception as e:
                 result["errors"].append(f"Navigation error: {str(e)[:200]}")
-            
-            finally:
-                browser.close()
     
+    except RenderOverloaded as e:
+        result["overloaded"] = True
+        result["errors"].append(f"Render skipped: {e}")
+    except TimeoutError:
+        result["deadline_exceeded"] = True
+        result["errors"].append("Render stopped at scoring deadline")
     except Exception as e:
         result["errors"].append(f"Rendering error: {str(e)[:200]}")
     
     # Cache successful renders
     if result["success"] and use_cache:
-        _render_cache[cache_key] = result
+        await _store_render(cache_key, result)
     
     return result
 
 
-def render_if_needed(
+def render_with_playwright(
+    url: str,
+    timeout: int = 8000,
+    wait_for_selector: Optional[str] = None,
+    use_cache: bool = True,
+    priority: str = RENDER_PRIORITY_BULK
+) -> Dict[str, Any]:
+    """Blocking wrapper around render_with_playwright_async() for sync callers."""
+    return run_sync(render_with_playwright_async(
+        url, timeout=timeout, wait_for_selector=wait_for_selector, use_cache=use_cache,
+        priority=priority
+    ))
+
+
+async def render_if_needed_async(
     url: str,
     static_html: str,
-    detection_result: Dict[str, Any]
+    detection_result: Dict[str, Any],
+    priority: str = RENDER_PRIORITY_BULK,
+    deadline: Optional[Deadline] = None
 ) -> Dict[str, Any]:
     """
     Conditionally render a website based on framework detection.
@@ -169,6 +677,8 @@ def render_if_needed(
         url: Website URL
         static_html: Already-fetched static HTML
         detection_result: Output from framework_detector.detect_js_framework()
+        priority: Render lane, RENDER_PRIORITY_INTERACTIVE or RENDER_PRIORITY_BULK
+        deadline: Scoring deadline passed on to the render
         
     Returns:
         Dict with rendering results and pathway information
@@ -191,7 +701,7 @@ def render_if_needed(
         return result
     
     # Attempt rendering
-    render_result = render_with_playwright(url)
+    render_result = await render_with_playwright_async(url, priority=priority, deadline=deadline)
     
     if render_result["success"]:
         result["rendered"] = True
@@ -200,6 +710,14 @@ def render_if_needed(
         result["pathway"] = "rendered"
         result["metadata"] = render_result.get("metadata", {})
         result["from_cache"] = render_result.get("from_cache", False)
+    elif render_result.get("overloaded"):
+        # Render queue full - score the static HTML rather than wait
+        result["pathway"] = "render_skipped_overload"
+        result["errors"] = render_result.get("errors", [])
+    elif render_result.get("deadline_exceeded"):
+        # Out of time - score the static HTML
+        result["pathway"] = "render_skipped_deadline"
+        result["errors"] = render_result.get("errors", [])
     else:
         # Rendering failed - fall back to static
         result["pathway"] = "render_failed"
@@ -208,19 +726,64 @@ def render_if_needed(
     return result
 
 
+def render_if_needed(
+    url: str,
+    static_html: str,
+    detection_result: Dict[str, Any],
+    priority: str = RENDER_PRIORITY_BULK
+) -> Dict[str, Any]:
+    """Blocking wrapper around render_if_needed_async() for sync callers."""
+    return run_sync(render_if_needed_async(url, static_html, detection_result, priority=priority))
+
+
 def clear_render_cache():
-    """Clear all cached rendered content."""
-    global _render_cache
-    _render_cache = {}
+    """Clear all cached rendered content (memory and, if enabled, disk)."""
+    _render_cache.clear()
+    disk_cache = _get_disk_cache()
+    if disk_cache is not None:
+        disk_cache.clear()
 
 
 def get_cache_stats() -> Dict[str, Any]:
     """Get statistics about the render cache."""
-    valid_entries = sum(1 for entry in _render_cache.values() if _is_cache_valid(entry))
+    expired = _render_cache.purge_expired()
+    memory = _render_cache.get_stats()
+    disk_cache = _get_disk_cache()
     
     return {
-        "total_entries": len(_render_cache),
-        "valid_entries": valid_entries,
-        "expired_entries": len(_render_cache) - valid_entries,
-        "cache_ttl_hours": CACHE_TTL_HOURS
+        "total_entries": memory["entries"],
+        "valid_entries": memory["entries"],
+        "expired_entries": expired,
+        "cache_ttl_hours": CACHE_TTL_HOURS,
+        "hit_ratio": memory["hit_ratio"],
+        "bytes": memory["bytes"],
+        "evictions": memory["evictions"],
+        "memory": memory,
+        "disk": disk_cache.get_stats() if disk_cache is not None else None
+    }
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get statistics about the warm browser pools (normally just the engine loop's)."""
+    pools = [pool.get_stats() for pool in _browser_pools]
+    return {
+        "pools": pools,
+        "warm_browsers": sum(p["warm_browsers"] for p in pools),
+        "busy_slots": sum(p["busy_slots"] for p in pools),
+        "renders": sum(p["renders"] for p in pools),
+        "launches": sum(p["launches"] for p in pools),
+        "browser_rss_mb": round(sum(rss for p in pools for rss in p["rss_mb_per_browser"] if rss is not None), 1),
+    }
+
+
+def get_render_queue_stats() -> Dict[str, Any]:
+    """Get render admission metrics: active renders, queue depth and waits per lane."""
+    schedulers = [scheduler.get_stats() for scheduler in _render_schedulers]
+    return {
+        "schedulers": schedulers,
+        "active": sum(s["active"] for s in schedulers),
+        "queue_depth": sum(s["queue_depth"] for s in schedulers),
+        "rejected_overload": sum(
+            lane["rejected_overload"] for s in schedulers for lane in s["lanes"].values()
+        ),
     }
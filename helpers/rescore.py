@@ -0,0 +1,257 @@
+"""
+Incremental re-scoring after a scoring component changes.
+Leads and cache entries carry the component versions that produced them (see
+helpers.component_versions). The planner sorts a user's scored leads by what is
+out of date: a heuristics or technographics bump re-analyzes the site's pages
+(from its snapshot when one is kept - see helpers.snapshot_store - so no
+network either) and recombines with the stored AI review (no OpenAI call, no
+credits), and only a prompt change needs a full re-score.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from helpers.component_versions import current_component_versions, stale_components
+from helpers.deadline import Deadline
+from helpers.engine_loop import run_sync
+from helpers.models import Lead, ScoreCache, SessionLocal
+
+
+# Partial re-scores run in parallel per batch (page fetches still go through
+# the crawl scheduler, so per-host politeness limits apply)
+RESCORE_CONCURRENCY = int(os.getenv("RESCORE_CONCURRENCY", "8"))
+
+# Budget for one partial re-score
+RESCORE_TIMEOUT = 30.0
+
+# Pathways whose stored heuristics were computed on rendered HTML
+RENDERED_PATHWAYS = ("rendered", "escalated_render")
+
+
+def plan_rescore(leads: List[Lead]) -> Dict[str, List[Tuple[Lead, List[str]]]]:
+    """
+    Group scored leads by the work needed to bring them up to date.
+
+    Args:
+        leads: Lead rows (leads never fully scored are ignored)
+
+    Returns:
+        {"current": [...], "partial": [...], "full": [...]} of (lead, stale
+        components) - "partial" needs no AI review, "full" does
+    """
+    plan: Dict[str, List[Tuple[Lead, List[str]]]] = {"current": [], "partial": [], "full": []}
+    for lead in leads:
+        if not lead.website or lead.last_scored_at is None:
+            continue
+        stale = stale_components(lead.component_versions)
+        if not stale:
+            plan["current"].append((lead, stale))
+        elif "ai" in stale:
+            plan["full"].append((lead, stale))
+        else:
+            plan["partial"].append((lead, stale))
+    return plan
+
+
+def _stored_score(url: str) -> Optional[Dict[str, Any]]:
+    """The cache entry for url regardless of age, as the inputs a partial re-score reuses."""
+    from helpers.hybrid_scorer import normalize_url, url_to_hash
+
+    db = SessionLocal()
+    try:
+        entry = db.query(ScoreCache).filter(
+            ScoreCache.url_hash == url_to_hash(normalize_url(url))
+        ).first()
+        if not entry or not entry.ai_result or not entry.heuristic_result:
+            return None
+        return {
+            "heuristic": entry.heuristic_result,
+            "ai_review": entry.ai_result,
+            "render_pathway": entry.render_pathway,
+            "js_detected": entry.js_detected,
+            "js_confidence": entry.js_confidence,
+            "framework_hints": entry.framework_hints or [],
+            "detection_signals": entry.detection_signals or [],
+            "technographics": entry.technographics,
+        }
+    finally:
+        db.close()
+
+
+async def _load_pages_async(url: str, render_pathway: Optional[str],
+                            deadline: Deadline) -> Tuple[str, str, List[str]]:
+    """(html, final_url, truncated_pages) as the original scoring run saw the site."""
+    from helpers.site_fetcher import fetch_multiple_pages_async
+    from helpers.rendering_service import render_with_playwright_async
+    from helpers.snapshot_store import load_snapshot
+
+    # Only a snapshot of the same kind of HTML the stored score was computed on
+    # will do: rendered HTML for rendered pathways, else one from the same pathway
+    snapshot = await asyncio.to_thread(load_snapshot, url)
+    if snapshot:
+        if render_pathway in RENDERED_PATHWAYS:
+            if snapshot.get("rendered_html"):
+                return snapshot["rendered_html"], snapshot["final_url"], snapshot["truncated_pages"]
+        elif snapshot.get("render_pathway") == render_pathway and snapshot["html"]:
+            return snapshot["html"], snapshot["final_url"], snapshot["truncated_pages"]
+
+    # No snapshot kept: refetch (and re-render) the pages
+    fetch_result = await fetch_multiple_pages_async(url, max_pages=3, deadline=deadline)
+    final_url = fetch_result.get("final_url", url)
+    html = fetch_result.get("combined_html", "")
+    if render_pathway in RENDERED_PATHWAYS:
+        rendered = await render_with_playwright_async(final_url, priority="bulk", deadline=deadline)
+        if rendered.get("html"):
+            html = rendered["html"]
+    return html, final_url, fetch_result.get("truncated_pages", [])
+
+
+async def rescore_partial_async(url: str, stale: List[str],
+                                technographics: Optional[Dict[str, Any]] = None,
+                                timeout: float = RESCORE_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Re-run the stale non-AI components for one site and recombine with its stored AI review.
+
+    Args:
+        url: Website URL
+        stale: Stale components, without "ai"
+        technographics: The lead's stored technographics, reused when current
+            (the cache entry's are used when the lead has none)
+        timeout: Budget for refetching (and, for rendered sites, rendering) the
+            pages when no snapshot is kept
+
+    Returns:
+        A scoring result (same shape as score_website_hybrid) stamped with the
+        current versions, or None when the stored inputs or the pages are
+        unavailable and the lead needs a full re-score
+    """
+    from helpers.ai_scorer import combine_scores
+    from helpers.hybrid_scorer import update_cached_components
+    from helpers.parsed_page import ParsedPage
+    from helpers.site_heuristics import score_site_heuristics
+    from helpers.technographics import detect_technographics
+
+    stored = await asyncio.to_thread(_stored_score, url)
+    if stored is None:
+        return None
+
+    html, final_url, truncated_pages = await _load_pages_async(url, stored["render_pathway"], Deadline(timeout))
+    if not html:
+        return None
+    page = await asyncio.to_thread(ParsedPage, html, final_url)
+
+    heuristic = stored["heuristic"]
+    if "heuristics" in stale:
+        heuristic = await asyncio.to_thread(score_site_heuristics, html, final_url, page)
+        if truncated_pages:
+            heuristic.setdefault("evidence", {})["truncated_pages"] = truncated_pages
+    technographics = technographics or stored["technographics"]
+    if "technographics" in stale or technographics is None:
+        technographics = await asyncio.to_thread(detect_technographics, html, final_url, None, page)
+
+    result = combine_scores(heuristic, stored["ai_review"])
+    result["cached"] = False
+    result["has_errors"] = False
+    result["errors"] = []
+    result["render_pathway"] = stored["render_pathway"]
+    result["js_detected"] = stored["js_detected"]
+    result["js_confidence"] = stored["js_confidence"]
+    result["framework_hints"] = stored["framework_hints"]
+    result["detection_signals"] = stored["detection_signals"]
+    result["rendering_limitations"] = (
+        heuristic.get("rendering_limitations", False) or
+        (stored["js_detected"] and stored["render_pathway"] != "rendered")
+    )
+    result["technographics"] = technographics
+    result["component_versions"] = current_component_versions()
+    result["rescored_components"] = stale
+
+    await asyncio.to_thread(
+        update_cached_components, url, heuristic, result["final_score"],
+        result["confidence"], result["component_versions"], technographics
+    )
+    return result
+
+
+def _apply_result(lead_id: str, result: Dict[str, Any]) -> None:
+    from helpers.hybrid_scorer import create_backward_compatible_reasoning
+
+    score_reasoning = create_backward_compatible_reasoning(result)
+    session = SessionLocal()
+    try:
+        lead = session.query(Lead).filter(Lead.id == lead_id).first()
+        if not lead:
+            return
+        lead.score = score_reasoning.get("total_score", 0)
+        lead.score_reasoning = score_reasoning
+        lead.heuristic_score = result.get("heuristic_score")
+        lead.ai_score = result.get("ai_score")
+        lead.score_breakdown = result.get("breakdown")
+        lead.score_confidence = result.get("confidence")
+        lead.technographics = result.get("technographics")
+        lead.component_versions = result.get("component_versions")
+        lead.updated_at = datetime.now()
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"Failed to store re-score for lead {lead_id}: {str(e)[:100]}")
+    finally:
+        session.close()
+
+
+def rescore_user_leads(user_id: int) -> Dict[str, Any]:
+    """
+    Bring a user's scored leads up to the current component versions where no AI review is needed.
+
+    Args:
+        user_id: Owner of the leads
+
+    Returns:
+        Counts of current and re-scored leads, plus the ids of leads that need a
+        full re-score (AI prompt changed, or stored inputs/pages unavailable)
+    """
+    session = SessionLocal()
+    try:
+        leads = session.query(Lead).filter(
+            Lead.user_id == user_id,
+            Lead.last_scored_at.isnot(None)
+        ).all()
+        session.expunge_all()
+    finally:
+        session.close()
+
+    plan = plan_rescore(leads)
+    needs_full = [lead.id for lead, _ in plan["full"]]
+
+    async def run_partials():
+        semaphore = asyncio.Semaphore(RESCORE_CONCURRENCY)
+
+        async def rescore_one(lead: Lead, stale: List[str]):
+            async with semaphore:
+                try:
+                    return await rescore_partial_async(lead.website, stale, lead.technographics)
+                except Exception as e:
+                    print(f"Partial re-score failed for {lead.website}: {str(e)[:100]}")
+                    return None
+
+        return await asyncio.gather(*(rescore_one(lead, stale) for lead, stale in plan["partial"]))
+
+    rescored = 0
+    results = run_sync(run_partials()) if plan["partial"] else []
+    for (lead, stale), result in zip(plan["partial"], results):
+        if result is None:
+            needs_full.append(lead.id)
+            continue
+        _apply_result(lead.id, result)
+        rescored += 1
+
+    print(f"Re-score for user {user_id}: {len(plan['current'])} current, {rescored} re-scored "
+          f"without AI, {len(needs_full)} need a full re-score")
+    return {
+        "versions": current_component_versions(),
+        "current": len(plan["current"]),
+        "rescored": rescored,
+        "needs_full_rescore": needs_full,
+    }
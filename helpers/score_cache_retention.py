@@ -0,0 +1,187 @@
+"""
+Retention for the score_cache table.
+Entries older than SCORE_CACHE_MAX_AGE_DAYS are deleted, then the oldest
+entries beyond SCORE_CACHE_MAX_ROWS. Deletes run in chunks of
+SCORE_CACHE_DELETE_CHUNK rows, each in its own short transaction, so the job
+never holds long locks on the table scoring reads from. Both passes walk the
+fetched_at index.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, text
+
+from helpers.models import ScoreCache, SessionLocal, engine
+
+
+# Expired entries stay useful for conditional revalidation and partial
+# re-scores (helpers.rescore) for a while, so keep well past the 24h freshness
+SCORE_CACHE_MAX_AGE_DAYS = int(os.getenv("SCORE_CACHE_MAX_AGE_DAYS", "90"))
+# 0 means no row cap
+SCORE_CACHE_MAX_ROWS = int(os.getenv("SCORE_CACHE_MAX_ROWS", "500000"))
+SCORE_CACHE_DELETE_CHUNK = int(os.getenv("SCORE_CACHE_DELETE_CHUNK", "1000"))
+# 0 disables the periodic job (prune_score_cache() can still be run by hand)
+SCORE_CACHE_RETENTION_INTERVAL_HOURS = float(os.getenv("SCORE_CACHE_RETENTION_INTERVAL_HOURS", "6"))
+
+# hit_count buckets for the admin report: (label, lowest, highest or None)
+HIT_BUCKETS = [("0", 0, 0), ("1", 1, 1), ("2-5", 2, 5), ("6-20", 6, 20), ("21+", 21, None)]
+
+_last_prune: Optional[Dict[str, Any]] = None
+
+
+def _delete_chunk(db, query, chunk_size: int) -> int:
+    """Delete up to chunk_size rows of query (a select of ScoreCache) in one transaction."""
+    from helpers.hybrid_scorer import _invalidate_score_memo
+
+    rows = query.with_entities(ScoreCache.id, ScoreCache.url_hash).limit(chunk_size).all()
+    if not rows:
+        return 0
+    db.query(ScoreCache).filter(
+        ScoreCache.id.in_([row.id for row in rows])
+    ).delete(synchronize_session=False)
+    db.commit()
+    for row in rows:
+        _invalidate_score_memo(row.url_hash)
+    return len(rows)
+
+
+def prune_score_cache(max_age_days: int = SCORE_CACHE_MAX_AGE_DAYS,
+                      max_rows: int = SCORE_CACHE_MAX_ROWS,
+                      chunk_size: int = SCORE_CACHE_DELETE_CHUNK) -> Dict[str, Any]:
+    """
+    Delete expired entries, then the oldest entries over the row cap.
+
+    Args:
+        max_age_days: Entries fetched longer ago than this are deleted
+        max_rows: Row cap (0 for none)
+        chunk_size: Rows deleted per transaction
+
+    Returns:
+        Counts of rows deleted by age and by the row cap, and the time taken
+    """
+    global _last_prune
+    from helpers.hybrid_scorer import flush_cache_hits
+
+    started = datetime.now()
+    flush_cache_hits(force=True)
+    deleted_by_age = 0
+    deleted_over_cap = 0
+    db = SessionLocal()
+    try:
+        cutoff = started - timedelta(days=max_age_days)
+        expired = db.query(ScoreCache).filter(ScoreCache.fetched_at < cutoff)
+        while True:
+            deleted = _delete_chunk(db, expired, chunk_size)
+            deleted_by_age += deleted
+            if deleted < chunk_size:
+                break
+
+        if max_rows:
+            excess = db.query(func.count(ScoreCache.id)).scalar() - max_rows
+            oldest = db.query(ScoreCache).order_by(ScoreCache.fetched_at)
+            while excess > 0:
+                deleted = _delete_chunk(db, oldest, min(chunk_size, excess))
+                if not deleted:
+                    break
+                deleted_over_cap += deleted
+                excess -= deleted
+    except Exception as e:
+        db.rollback()
+        print(f"Score cache retention failed: {str(e)[:200]}")
+    finally:
+        db.close()
+
+    _last_prune = {
+        "at": started.isoformat(),
+        "deleted_by_age": deleted_by_age,
+        "deleted_over_cap": deleted_over_cap,
+        "duration_ms": round((datetime.now() - started).total_seconds() * 1000, 1),
+    }
+    if deleted_by_age or deleted_over_cap:
+        print(f"Score cache retention: deleted {deleted_by_age} expired and "
+              f"{deleted_over_cap} over-cap entries in {_last_prune['duration_ms']}ms")
+    return _last_prune
+
+
+async def run_retention_loop() -> None:
+    """Run prune_score_cache() every SCORE_CACHE_RETENTION_INTERVAL_HOURS (started from the app lifespan)."""
+    while True:
+        await asyncio.to_thread(prune_score_cache)
+        await asyncio.sleep(SCORE_CACHE_RETENTION_INTERVAL_HOURS * 3600)
+
+
+def _table_size() -> Optional[Dict[str, int]]:
+    """On-disk size of score_cache in bytes (Postgres only)."""
+    if engine.dialect.name != "postgresql":
+        return None
+    with engine.connect() as conn:
+        row = conn.execute(text(
+            "SELECT pg_total_relation_size('score_cache'), pg_relation_size('score_cache'), "
+            "pg_indexes_size('score_cache')"
+        )).one()
+    return {"total_bytes": row[0], "table_bytes": row[1], "index_bytes": row[2]}
+
+
+def get_score_cache_report(top_n: int = 20) -> Dict[str, Any]:
+    """
+    Size, age and hit distribution of the score_cache table.
+
+    Args:
+        top_n: How many of the most-hit entries to list
+
+    Returns:
+        Row count, on-disk size (Postgres), rows by age and by hit_count
+        bucket, the most-hit entries, the retention settings and the last prune
+    """
+    from helpers.hybrid_scorer import flush_cache_hits
+
+    flush_cache_hits(force=True)
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        age_buckets = [("<1d", 1), ("<7d", 7), ("<30d", 30), (f"<{SCORE_CACHE_MAX_AGE_DAYS}d", SCORE_CACHE_MAX_AGE_DAYS)]
+        age_counts = db.query(
+            func.count(ScoreCache.id),
+            *(func.sum(case((ScoreCache.fetched_at >= now - timedelta(days=days), 1), else_=0))
+              for _, days in age_buckets)
+        ).one()
+        hit_counts = db.query(*(
+            func.sum(case((ScoreCache.hit_count.between(low, high) if high is not None
+                           else ScoreCache.hit_count >= low, 1), else_=0))
+            for _, low, high in HIT_BUCKETS
+        )).one()
+        top: List[ScoreCache] = db.query(ScoreCache).order_by(
+            ScoreCache.hit_count.desc()
+        ).limit(top_n).all()
+
+        rows = age_counts[0]
+        return {
+            "rows": rows,
+            "size": _table_size(),
+            "by_age": {
+                **{label: int(count or 0) for (label, _), count in zip(age_buckets, age_counts[1:])},
+                "older": rows - int(age_counts[-1] or 0),
+            },
+            "by_hit_count": {label: int(count or 0) for (label, _, _), count in zip(HIT_BUCKETS, hit_counts)},
+            "top_entries": [
+                {
+                    "url": entry.normalized_url,
+                    "hit_count": entry.hit_count,
+                    "last_hit_at": entry.last_hit_at.isoformat() if entry.last_hit_at else None,
+                    "fetched_at": entry.fetched_at.isoformat(),
+                }
+                for entry in top if entry.hit_count
+            ],
+            "retention": {
+                "max_age_days": SCORE_CACHE_MAX_AGE_DAYS,
+                "max_rows": SCORE_CACHE_MAX_ROWS,
+                "delete_chunk": SCORE_CACHE_DELETE_CHUNK,
+                "interval_hours": SCORE_CACHE_RETENTION_INTERVAL_HOURS,
+            },
+            "last_prune": _last_prune,
+        }
+    finally:
+        db.close()
@@ -0,0 +1,163 @@
+"""
+Single-flight coalescing for scoring runs.
+Concurrent requests for the same key share one computation: within a process
+through tasks on the engine loop, and across worker processes through a lease
+row in scoring_leases that other workers wait on until the owner's result lands
+in the shared cache.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from helpers.engine_loop import loop_local
+from helpers.models import ScoringLease, SessionLocal
+
+
+# Longer than the slowest scoring run; an expired lease is taken over, so a
+# crashed worker holds up other processes for at most this long
+LEASE_TTL_SECONDS = 120
+
+# How often a waiting process re-checks the cache and the lease
+LEASE_POLL_INTERVAL = 1.0
+
+# Stop waiting on another process after this long and score independently
+LEASE_MAX_WAIT_SECONDS = 90
+
+_stats = {"leaders": 0, "coalesced": 0, "lease_waits": 0, "lease_reused": 0, "lease_timeouts": 0}
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+async def coalesce(key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+    """
+    Run factory() once for all concurrent callers with the same key.
+    Must be awaited on the engine loop. The shared task is cancelled only when
+    every caller waiting on it has been cancelled.
+
+    Args:
+        key: Coalescing key
+        factory: Zero-argument coroutine function doing the work
+
+    Returns:
+        (result, coalesced) - coalesced is True for callers that joined an
+        in-flight computation instead of starting one
+    """
+    inflight: Dict[str, _Flight] = loop_local("single_flight.inflight", dict)
+    flight = inflight.get(key)
+    coalesced = flight is not None
+    if flight is None:
+        flight = _Flight(asyncio.ensure_future(factory()))
+        inflight[key] = flight
+        flight.task.add_done_callback(
+            lambda _: inflight.pop(key, None) if inflight.get(key) is flight else None
+        )
+        _stats["leaders"] += 1
+    else:
+        _stats["coalesced"] += 1
+
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task), coalesced
+    except asyncio.CancelledError:
+        if flight.waiters == 1 and not flight.task.done():
+            flight.task.cancel()
+        raise
+    finally:
+        flight.waiters -= 1
+
+
+def try_acquire_lease(key: str, ttl_seconds: float = LEASE_TTL_SECONDS) -> Optional[str]:
+    """
+    Claim the lease for key, taking it over if the holder's lease has expired.
+
+    Returns:
+        Owner token to pass to release_lease(), or None if another worker holds
+        the lease. Database errors fail open (a token is returned).
+    """
+    token = uuid.uuid4().hex
+    now = datetime.now()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    session = SessionLocal()
+    try:
+        taken_over = session.query(ScoringLease).filter(
+            ScoringLease.url_hash == key,
+            ScoringLease.expires_at < now
+        ).update({ScoringLease.owner: token, ScoringLease.expires_at: expires_at}, synchronize_session=False)
+        if not taken_over:
+            session.add(ScoringLease(url_hash=key, owner=token, expires_at=expires_at))
+        session.commit()
+        return token
+    except IntegrityError:
+        session.rollback()
+        return None
+    except Exception as e:
+        session.rollback()
+        print(f"Scoring lease unavailable, continuing without it: {str(e)[:100]}")
+        return token
+    finally:
+        session.close()
+
+
+def release_lease(key: str, token: str) -> None:
+    """Drop the lease for key if token still owns it."""
+    session = SessionLocal()
+    try:
+        session.query(ScoringLease).filter(
+            ScoringLease.url_hash == key,
+            ScoringLease.owner == token
+        ).delete(synchronize_session=False)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        print(f"Failed to release scoring lease: {str(e)[:100]}")
+    finally:
+        session.close()
+
+
+async def acquire_lease_or_result(key: str, reuse: Callable[[], Optional[Any]],
+                                  max_wait: float = LEASE_MAX_WAIT_SECONDS
+                                  ) -> Tuple[Optional[str], Optional[Any]]:
+    """
+    Take the cross-process lease for key, or wait for the worker holding it.
+
+    Args:
+        key: Lease key
+        reuse: Blocking callable returning the holder's published result (e.g.
+            a fresh cache entry) or None; polled while waiting
+        max_wait: Seconds to wait before giving up and working without a lease
+
+    Returns:
+        (token, None) when this caller should do the work - token is None if it
+        gave up waiting - or (None, result) when another worker's result can be reused
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait
+    waited = False
+    while True:
+        token = await asyncio.to_thread(try_acquire_lease, key)
+        if token is not None:
+            return token, None
+        if not waited:
+            _stats["lease_waits"] += 1
+            waited = True
+        if loop.time() >= deadline:
+            _stats["lease_timeouts"] += 1
+            return None, None
+        await asyncio.sleep(LEASE_POLL_INTERVAL)
+        result = await asyncio.to_thread(reuse)
+        if result is not None:
+            _stats["lease_reused"] += 1
+            return None, result
+
+
+def get_single_flight_stats() -> Dict[str, Any]:
+    """Coalescing counters: computations started, in-process joins, cross-process waits."""
+    return dict(_stats)
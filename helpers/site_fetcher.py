@@ -2,119 +2,171 @@
 Helper functions to safely fetch website content for scoring.
 """
 
-import requests
-from typing import Dict, List, Any
+import asyncio
+import codecs
+import hashlib
+import os
+import random
+import re
+import httpx
+from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 
+from helpers.engine_loop import run_sync
+from helpers.crawl_scheduler import CRAWL_MAX_RETRY_AFTER, parse_retry_after
+from helpers.deadline import Deadline, cap_timeout
+from helpers.http_client import crawl_get_capped_async, browser_headers
+from helpers.parsed_page import ParsedPage
 
-import time
-import random
 
+# Per-site fetch budget for fetch_multiple_pages: concurrent requests to one
+# site, and the wall-clock deadline for the homepage plus all subpages
+SUBPAGE_CONCURRENCY = 4
+SITE_FETCH_TIMEOUT = 30.0
 
-def fetch_site_safely(url: str, timeout: int = 15, max_retries: int = 3) -> Dict[str, Any]:
+# Decoded bytes read per page; the rest of a bloated page (inline base64 images,
+# page-builder output) is never downloaded into memory
+FETCH_MAX_PAGE_BYTES = int(os.getenv("FETCH_MAX_PAGE_BYTES", str(1024 * 1024)))
+
+# How far into the body to look for a <meta charset> declaration
+_CHARSET_SNIFF_BYTES = 4096
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:\-]+)', re.IGNORECASE)
+
+
+def _is_ssl_error(exc: BaseException) -> bool:
+    """Detect certificate/handshake failures wrapped inside httpx connect errors."""
+    import ssl
+    seen = exc
+    while seen is not None:
+        if isinstance(seen, ssl.SSLError):
+            return True
+        seen = seen.__cause__ or seen.__context__
+    message = str(exc).lower()
+    return 'ssl' in message or 'certificate' in message
+
+
+_fetch_stats = {"garbled_responses": 0, "garbled_by_encoding": {}}
+
+
+def _record_garbled(content_encoding: Optional[str]):
+    encoding = (content_encoding or "none").lower()
+    _fetch_stats["garbled_responses"] += 1
+    _fetch_stats["garbled_by_encoding"][encoding] = _fetch_stats["garbled_by_encoding"].get(encoding, 0) + 1
+    print(f"Garbled response body (content-encoding: {encoding})")
+
+
+def get_fetch_stats() -> Dict[str, Any]:
+    """Fetch-layer counters; garbled_responses should stay at zero."""
+    return {
+        "garbled_responses": _fetch_stats["garbled_responses"],
+        "garbled_by_encoding": dict(_fetch_stats["garbled_by_encoding"]),
+    }
+
+
+def _looks_garbled(text: str) -> bool:
+    """Too many control characters in the first 500 chars means an undecoded binary body."""
+    if not text or len(text) <= 500:
+        return False
+    sample = text[:500]
+    suspicious_chars = sum(1 for c in sample if ord(c) < 32 and c not in '\n\r\t')
+    return suspicious_chars > 20
+
+
+def resolve_charset(content_type: Optional[str], body: bytes) -> str:
+    """
+    Pick the body's encoding from the Content-Type charset, else a <meta charset>
+    near the top of the document, else UTF-8 (no statistical detection).
+    """
+    candidates = []
+    if content_type:
+        match = re.search(r'charset\s*=\s*["\']?([^"\';\s]+)', content_type, re.IGNORECASE)
+        if match:
+            candidates.append(match.group(1))
+    match = _META_CHARSET.search(body[:_CHARSET_SNIFF_BYTES])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for charset in candidates:
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def _decode_body(response: httpx.Response, body: bytes) -> str:
+    return body.decode(resolve_charset(response.headers.get("content-type"), body), errors="replace")
+
+
+async def fetch_site_safely_async(url: str, timeout: int = 15, max_retries: int = 3,
+                                  max_bytes: int = FETCH_MAX_PAGE_BYTES,
+                                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     Fetch a single URL safely with error handling, retries, and enhanced bot bypass.
+    Uses the shared async client so connections are reused across leads, and the
+    crawl scheduler's per-host/per-IP limits (including any Retry-After pause).
     
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds (increased default to 15)
         max_retries: Maximum number of retry attempts
+        max_bytes: Stop reading the body after this many (decoded) bytes
+        deadline: Scoring deadline; request timeouts and retry waits are capped
+            to it and no new attempt starts once it has passed
         
     Returns:
-        Dict with status, html, final_url, and errors
+        Dict with status, html, final_url, errors, the response's etag /
+        last_modified validators (None when the server sent none), and
+        "truncated" when the page was cut off at max_bytes
     """
-    user_agents = [
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-    ]
-    
     result = {
         "status": None,
         "html": "",
         "final_url": url,
         "errors": [],
-        "retries": 0
+        "retries": 0,
+        "etag": None,
+        "last_modified": None,
+        "truncated": False
     }
     
     # Extract domain for referer header
-    from urllib.parse import urlparse
     parsed = urlparse(url)
     domain = f"{parsed.scheme}://{parsed.netloc}"
     
     for attempt in range(max_retries):
-        headers = {
-            'User-Agent': random.choice(user_agents),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'cross-site',
-            'Sec-Fetch-User': '?1',
-            'Sec-Ch-Ua': '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': '"Windows"',
-            'Cache-Control': 'no-cache',
-            'Referer': 'https://www.google.com/',
-            'Origin': domain,
-        }
+        if deadline is not None and deadline.expired():
+            result["errors"].append("Scoring deadline exceeded")
+            return result
+        headers = browser_headers(domain)
+        request_timeout = cap_timeout(deadline, timeout)
         
         try:
-            response = requests.get(
-                url,
-                timeout=timeout,
-                headers=headers,
-                allow_redirects=True,
-                verify=True
+            response, body, truncated = await crawl_get_capped_async(
+                url, max_bytes, timeout=request_timeout, headers=headers
             )
             
             result["status"] = response.status_code
-            result["final_url"] = response.url
+            result["final_url"] = str(response.url)
             result["retries"] = attempt
+            result["etag"] = response.headers.get("etag")
+            result["last_modified"] = response.headers.get("last-modified")
             
             if response.status_code in [200, 202]:
-                # Check for garbled/binary response (brotli decoding issues)
-                if response.text and len(response.text) > 500:
-                    # Count suspicious control characters in first 500 chars
-                    sample = response.text[:500]
-                    suspicious_chars = sum(1 for c in sample if ord(c) < 32 and c not in '\n\r\t')
-                    
-                    if suspicious_chars > 20:  # Too many control characters, likely binary
-                        result["errors"].append(f"Garbled response detected (attempt {attempt + 1}), retrying without compression")
-                        # Retry with no compression
-                        try:
-                            clean_headers = headers.copy()
-                            clean_headers.pop('Accept-Encoding', None)
-                            
-                            clean_response = requests.get(
-                                url,
-                                timeout=timeout,
-                                headers=clean_headers,
-                                allow_redirects=True,
-                                verify=True
-                            )
-                            
-                            if clean_response.status_code == 200 and clean_response.text:
-                                result["html"] = clean_response.text
-                                result["status"] = clean_response.status_code
-                                result["final_url"] = clean_response.url
-                                result["errors"] = [f"Fixed garbled response on retry (attempt {attempt + 1})"]
-                                return result
-                        except Exception as clean_e:
-                            result["errors"].append(f"Clean retry failed: {str(clean_e)}")
-                            
-                        # If clean retry failed, continue with next attempt
-                        if attempt < max_retries - 1:
-                            time.sleep(1.5)
-                            continue
+                html = _decode_body(response, body)
+                result["truncated"] = truncated
+                
+                # Every advertised coding is decoded, so a binary body means the
+                # server ignored Accept-Encoding - count it rather than re-download
+                if _looks_garbled(html):
+                    _record_garbled(response.headers.get("content-encoding"))
+                    result["errors"].append(
+                        f"Undecodable response body (content-encoding: {response.headers.get('content-encoding') or 'none'})"
+                    )
+                    return result
                 
                 # 202 may have content (some APIs return this for async processing but with content)  
-                if response.text and len(response.text) > 500:
-                    result["html"] = response.text
+                if html and len(html) > 500:
+                    result["html"] = html
                     result["errors"] = []
                     return result
                 elif response.status_code == 202:
@@ -122,13 +174,19 @@ def fetch_site_safely(url: str, timeout: int = 15, max_retries: int = 3) -> Dict
                     result["errors"].append(f"HTTP 202 (needs browser rendering)")
                     return result
                 else:
-                    result["html"] = response.text
+                    result["html"] = html
                     result["errors"] = []
                     return result
             elif response.status_code in [429, 503]:
                 result["errors"].append(f"HTTP {response.status_code} (rate limited/unavailable)")
+                retry_after = parse_retry_after(response.headers.get("retry-after"))
+                if retry_after is not None and retry_after > CRAWL_MAX_RETRY_AFTER:
+                    result["errors"].append(f"Retry-After {int(retry_after)}s exceeds fetch budget")
+                    return result
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt + random.uniform(0.5, 1.5))
+                    # With Retry-After, the crawl scheduler holds the next request for us
+                    if retry_after is None:
+                        await asyncio.sleep(cap_timeout(deadline, 2 ** attempt + random.uniform(0.5, 1.5)))
                     continue
             elif response.status_code in [403, 401]:
                 result["errors"].append(f"HTTP {response.status_code} (blocked)")
@@ -137,32 +195,35 @@ def fetch_site_safely(url: str, timeout: int = 15, max_retries: int = 3) -> Dict
                 result["errors"].append(f"HTTP {response.status_code}")
                 return result
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             result["errors"].append(f"Request timeout (attempt {attempt + 1})")
             if attempt < max_retries - 1:
-                time.sleep(1 + attempt)
+                await asyncio.sleep(cap_timeout(deadline, 1 + attempt))
                 continue
-        except requests.exceptions.SSLError as e:
-            try:
-                response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True, verify=False)
-                if response.status_code == 200:
-                    result["html"] = response.text
-                    result["status"] = response.status_code
-                    result["final_url"] = response.url
-                    result["errors"] = ["SSL warning (insecure connection)"]
-                    return result
-            except:
-                pass
-            result["errors"].append("SSL certificate error")
+        except httpx.TooManyRedirects:
+            result["errors"].append("Too many redirects")
             return result
-        except requests.exceptions.ConnectionError:
+        except httpx.TransportError as e:
+            if _is_ssl_error(e):
+                try:
+                    response, body, truncated = await crawl_get_capped_async(
+                        url, max_bytes, verify=False, timeout=request_timeout, headers=headers
+                    )
+                    if response.status_code == 200:
+                        result["html"] = _decode_body(response, body)
+                        result["truncated"] = truncated
+                        result["status"] = response.status_code
+                        result["final_url"] = str(response.url)
+                        result["errors"] = ["SSL warning (insecure connection)"]
+                        return result
+                except Exception:
+                    pass
+                result["errors"].append("SSL certificate error")
+                return result
             result["errors"].append(f"Connection failed (attempt {attempt + 1})")
             if attempt < max_retries - 1:
-                time.sleep(1 + attempt)
+                await asyncio.sleep(cap_timeout(deadline, 1 + attempt))
                 continue
-        except requests.exceptions.TooManyRedirects:
-            result["errors"].append("Too many redirects")
-            return result
         except Exception as e:
             result["errors"].append(f"Fetch error: {str(e)[:100]}")
             return result
@@ -172,57 +233,41 @@ def fetch_site_safely(url: str, timeout: int = 15, max_retries: int = 3) -> Dict
     return result
 
 
-def fetch_multiple_pages(base_url: str, max_pages: int = 4) -> Dict[str, Any]:
-    """
-    Fetch homepage and intelligently discovered subpages for comprehensive scoring.
-    
-    Args:
-        base_url: Website base URL
-        max_pages: Maximum number of pages to fetch (default 4)
-        
-    Returns:
-        Dict with pages data and combined HTML
-    """
-    from bs4 import BeautifulSoup
-    
-    fetched_pages = {}
-    combined_html = ""
-    all_errors = []
-    priority_links_found = []
-    
-    homepage_result = fetch_site_safely(base_url)
-    fetched_pages["homepage"] = homepage_result
-    
-    if homepage_result["html"]:
-        combined_html += f"\n\n<!-- Page: homepage -->\n{homepage_result['html']}"
-        
-        soup = BeautifulSoup(homepage_result["html"], 'html.parser')
-        priority_links_found = _extract_priority_links_from_soup(soup, homepage_result.get("final_url", base_url))
-    
-    if homepage_result["errors"]:
-        all_errors.extend([f"homepage: {err}" for err in homepage_result["errors"]])
-    
-    fallback_pages = [
+def fetch_site_safely(url: str, timeout: int = 15, max_retries: int = 3) -> Dict[str, Any]:
+    """Blocking wrapper around fetch_site_safely_async() for sync callers."""
+    return run_sync(fetch_site_safely_async(url, timeout=timeout, max_retries=max_retries))
+
+
+def _link_priority(link: str) -> int:
+    """Sort key for priority links: contact pages first, then quote/booking, then others."""
+    link_lower = link.lower()
+    if 'contact' in link_lower or 'get-in-touch' in link_lower or 'reach-us' in link_lower:
+        return 0  # Highest priority
+    elif 'quote' in link_lower or 'enquir' in link_lower or 'book' in link_lower:
+        return 1
+    elif 'pricing' in link_lower or 'schedule' in link_lower:
+        return 2
+    elif 'about' in link_lower or 'services' in link_lower:
+        return 3
+    return 4
+
+
+def _fallback_pages(base_url: str) -> List[Tuple[str, str]]:
+    """Common contact/about paths tried when the homepage links don't fill the page budget."""
+    return [
         ("contact", urljoin(base_url, "/contact")),
         ("contact-us", urljoin(base_url, "/contact-us")),
         ("get-in-touch", urljoin(base_url, "/get-in-touch")),
         ("about", urljoin(base_url, "/about")),
     ]
+
+
+def _plan_subpages(base_url: str, homepage_result: Dict[str, Any], priority_links_found: List[str],
+                   max_pages: int) -> List[Tuple[str, str]]:
+    """Choose which subpages to fetch after the homepage, as (page_name, url) pairs."""
+    fallback_pages = _fallback_pages(base_url)
     
-    # Sort priority links: contact pages first, then quote/booking, then others
-    def link_priority(link):
-        link_lower = link.lower()
-        if 'contact' in link_lower or 'get-in-touch' in link_lower or 'reach-us' in link_lower:
-            return 0  # Highest priority
-        elif 'quote' in link_lower or 'enquir' in link_lower or 'book' in link_lower:
-            return 1
-        elif 'pricing' in link_lower or 'schedule' in link_lower:
-            return 2
-        elif 'about' in link_lower or 'services' in link_lower:
-            return 3
-        return 4
-    
-    sorted_priority_links = sorted(priority_links_found, key=link_priority)
+    sorted_priority_links = sorted(priority_links_found, key=_link_priority)
     
     pages_to_fetch = []
     for link in sorted_priority_links[:3]:
@@ -245,43 +290,249 @@ def fetch_multiple_pages(base_url: str, max_pages: int = 4) -> Dict[str, Any]:
             if url.rstrip('/') not in fetched_urls and len(pages_to_fetch) < max_pages - 1:
                 pages_to_fetch.append((name, url))
     
-    for page_name, url in pages_to_fetch[:max_pages - 1]:
-        if url.rstrip('/') in fetched_urls:
-            continue
+    return pages_to_fetch[:max_pages - 1]
+
+
+async def _bounded_fetch(url: str, semaphore: asyncio.Semaphore,
+                         deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    async with semaphore:
+        return await fetch_site_safely_async(url, deadline=deadline)
+
+
+def _deadline_result(url: str) -> Dict[str, Any]:
+    return {
+        "status": None,
+        "html": "",
+        "final_url": url,
+        "errors": ["Site fetch deadline exceeded"],
+        "retries": 0
+    }
+
+
+async def fetch_multiple_pages_async(base_url: str, max_pages: int = 4,
+                                     site_timeout: float = SITE_FETCH_TIMEOUT,
+                                     deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    Fetch homepage and intelligently discovered subpages for comprehensive scoring.
+    
+    The guessed fallback pages are requested speculatively alongside the
+    homepage; once the homepage links are known the remaining subpages are
+    fetched concurrently (at most SUBPAGE_CONCURRENCY requests to the site at
+    once). Everything shares one site_timeout deadline, and pages still in
+    flight when it passes are dropped.
+    
+    Args:
+        base_url: Website base URL
+        max_pages: Maximum number of pages to fetch (default 4)
+        site_timeout: Seconds allowed for the whole site, homepage included
+        deadline: Scoring deadline; site_timeout is capped to its remaining budget
         
-        result = fetch_site_safely(url)
+    Returns:
+        Dict with pages data and combined HTML. The parsed homepage is returned
+        under "homepage_page" so callers can reuse it; "truncated_pages" names
+        the pages cut off at FETCH_MAX_PAGE_BYTES.
+    """
+    loop = asyncio.get_running_loop()
+    site_deadline = loop.time() + cap_timeout(deadline, site_timeout)
+    semaphore = asyncio.Semaphore(SUBPAGE_CONCURRENCY)
+    
+    fetched_pages = {}
+    combined_parts = []
+    truncated_pages = []
+    all_errors = []
+    priority_links_found = []
+    homepage_page = None
+    
+    homepage_task = asyncio.ensure_future(_bounded_fetch(base_url, semaphore, deadline))
+    speculative = {}
+    if max_pages > 1:
+        for _, url in _fallback_pages(base_url):
+            if url.rstrip('/') != base_url.rstrip('/'):
+                speculative[url] = asyncio.ensure_future(_bounded_fetch(url, semaphore, deadline))
+    
+    try:
+        try:
+            homepage_result = await asyncio.wait_for(
+                asyncio.shield(homepage_task), timeout=max(0.0, site_deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            homepage_task.cancel()
+            homepage_result = _deadline_result(base_url)
+        fetched_pages["homepage"] = homepage_result
         
-        if result["status"] == 404:
-            continue
+        if homepage_result["html"]:
+            combined_parts.append(f"\n\n<!-- Page: homepage -->\n{homepage_result['html']}")
+            if homepage_result.get("truncated"):
+                truncated_pages.append("homepage")
+            
+            homepage_final_url = homepage_result.get("final_url", base_url)
+            homepage_page = await asyncio.to_thread(ParsedPage, homepage_result["html"], homepage_final_url)
+            priority_links_found = await asyncio.to_thread(_extract_priority_links, homepage_page, homepage_final_url)
         
-        fetched_pages[page_name] = result
-        fetched_urls.add(url.rstrip('/'))
+        if homepage_result["errors"]:
+            all_errors.extend([f"homepage: {err}" for err in homepage_result["errors"]])
         
-        if result["html"]:
-            combined_html += f"\n\n<!-- Page: {page_name} -->\n{result['html']}"
+        pages_to_fetch = _plan_subpages(base_url, homepage_result, priority_links_found, max_pages)
+        fetched_urls = {base_url.rstrip('/'), homepage_result.get("final_url", base_url).rstrip('/')}
         
-        if result["errors"]:
-            all_errors.extend([f"{page_name}: {err}" for err in result["errors"]])
+        # One task per distinct planned URL, reusing speculative fetches where possible
+        planned = []
+        tasks = {}
+        for page_name, url in pages_to_fetch:
+            key = url.rstrip('/')
+            if key in fetched_urls:
+                continue
+            if key not in tasks:
+                tasks[key] = speculative.pop(url, None) or asyncio.ensure_future(_bounded_fetch(url, semaphore, deadline))
+            planned.append((page_name, url, tasks[key]))
+        
+        if tasks:
+            _, pending = await asyncio.wait(tasks.values(), timeout=max(0.0, site_deadline - loop.time()))
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        # Assemble in plan order so combined_html is independent of completion order
+        for page_name, url, task in planned:
+            if url.rstrip('/') in fetched_urls:
+                continue
+            if task.cancelled():
+                all_errors.append(f"{page_name}: Site fetch deadline exceeded")
+                continue
+            if task.exception() is not None:
+                all_errors.append(f"{page_name}: {str(task.exception())[:200]}")
+                continue
+            result = task.result()
+            
+            if result["status"] == 404:
+                continue
+            
+            fetched_pages[page_name] = result
+            fetched_urls.add(url.rstrip('/'))
+            
+            if result["html"]:
+                combined_parts.append(f"\n\n<!-- Page: {page_name} -->\n{result['html']}")
+                if result.get("truncated"):
+                    truncated_pages.append(page_name)
+            
+            if result["errors"]:
+                all_errors.extend([f"{page_name}: {err}" for err in result["errors"]])
+    finally:
+        # Speculative fetches the plan did not need (or everything, on cancellation)
+        for task in [homepage_task, *speculative.values()]:
+            task.cancel()
     
     return {
         "pages": fetched_pages,
-        "combined_html": combined_html or homepage_result.get("html", ""),
+        "combined_html": "".join(combined_parts) or homepage_result.get("html", ""),
+        "truncated_pages": truncated_pages,
         "final_url": homepage_result.get("final_url", base_url),
         "status": homepage_result.get("status"),
         "errors": all_errors,
-        "priority_links_discovered": priority_links_found[:5]
+        "priority_links_discovered": priority_links_found[:5],
+        "homepage_page": homepage_page
     }
 
 
-def _extract_priority_links_from_soup(soup, base_url: str) -> List[str]:
-    """Extract priority internal links from parsed HTML soup."""
+def fetch_multiple_pages(base_url: str, max_pages: int = 4,
+                         site_timeout: float = SITE_FETCH_TIMEOUT) -> Dict[str, Any]:
+    """Blocking wrapper around fetch_multiple_pages_async() for sync callers."""
+    return run_sync(fetch_multiple_pages_async(base_url, max_pages=max_pages, site_timeout=site_timeout))
+
+
+# Markup that changes on every request without the page itself changing,
+# as (pattern, replacement) pairs
+_VOLATILE_PATTERNS = [
+    (re.compile(r'<!--.*?-->', re.DOTALL), ''),
+    (re.compile(r'\snonce=(["\']).*?\1', re.IGNORECASE), ''),
+    (re.compile(r'(<input[^>]*name=["\'][^"\']*(?:csrf|token|nonce)[^"\']*["\'][^>]*?)\svalue=(["\']).*?\2',
+                re.IGNORECASE), r'\1'),
+    (re.compile(r'([?&](?:_|t|ts|cb)=)[\w.-]+', re.IGNORECASE), r'\1'),
+]
+_WHITESPACE = re.compile(r'\s+')
+
+
+def content_fingerprint(html: str) -> str:
+    """
+    Hash of the page HTML with comments, CSP nonces, CSRF token values and
+    timestamp cache-buster query values removed and whitespace collapsed, so two
+    fetches of an unchanged page get the same fingerprint.
+    """
+    normalized = html or ""
+    for pattern, replacement in _VOLATILE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    normalized = _WHITESPACE.sub(' ', normalized).strip()
+    return hashlib.sha256(normalized.encode('utf-8', 'ignore')).hexdigest()
+
+
+def build_page_validators(fetch_result: Dict[str, Any]) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Revalidation data for every page fetch_multiple_pages() returned HTML for.
+
+    Returns:
+        Dict mapping page URL to its etag, last_modified and content_hash
+    """
+    validators = {}
+    for page_result in fetch_result.get("pages", {}).values():
+        if page_result.get("status") != 200 or not page_result.get("html"):
+            continue
+        validators[page_result.get("final_url")] = {
+            "etag": page_result.get("etag"),
+            "last_modified": page_result.get("last_modified"),
+            "content_hash": content_fingerprint(page_result["html"]),
+        }
+    return validators
+
+
+async def _page_unchanged_async(url: str, validator: Dict[str, Optional[str]], timeout: int = 10) -> bool:
+    """Conditional GET for one page; True on 304 or an identical content fingerprint."""
+    parsed = urlparse(url)
+    headers = browser_headers(f"{parsed.scheme}://{parsed.netloc}")
+    if validator.get("etag"):
+        headers['If-None-Match'] = validator["etag"]
+    if validator.get("last_modified"):
+        headers['If-Modified-Since'] = validator["last_modified"]
+    try:
+        response, body, _ = await crawl_get_capped_async(
+            url, FETCH_MAX_PAGE_BYTES, timeout=timeout, headers=headers
+        )
+    except Exception:
+        return False
+    if response.status_code == 304:
+        return True
+    if response.status_code != 200:
+        return False
+    return content_fingerprint(_decode_body(response, body)) == validator.get("content_hash")
+
+
+async def revalidate_pages_async(validators: Dict[str, Dict[str, Optional[str]]]) -> bool:
+    """
+    Check whether every previously fetched page is unchanged, concurrently.
+
+    Args:
+        validators: Output of build_page_validators() stored with the cached score
+
+    Returns:
+        True only if all pages answered 304 or returned identical content
+    """
+    if not validators:
+        return False
+    results = await asyncio.gather(
+        *(_page_unchanged_async(url, validator) for url, validator in validators.items())
+    )
+    return all(results)
+
+
+def _extract_priority_links(page: ParsedPage, base_url: str) -> List[str]:
+    """Extract priority internal links from a parsed page."""
     priority_keywords = ['contact', 'quote', 'book', 'enquir', 'pricing', 'get-in-touch', 
                          'reach-us', 'schedule', 'about', 'services']
     
     priority_links = []
     base_domain = urlparse(base_url).netloc.replace('www.', '')
     
-    for link in soup.find_all('a', href=True):
+    for link in page.links:
         href = link.get('href', '')
         text = link.get_text(strip=True).lower()
         
@@ -302,7 +553,7 @@ def _extract_priority_links_from_soup(soup, base_url: str) -> List[str]:
     return priority_links[:8]
 
 
-def extract_site_content_for_ai(html: str, max_chars: int = 6000) -> Dict[str, Any]:
+def extract_site_content_for_ai(html: str, max_chars: int = 6000, page: Optional[ParsedPage] = None) -> Dict[str, Any]:
     """
     Extract key elements from HTML for AI analysis.
     Reduces token usage by sending only relevant excerpts.
@@ -310,58 +561,58 @@ def extract_site_content_for_ai(html: str, max_chars: int = 6000) -> Dict[str, A
     Args:
         html: Raw HTML content
         max_chars: Maximum characters to extract
+        page: Already-parsed document for html (parsed here if omitted)
         
     Returns:
         Dict with extracted elements for AI prompt
     """
-    from bs4 import BeautifulSoup
     import re
     
-    soup = BeautifulSoup(html, 'html.parser')
+    page = page or ParsedPage(html)
     
-    # Remove script and style tags
-    for tag in soup(['script', 'style', 'noscript']):
-        tag.decompose()
+    def visible_text(elem):
+        return page.visible_text_of(elem, strip=True)
     
+    # Script, style and noscript contents are ignored throughout
     # Extract key elements
-    title = soup.find('title')
-    title_text = title.get_text(strip=True) if title else ""
+    title = page.find_visible('title')
+    title_text = visible_text(title) if title else ""
     
-    h1_tags = soup.find_all('h1', limit=3)
-    h1_texts = [h1.get_text(strip=True) for h1 in h1_tags if h1.get_text(strip=True)]
+    h1_tags = page.find_all_visible('h1', limit=3)
+    h1_texts = [visible_text(h1) for h1 in h1_tags if visible_text(h1)]
     
-    h2_tags = soup.find_all('h2', limit=5)
-    h2_texts = [h2.get_text(strip=True) for h2 in h2_tags if h2.get_text(strip=True)]
+    h2_tags = page.find_all_visible('h2', limit=5)
+    h2_texts = [visible_text(h2) for h2 in h2_tags if visible_text(h2)]
     
     # CTA buttons
-    buttons = soup.find_all('button', limit=10)
-    cta_links = soup.find_all('a', class_=re.compile(r'btn|button|cta', re.I), limit=10)
+    buttons = page.find_all_visible('button', limit=10)
+    cta_links = page.find_all_visible('a', class_=re.compile(r'btn|button|cta', re.I), limit=10)
     cta_texts = []
     for elem in buttons + cta_links:
-        text = elem.get_text(strip=True)
+        text = visible_text(elem)
         if text and len(text) < 50:
             cta_texts.append(text)
     
     # Navigation links
-    nav = soup.find('nav') or soup.find('header')
+    nav = page.find_visible('nav') or page.find_visible('header')
     nav_links = []
     if nav and hasattr(nav, 'find_all'):
-        for link in nav.find_all('a', limit=15):
-            text = link.get_text(strip=True)
+        for link in page.find_all_visible('a', limit=15, within=nav):
+            text = visible_text(link)
             if text:
                 nav_links.append(text)
     
     # Images with alt text
-    images = soup.find_all('img', limit=10)
+    images = page.find_all_visible('img', limit=10)
     image_alts = [img.get('alt', '') for img in images if img.get('alt')]
     
     # Main text content (truncated)
-    text_content = soup.get_text(separator=' ', strip=True)
+    text_content = page.visible_text
     text_excerpt = text_content[:max_chars]
     
     # Links list
-    all_links = soup.find_all('a', limit=30)
-    link_texts = [a.get_text(strip=True) for a in all_links if a.get_text(strip=True)]
+    all_links = page.find_all_visible('a', limit=30)
+    link_texts = [visible_text(a) for a in all_links if visible_text(a)]
     
     return {
         "title": title_text,
@@ -5,8 +5,120 @@ Returns objective scores (0-50 points) based on verifiable technical checks.
 
 import re
 import json
-from bs4 import BeautifulSoup
-from typing import Dict, List, Any, Tuple
+from bs4 import BeautifulSoup, Tag
+from typing import Dict, List, Any, Tuple, Optional
+from urllib.parse import urljoin, urlparse
+
+from helpers.parsed_page import ParsedPage
+
+
+# Bump whenever a change here alters scores or evidence, so stored heuristic
+# results are re-run (see helpers.component_versions and helpers.rescore)
+HEURISTICS_VERSION = "1"
+
+# Text rules: matched against every text node, as soup.find_all(string=pattern)
+# would; a rule only records whether any node matched
+TEXT_RULES = {
+    "phone": re.compile(r'\+?\d{1,4}[\s\-]?\(?\d{1,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}'),
+    "privacy_text": re.compile(r'privacy policy|cookie policy', re.I),
+    "address": re.compile(r'address|location', re.I),
+    "social_proof": re.compile(r'testimonial|review|client|case study|award|certified', re.I),
+}
+
+# Element rules: (tag names, attribute, pattern); elements whose attribute matches
+# are collected in document order, as soup.find_all(names, attrs={attribute: pattern})
+ELEMENT_RULES = {
+    "privacy_links": (('a',), 'href', re.compile(r'privacy|cookie|gdpr', re.I)),
+    "tel_links": (('a',), 'href', re.compile(r'^tel:')),
+    "mailto_links": (('a',), 'href', re.compile(r'^mailto:')),
+    "map_embeds": (('iframe', 'div'), 'class', re.compile(r'map', re.I)),
+}
+
+# Element groups collected by tag name in the same traversal, in document order
+COLLECTED_TAGS = {
+    "title": ('title',),
+    "h1": ('h1',),
+    "button": ('button',),
+    "a": ('a',),
+    "form": ('form',),
+    "img": ('img',),
+    "script": ('script',),
+    "cta_candidates": ('button', 'a'),
+}
+
+_GROUPS_BY_TAG: Dict[str, List[str]] = {}
+for _group, _names in COLLECTED_TAGS.items():
+    for _name in _names:
+        _GROUPS_BY_TAG.setdefault(_name, []).append(_group)
+
+_ELEMENT_RULES_BY_TAG: Dict[str, List[Tuple[str, str, Any]]] = {}
+for _rule, (_names, _attribute, _pattern) in ELEMENT_RULES.items():
+    for _name in _names:
+        _ELEMENT_RULES_BY_TAG.setdefault(_name, []).append((_rule, _attribute, _pattern))
+
+EMAIL_REGEX = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+WORD_REGEX = re.compile(r'\b\w+\b')
+
+# (literal every match contains, pattern); the literal check skips patterns that cannot match
+OBFUSCATED_EMAIL_PATTERNS = [
+    ('[', re.compile(r'([a-zA-Z0-9._%+-]+)\s*\[\s*at\s*\]\s*([a-zA-Z0-9.-]+)\s*\[\s*dot\s*\]\s*([a-zA-Z]{2,})', re.I)),
+    ('(', re.compile(r'([a-zA-Z0-9._%+-]+)\s*\(\s*at\s*\)\s*([a-zA-Z0-9.-]+)\s*\(\s*dot\s*\)\s*([a-zA-Z]{2,})', re.I)),
+    ('@', re.compile(r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})', re.I)),
+    ('&#64;', re.compile(r'([a-zA-Z0-9._%+-]+)\s*&#64;\s*([a-zA-Z0-9.-]+)\.([a-zA-Z]{2,})', re.I)),
+]
+
+FORM_KEYWORDS = [
+    ('contact_form', ['contact', 'enquir', 'inquiry', 'message', 'get in touch']),
+    ('quote_form', ['quote', 'estimate', 'pricing']),
+    ('booking_form', ['book', 'appointment', 'schedule', 'reservation']),
+    ('newsletter_form', ['subscribe', 'newsletter', 'signup', 'sign up']),
+]
+
+CTA_KEYWORDS = [
+    'contact', 'call', 'get quote', 'free quote', 'request', 'enquire', 'inquire',
+    'book now', 'schedule', 'get started', 'learn more', 'find out', 'speak to',
+    'talk to', 'reach out', 'connect', 'start now', 'try free', 'demo', 'consultation'
+]
+CTA_CLASSES = ['cta', 'btn-primary', 'btn-cta', 'action-btn', 'contact-btn']
+CTA_HREF_KEYWORDS = ['contact', 'quote', 'book', 'schedule', 'enquir']
+
+PRIORITY_LINK_KEYWORDS = ['contact', 'about', 'services', 'quote', 'book', 'enquir', 'pricing',
+                          'get-in-touch', 'reach-us', 'support', 'help']
+
+
+def _attribute_matches(value: Any, pattern) -> bool:
+    """BeautifulSoup attribute matching: multi-valued attributes match per value or joined."""
+    if value is None:
+        return False
+    if isinstance(value, (list, tuple)):
+        return any(pattern.search(item) for item in value) or bool(pattern.search(' '.join(value)))
+    return bool(pattern.search(value))
+
+
+class DocumentScan:
+    """
+    Everything score_site_heuristics() reads from the tree, gathered in a
+    single traversal: COLLECTED_TAGS groups, ELEMENT_RULES matches and which
+    TEXT_RULES any text node satisfies.
+    """
+
+    def __init__(self, soup: BeautifulSoup):
+        self.tags: Dict[str, List[Tag]] = {name: [] for name in COLLECTED_TAGS}
+        self.elements: Dict[str, List[Tag]] = {rule: [] for rule in ELEMENT_RULES}
+        self.text_matches = set()
+        pending = dict(TEXT_RULES)
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                for group in _GROUPS_BY_TAG.get(node.name, ()):
+                    self.tags[group].append(node)
+                for rule, attribute, pattern in _ELEMENT_RULES_BY_TAG.get(node.name, ()):
+                    if _attribute_matches(node.get(attribute), pattern):
+                        self.elements[rule].append(node)
+            elif pending:
+                matched = [rule for rule, pattern in pending.items() if pattern.search(node)]
+                for rule in matched:
+                    self.text_matches.add(rule)
+                    del pending[rule]
 
 
 def decode_obfuscated_email(text: str) -> List[str]:
@@ -14,14 +126,10 @@ def decode_obfuscated_email(text: str) -> List[str]:
     Detect and decode common email obfuscation patterns.
     """
     emails = []
-    patterns = [
-        (r'([a-zA-Z0-9._%+-]+)\s*\[\s*at\s*\]\s*([a-zA-Z0-9.-]+)\s*\[\s*dot\s*\]\s*([a-zA-Z]{2,})', r'\1@\2.\3'),
-        (r'([a-zA-Z0-9._%+-]+)\s*\(\s*at\s*\)\s*([a-zA-Z0-9.-]+)\s*\(\s*dot\s*\)\s*([a-zA-Z]{2,})', r'\1@\2.\3'),
-        (r'([a-zA-Z0-9._%+-]+)\s*@\s*([a-zA-Z0-9.-]+)\s*\.\s*([a-zA-Z]{2,})', r'\1@\2.\3'),
-        (r'([a-zA-Z0-9._%+-]+)\s*&#64;\s*([a-zA-Z0-9.-]+)\.([a-zA-Z]{2,})', r'\1@\2.\3'),
-    ]
-    for pattern, replacement in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for literal, pattern in OBFUSCATED_EMAIL_PATTERNS:
+        if literal not in text:
+            continue
+        matches = pattern.findall(text)
         for match in matches:
             if isinstance(match, tuple):
                 email = f"{match[0]}@{match[1]}.{match[2]}"
@@ -33,9 +141,13 @@ def extract_schema_org_contact(soup: BeautifulSoup) -> Dict[str, Any]:
     """
     Extract contact information from schema.org structured data.
     """
+    return _schema_org_contact(soup.find_all('script', type='application/ld+json'))
+
+
+def _schema_org_contact(ld_json_scripts: List[Tag]) -> Dict[str, Any]:
     contact_info = {"emails": [], "phones": [], "addresses": []}
     
-    for script in soup.find_all('script', type='application/ld+json'):
+    for script in ld_json_scripts:
         try:
             data = json.loads(script.string or '{}')
             if isinstance(data, list):
@@ -85,21 +197,20 @@ def detect_contact_forms(soup: BeautifulSoup) -> Tuple[bool, List[str]]:
     Detect contact forms and their types.
     Returns (has_form, form_types).
     """
+    return _classify_forms(soup.find_all('form'))
+
+
+def _classify_forms(forms: List[Tag]) -> Tuple[bool, List[str]]:
     form_types = []
     
-    forms = soup.find_all('form')
     for form in forms:
         form_html = str(form).lower()
         form_text = form.get_text(separator=' ', strip=True).lower()
         
-        if any(kw in form_html or kw in form_text for kw in ['contact', 'enquir', 'inquiry', 'message', 'get in touch']):
-            form_types.append('contact_form')
-        elif any(kw in form_html or kw in form_text for kw in ['quote', 'estimate', 'pricing']):
-            form_types.append('quote_form')
-        elif any(kw in form_html or kw in form_text for kw in ['book', 'appointment', 'schedule', 'reservation']):
-            form_types.append('booking_form')
-        elif any(kw in form_html or kw in form_text for kw in ['subscribe', 'newsletter', 'signup', 'sign up']):
-            form_types.append('newsletter_form')
+        for form_type, keywords in FORM_KEYWORDS:
+            if any(kw in form_html or kw in form_text for kw in keywords):
+                form_types.append(form_type)
+                break
         
         email_inputs = form.find_all('input', attrs={'type': 'email'})
         text_areas = form.find_all('textarea')
@@ -115,25 +226,23 @@ def detect_cta_elements(soup: BeautifulSoup) -> Tuple[int, List[str]]:
     Detect call-to-action elements with semantic analysis.
     Returns (cta_count, cta_texts).
     """
-    cta_keywords = [
-        'contact', 'call', 'get quote', 'free quote', 'request', 'enquire', 'inquire',
-        'book now', 'schedule', 'get started', 'learn more', 'find out', 'speak to',
-        'talk to', 'reach out', 'connect', 'start now', 'try free', 'demo', 'consultation'
-    ]
-    
+    return _cta_elements(soup.find_all(['button', 'a']))
+
+
+def _cta_elements(candidates: List[Tag]) -> Tuple[int, List[str]]:
     cta_texts = []
     
-    for button in soup.find_all(['button', 'a']):
+    for button in candidates:
         text = button.get_text(strip=True).lower()
         classes = ' '.join(button.get('class', [])).lower()
         href = (button.get('href') or '').lower()
         
         is_cta = False
-        if any(kw in text for kw in cta_keywords):
+        if any(kw in text for kw in CTA_KEYWORDS):
             is_cta = True
-        elif any(cls in classes for cls in ['cta', 'btn-primary', 'btn-cta', 'action-btn', 'contact-btn']):
+        elif any(cls in classes for cls in CTA_CLASSES):
             is_cta = True
-        elif any(kw in href for kw in ['contact', 'quote', 'book', 'schedule', 'enquir']):
+        elif any(kw in href for kw in CTA_HREF_KEYWORDS):
             is_cta = True
         
         if is_cta and text and len(text) < 50:
@@ -146,15 +255,14 @@ def extract_priority_links(soup: BeautifulSoup, base_url: str) -> List[str]:
     """
     Extract priority internal links that likely contain contact/service info.
     """
-    from urllib.parse import urljoin, urlparse
-    
-    priority_keywords = ['contact', 'about', 'services', 'quote', 'book', 'enquir', 'pricing', 
-                         'get-in-touch', 'reach-us', 'support', 'help']
-    
+    return _priority_links(soup.find_all('a', href=True), base_url)
+
+
+def _priority_links(links: List[Tag], base_url: str) -> List[str]:
     priority_links = []
     base_domain = urlparse(base_url).netloc.replace('www.', '')
     
-    for link in soup.find_all('a', href=True):
+    for link in links:
         href = link.get('href', '')
         text = link.get_text(strip=True).lower()
         
@@ -168,20 +276,23 @@ def extract_priority_links(soup: BeautifulSoup, base_url: str) -> List[str]:
             continue
         
         href_lower = href.lower()
-        if any(kw in href_lower or kw in text for kw in priority_keywords):
+        if any(kw in href_lower or kw in text for kw in PRIORITY_LINK_KEYWORDS):
             if full_url not in priority_links:
                 priority_links.append(full_url)
     
     return priority_links[:5]
 
 
-def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
+def score_site_heuristics(html: str, final_url: str = "", page: Optional[ParsedPage] = None) -> Dict[str, Any]:
     """
     Analyze HTML and return deterministic scores across 6 categories.
+    The tree is walked once (DocumentScan, driven by TEXT_RULES and
+    ELEMENT_RULES) and the page text is read once for emails and word count.
     
     Args:
         html: Raw HTML content
         final_url: Final URL after redirects
+        page: Already-parsed document for html (parsed here if omitted)
         
     Returns:
         Dict with scores, evidence, and total (0-50)
@@ -203,7 +314,8 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
             "rendering_limitations": True
         }
     
-    soup = BeautifulSoup(html, 'html.parser')
+    page = page or ParsedPage(html)
+    scan = DocumentScan(page.soup)
     evidence = {}
     scores = {
         "mobile": 0,
@@ -217,14 +329,14 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     rendering_limited = len(html) < 1000
     
     # 1. Mobile Readiness (10 points)
-    viewport = soup.find('meta', attrs={'name': 'viewport'})
+    viewport = page.find_meta(name='viewport')
     if viewport:
         scores["mobile"] += 6
         evidence["viewport"] = str(viewport)[:100]
     
     # Check for tap-target friendly elements
-    buttons = soup.find_all('button')
-    large_links = [a for a in soup.find_all('a') if a.get_text(strip=True)]
+    buttons = scan.tags['button']
+    large_links = [a for a in scan.tags['a'] if a.get_text(strip=True)]
     if len(buttons) > 0 or len(large_links) > 5:
         scores["mobile"] += 4
     
@@ -234,21 +346,20 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
         evidence["https"] = True
     
     # GDPR/Privacy indicators
-    privacy_links = soup.find_all('a', href=re.compile(r'privacy|cookie|gdpr', re.I))
-    privacy_text = soup.find_all(string=re.compile(r'privacy policy|cookie policy', re.I))
-    if privacy_links or privacy_text:
+    privacy_links = scan.elements["privacy_links"]
+    if privacy_links or "privacy_text" in scan.text_matches:
         scores["security"] += 4
         evidence["privacy_links"] = [str(link)[:80] for link in privacy_links[:3]]
     
     # 3. SEO Hygiene (8 points)
-    title_tag = soup.find('title')
+    title_tag = scan.tags['title'][0] if scan.tags['title'] else None
     if title_tag and title_tag.get_text(strip=True):
         title_text = title_tag.get_text(strip=True)
         if 10 <= len(title_text) <= 65:
             scores["seo"] += 4
         evidence["title"] = title_text[:100]
     
-    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    meta_desc = page.find_meta(name='description')
     if meta_desc and meta_desc.get('content'):
         desc_text = meta_desc.get('content', '')
         if 50 <= len(desc_text) <= 170:
@@ -262,24 +373,21 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     has_contact_form = False
     
     # Phone numbers (traditional detection)
-    tel_links = soup.find_all('a', href=re.compile(r'^tel:'))
-    phone_patterns = soup.find_all(string=re.compile(r'\+?\d{1,4}[\s\-]?\(?\d{1,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}'))
-    if tel_links or phone_patterns:
+    tel_links = scan.elements["tel_links"]
+    if tel_links or "phone" in scan.text_matches:
         scores["contact"] += 2
         phones_found.extend([str(tel.get('href', ''))[:50] for tel in tel_links[:2]])
     
     # Email addresses - MULTI-METHOD DETECTION
     # Method 1: Mailto links
-    mailto_links = soup.find_all('a', href=re.compile(r'^mailto:'))
-    for mailto in mailto_links:
+    for mailto in scan.elements["mailto_links"]:
         href = mailto.get('href', '').replace('mailto:', '').split('?')[0]
         if '@' in href:
             emails_found.append(href)
     
     # Method 2: Regex in text
-    email_regex = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
-    text_content = soup.get_text(separator=' ', strip=True)
-    email_matches = email_regex.findall(text_content)
+    text_content = page.text
+    email_matches = EMAIL_REGEX.findall(text_content)
     emails_found.extend(email_matches)
     
     # Method 3: Obfuscated emails (e.g., "info [at] company [dot] com")
@@ -287,7 +395,9 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     emails_found.extend(obfuscated)
     
     # Method 4: Schema.org structured data
-    schema_contact = extract_schema_org_contact(soup)
+    schema_contact = _schema_org_contact(
+        [script for script in scan.tags['script'] if script.get('type') == 'application/ld+json']
+    )
     emails_found.extend(schema_contact.get('emails', []))
     phones_found.extend(schema_contact.get('phones', []))
     
@@ -300,23 +410,21 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
         evidence["emails_found"] = emails_found[:5]
     
     # Contact forms detection
-    has_contact_form, form_types = detect_contact_forms(soup)
+    has_contact_form, form_types = _classify_forms(scan.tags['form'])
     if has_contact_form:
         scores["contact"] += 2
         evidence["contact_forms"] = form_types
         contact_items.append(f"forms: {', '.join(form_types)}")
     
     # Address or map
-    address_keywords = soup.find_all(string=re.compile(r'address|location', re.I))
-    map_embeds = soup.find_all(['iframe', 'div'], attrs={'class': re.compile(r'map', re.I)})
     schema_addresses = schema_contact.get('addresses', [])
-    if address_keywords or map_embeds or schema_addresses:
+    if "address" in scan.text_matches or scan.elements["map_embeds"] or schema_addresses:
         scores["contact"] += 1
         if schema_addresses:
             evidence["addresses"] = schema_addresses[:2]
     
     # CTA detection (bonus for strong CTAs)
-    cta_count, cta_texts = detect_cta_elements(soup)
+    cta_count, cta_texts = _cta_elements(scan.tags['cta_candidates'])
     if cta_count > 0:
         evidence["cta_buttons"] = cta_texts[:5]
         evidence["cta_count"] = cta_count
@@ -330,20 +438,18 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     }
     
     # Extract priority links for potential subpage crawling
-    priority_links = extract_priority_links(soup, final_url)
+    priority_links = _priority_links([a for a in scan.tags['a'] if a.has_attr('href')], final_url)
     if priority_links:
         evidence["priority_links"] = priority_links
     
     # 5. Content Clarity (8 points)
-    h1_tags = soup.find_all('h1')
+    h1_tags = scan.tags['h1']
     if h1_tags and h1_tags[0].get_text(strip=True):
         scores["content"] += 4
         evidence["h1"] = h1_tags[0].get_text(strip=True)[:150]
     
     # Count visible text words
-    text_content = soup.get_text(separator=' ', strip=True)
-    words = re.findall(r'\b\w+\b', text_content)
-    word_count = len(words)
+    word_count = len(WORD_REGEX.findall(text_content))
     evidence["text_word_count"] = word_count
     
     if word_count >= 200:
@@ -351,7 +457,7 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
     
     # 6. Technical Hints (6 points)
     # Modern image formats or lazy loading
-    images = soup.find_all('img')
+    images = scan.tags['img']
     modern_images = [img for img in images if img.get('loading') == 'lazy' or 
                      (img.get('src', '').endswith('.webp') or img.get('src', '').endswith('.avif'))]
     if modern_images:
@@ -359,9 +465,7 @@ def score_site_heuristics(html: str, final_url: str = "") -> Dict[str, Any]:
         evidence["images_sample"] = [str(img.get('src', ''))[:60] for img in images[:3]]
     
     # Social proof keywords
-    social_proof_keywords = ['testimonial', 'review', 'client', 'case study', 'award', 'certified']
-    social_proof_found = any(soup.find_all(string=re.compile(keyword, re.I)) for keyword in social_proof_keywords)
-    if social_proof_found:
+    if "social_proof" in scan.text_matches:
         scores["tech"] += 3
     
     total_heuristic = sum(scores.values())
@@ -0,0 +1,115 @@
+"""
+Compressed page snapshots for refetch-free re-analysis.
+The HTML a scoring run fetched (and, when it rendered, the rendered HTML it
+scored) is kept per normalized URL in a content-addressed DiskBlobStore
+(zstd-compressed, zlib when zstandard is not installed). Heuristics,
+technographics and enrichment passes can then run from the snapshot with no
+network access. Snapshots expire after SNAPSHOT_TTL_DAYS, and the oldest are
+evicted once the store exceeds SNAPSHOT_MAX_MB.
+"""
+
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from helpers.cache_store import DiskBlobStore
+
+
+# Set SNAPSHOT_DIR to an empty string to disable snapshots
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "leadblitz-snapshots")).strip()
+SNAPSHOT_TTL_DAYS = int(os.getenv("SNAPSHOT_TTL_DAYS", "30"))
+SNAPSHOT_MAX_MB = int(os.getenv("SNAPSHOT_MAX_MB", "512"))
+
+# zstd level: HTML compresses ~8-10x here at a few ms per page
+SNAPSHOT_COMPRESSION_LEVEL = 9
+
+_store: Optional[DiskBlobStore] = None
+_store_failed = False
+
+
+def _get_store() -> Optional[DiskBlobStore]:
+    """Shared snapshot store, or None when SNAPSHOT_DIR is unset or unusable."""
+    global _store, _store_failed
+    if _store is None and SNAPSHOT_DIR and not _store_failed:
+        try:
+            _store = DiskBlobStore(
+                SNAPSHOT_DIR,
+                ttl_seconds=SNAPSHOT_TTL_DAYS * 86400,
+                max_bytes=SNAPSHOT_MAX_MB * 1024 * 1024,
+                compression_level=SNAPSHOT_COMPRESSION_LEVEL,
+                codec="zstd"
+            )
+        except OSError as e:
+            _store_failed = True
+            print(f"Page snapshots disabled ({SNAPSHOT_DIR}): {e}")
+    return _store
+
+
+def _snapshot_key(url: str) -> str:
+    from helpers.hybrid_scorer import normalize_url, url_to_hash
+    return f"snapshot:{url_to_hash(normalize_url(url))}"
+
+
+def save_snapshot(url: str, final_url: str, static_html: str, rendered_html: Optional[str] = None,
+                  render_pathway: Optional[str] = None, truncated_pages: Optional[List[str]] = None,
+                  replace_rendered: bool = True) -> None:
+    """
+    Store the pages a scoring run analyzed for url (replacing any earlier snapshot).
+
+    Args:
+        url: Website URL as scored
+        final_url: URL after redirects
+        static_html: Combined static HTML of the fetched pages
+        rendered_html: The HTML actually scored, when it came from a render
+        render_pathway: Pathway of the scoring run
+        truncated_pages: Pages cut off at the fetch byte cap
+        replace_rendered: False to keep an earlier snapshot that holds rendered
+            HTML when this run has none (triage runs never render)
+    """
+    store = _get_store()
+    if store is None or not static_html:
+        return
+    if not replace_rendered and rendered_html is None:
+        existing = store.get(_snapshot_key(url))
+        if existing and existing.get("rendered_html"):
+            return
+    store.put(_snapshot_key(url), {
+        "url": url,
+        "final_url": final_url,
+        "static_html": static_html,
+        "rendered_html": rendered_html,
+        "render_pathway": render_pathway,
+        "truncated_pages": truncated_pages or [],
+    })
+
+
+def load_snapshot(url: str) -> Optional[Dict[str, Any]]:
+    """
+    Latest unexpired snapshot for url.
+
+    Returns:
+        Dict with url, final_url, static_html, rendered_html, render_pathway,
+        truncated_pages and html (the HTML that was scored), or None
+    """
+    store = _get_store()
+    if store is None:
+        return None
+    snapshot = store.get(_snapshot_key(url))
+    if snapshot is None:
+        return None
+    snapshot["html"] = snapshot.get("rendered_html") or snapshot.get("static_html", "")
+    return snapshot
+
+
+def delete_snapshot(url: str) -> None:
+    store = _get_store()
+    if store is not None:
+        store.delete(_snapshot_key(url))
+
+
+def get_snapshot_stats() -> Dict[str, Any]:
+    """Snapshot store usage (walks the store directory)."""
+    store = _get_store()
+    if store is None:
+        return {"enabled": False}
+    return {"enabled": True, "ttl_days": SNAPSHOT_TTL_DAYS, **store.get_stats()}
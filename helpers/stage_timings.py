@@ -0,0 +1,96 @@
+"""
+Per-stage latency instrumentation for the scoring pipeline.
+A StageTimer collects wall-clock spans for one scoring run; finished runs are
+aggregated in process into latency histograms keyed by render pathway and stage.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+# Most recent samples kept per (render_pathway, stage) for percentile estimates
+SAMPLES_PER_SERIES = 1000
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of samples, rounded to 3 places (None when empty)."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+class StageTimer:
+    """
+    Wall-clock timings for the stages of one scoring run, in milliseconds.
+    A stage entered more than once accumulates its durations.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block (await-safe: measures elapsed wall time)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage durations plus the run's total so far, rounded to 0.1 ms."""
+        result = {name: round(ms, 1) for name, ms in self.timings.items()}
+        result["total"] = round((time.perf_counter() - self._started) * 1000, 1)
+        return result
+
+
+_series: Dict[Tuple[str, str], Deque[float]] = {}
+_counts: Dict[Tuple[str, str], int] = {}
+_lock = threading.Lock()
+
+
+def record_timings(render_pathway: str, timings: Dict[str, float]) -> None:
+    """Add one finished run's stage timings to the in-process histograms."""
+    pathway = render_pathway or "unknown"
+    with _lock:
+        for stage, ms in timings.items():
+            key = (pathway, stage)
+            series = _series.get(key)
+            if series is None:
+                series = _series[key] = deque(maxlen=SAMPLES_PER_SERIES)
+            series.append(ms)
+            _counts[key] = _counts.get(key, 0) + 1
+
+
+def get_timing_stats() -> Dict[str, Any]:
+    """
+    Latency percentiles per render pathway and stage.
+
+    Returns:
+        {render_pathway: {stage: {count, p50_ms, p95_ms, p99_ms, max_ms}}}
+    """
+    with _lock:
+        snapshot = {key: (list(series), _counts[key]) for key, series in _series.items()}
+    stats: Dict[str, Dict[str, Any]] = {}
+    for (pathway, stage), (samples, count) in sorted(snapshot.items()):
+        stats.setdefault(pathway, {})[stage] = {
+            "count": count,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+            "max_ms": round(max(samples), 1),
+        }
+    return stats
+
+
+def reset_timing_stats() -> None:
+    with _lock:
+        _series.clear()
+        _counts.clear()
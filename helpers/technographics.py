@@ -9,13 +9,22 @@ from typing import Dict, Any, List, Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 
+from helpers.parsed_page import ParsedPage
 
-def detect_technographics(html: str, final_url: str = "", response_headers: Optional[Dict] = None) -> Dict[str, Any]:
+
+# Bump whenever detection output changes, so stored technographics are re-run
+# (see helpers.component_versions and helpers.rescore)
+TECHNOGRAPHICS_VERSION = "1"
+
+
+def detect_technographics(html: str, final_url: str = "", response_headers: Optional[Dict] = None,
+                          page: Optional[ParsedPage] = None) -> Dict[str, Any]:
     if not html or len(html.strip()) < 50:
         return _empty_technographics()
 
-    soup = BeautifulSoup(html, 'html.parser')
-    html_lower = html.lower()
+    page = page or ParsedPage(html)
+    soup = page.soup
+    html_lower = page.html_lower
 
     result = {
         "cms": detect_cms(html_lower, soup),
@@ -62,10 +62,19 @@ async def lifespan(app):
         db_session.close()
     except Exception as e:
         print(f"[STARTUP] Admin check skipped: {e}", flush=True)
+    from helpers.score_cache_retention import SCORE_CACHE_RETENTION_INTERVAL_HOURS, run_retention_loop
+    retention_task = asyncio.create_task(run_retention_loop()) if SCORE_CACHE_RETENTION_INTERVAL_HOURS > 0 else None
     logger.warning("[STARTUP] LeadBlitz server ready and accepting requests on port 5000")
     print("[STARTUP] LeadBlitz server ready and accepting requests on port 5000", flush=True)
     yield
     print("[SHUTDOWN] LeadBlitz server shutting down", flush=True)
+    if retention_task:
+        retention_task.cancel()
+    try:
+        from helpers.rendering_service import close_browser_pool
+        close_browser_pool()
+    except Exception as e:
+        print(f"[SHUTDOWN] Browser pool close skipped: {e}", flush=True)
 
 app = FastAPI(title="AI Lead Generation Tool", lifespan=lifespan)
 
@@ -1019,7 +1028,7 @@ async def dashboard_page(current_user: User = Depends(get_current_user_optional)
 
 def auto_score_leads_background(lead_dicts: list, user_id: int):
     """Background task to automatically score leads after search"""
-    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning
+    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning, get_cached_scores
     from datetime import datetime
     import concurrent.futures
     import time as time_module
@@ -1028,6 +1037,11 @@ def auto_score_leads_background(lead_dicts: list, user_id: int):
     BATCH_TOTAL_TIMEOUT = 300
     batch_start = time_module.time()
 
+    # One lookup for the whole batch; cached leads go first so they are never
+    # cut off by the batch timeout
+    cached_scores = get_cached_scores([d.get("website") for d in lead_dicts])
+    lead_dicts = sorted(lead_dicts, key=lambda d: d.get("website") not in cached_scores)
+
     for lead_dict in lead_dicts:
         if time_module.time() - batch_start >= BATCH_TOTAL_TIMEOUT:
             print(f"Auto-scoring batch timeout reached after {BATCH_TOTAL_TIMEOUT}s")
@@ -1039,9 +1053,7 @@ def auto_score_leads_background(lead_dicts: list, user_id: int):
             continue
 
         try:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(score_website_hybrid, website, True)
-                hybrid_result = future.result(timeout=PER_LEAD_TIMEOUT)
+            hybrid_result = cached_scores.get(website) or score_website_hybrid(website, True, timeout=PER_LEAD_TIMEOUT)
 
             score_reasoning = create_backward_compatible_reasoning(hybrid_result)
 
@@ -1076,7 +1088,8 @@ def auto_score_leads_background(lead_dicts: list, user_id: int):
                     score_breakdown=hybrid_result.get("breakdown"),
                     score_confidence=hybrid_result.get("confidence"),
                     last_scored_at=datetime.now(),
-                    technographics=hybrid_result.get("technographics")
+                    technographics=hybrid_result.get("technographics"),
+                    component_versions=hybrid_result.get("component_versions")
                 )
             print(f"Auto-scored lead {lead_dict.get('name', 'Unknown')}: score={score_reasoning.get('total_score', 0)}")
         except concurrent.futures.TimeoutError:
@@ -1276,8 +1289,23 @@ async def api_load_more_leads(current_user: User = Depends(get_current_user)):
 
 
 @app.post("/api/score-leads")
-async def api_score_leads(current_user: User = Depends(get_current_user)):
-    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning
+async def api_score_leads(
+    background_tasks: BackgroundTasks,
+    mode: str = "full",
+    ai_top_n: Optional[int] = None,
+    ai_min_score: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Score all active leads.
+    mode="triage" gives every lead without a full score yet a provisional
+    heuristic-only score (leads already scored are left as they are), then queues
+    the full AI review in the background for the leads selected by ai_top_n /
+    ai_min_score (credits are charged when the full review runs, and only as
+    many leads as the balance covers are queued; the rest are listed in
+    ai_review_skipped_credits).
+    """
+    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning, select_for_ai_review, get_cached_scores
     from helpers.enrichment import analyze_website, score_lead_with_ai
     from datetime import datetime
     import time as time_module
@@ -1285,13 +1313,16 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
     PER_LEAD_TIMEOUT = 30
     BATCH_TOTAL_TIMEOUT = 300
     
+    if mode not in ("full", "triage"):
+        raise HTTPException(status_code=400, detail="mode must be 'full' or 'triage'")
+    
     try:
         leads = db.get_active_leads(user_id=current_user.id)
         
         leads_with_website = [l for l in leads if l.website]
         leads_needing_first_score = [l for l in leads_with_website if l.last_scored_at is None]
         
-        if leads_needing_first_score:
+        if leads_needing_first_score and mode == "full":
             has_credits, balance, cost = credit_manager.has_sufficient_credits(
                 current_user.id, "ai_scoring", len(leads_needing_first_score)
             )
@@ -1308,12 +1339,28 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
             credits_used = 0
             failed_leads = []
             timed_out_leads = []
+            triage_scores = {}
             batch_start_time = time_module.time()
             
-            for lead in leads:
+            # Only first scores use the cache: one lookup for all of them, and
+            # the cached leads are handled first since they need no scoring run
+            cached_scores = get_cached_scores([l.website for l in leads_needing_first_score])
+            batch_leads = leads
+            if mode == "triage":
+                # Triage only covers leads without a full score: a provisional
+                # result (or a batch timeout) would overwrite the stored AI review,
+                # so leads already scored pass through before scoring starts
+                batch_leads = [l for l in leads if l.last_scored_at is None]
+                for lead in leads:
+                    if lead.last_scored_at is not None:
+                        scored_leads.append(lead.to_dict())
+                        scored_lead_ids.add(lead.id)
+            ordered_leads = sorted(batch_leads, key=lambda l: not (l.last_scored_at is None and l.website in cached_scores))
+            
+            for lead in ordered_leads:
                 elapsed_total = time_module.time() - batch_start_time
                 if elapsed_total >= BATCH_TOTAL_TIMEOUT:
-                    remaining = [l for l in leads if l.id not in scored_lead_ids and l.website]
+                    remaining = [l for l in ordered_leads if l.id not in scored_lead_ids and l.website]
                     for r in remaining:
                         timed_out_leads.append({"name": r.name, "website": r.website, "reason": "Batch timeout exceeded (5 minutes)"})
                         db.update_lead(r.id, user_id=current_user.id, score=0)
@@ -1324,9 +1371,9 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
                     
                     try:
                         use_cache = lead.last_scored_at is None
-                        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                            future = executor.submit(score_website_hybrid, lead.website, use_cache)
-                            hybrid_result = future.result(timeout=PER_LEAD_TIMEOUT)
+                        hybrid_result = (use_cache and cached_scores.get(lead.website)) or \
+                            score_website_hybrid(lead.website, use_cache, timeout=PER_LEAD_TIMEOUT, mode=mode)
+                        provisional = hybrid_result.get("provisional", False)
                     
                         render_pathway = hybrid_result.get("render_pathway", "")
                         has_errors = hybrid_result.get("has_errors", False)
@@ -1339,13 +1386,22 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
                             (not breakdown and final_score == 0)
                         )
                         
-                        if is_first_score and not scoring_failed:
+                        if is_first_score and not scoring_failed and not provisional:
                             success, _ = credit_manager.deduct_credits(
                                 current_user.id, "ai_scoring", 1,
                                 f"AI scoring for {lead.name}"
                             )
                             if not success:
-                                break
+                                # Leave the lead as it was and carry on: later leads
+                                # may be re-scores or provisional, which cost nothing
+                                failed_leads.append({
+                                    "name": lead.name,
+                                    "website": lead.website,
+                                    "reason": "Insufficient credits"
+                                })
+                                scored_leads.append(lead.to_dict())
+                                scored_lead_ids.add(lead.id)
+                                continue
                             credits_used += 1
                         
                         if scoring_failed:
@@ -1378,6 +1434,9 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
                             scored_leads.append(lead_updated.to_dict() if hasattr(lead_updated, 'to_dict') else lead_updated)
                             continue
                         
+                        if provisional:
+                            triage_scores[lead.id] = hybrid_result.get("heuristic_score", 0)
+                        
                         score_reasoning = create_backward_compatible_reasoning(hybrid_result)
                         lead_updated = db.update_lead(
                             lead.id,
@@ -1388,8 +1447,11 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
                             ai_score=hybrid_result.get("ai_score"),
                             score_breakdown=hybrid_result.get("breakdown"),
                             score_confidence=hybrid_result.get("confidence"),
-                            last_scored_at=datetime.now(),
-                            technographics=hybrid_result.get("technographics")
+                            # Provisional scores leave last_scored_at unset (update_lead
+                            # skips None), so the lead stays due for its first full scoring
+                            last_scored_at=None if provisional else datetime.now(),
+                            technographics=hybrid_result.get("technographics"),
+                            component_versions=hybrid_result.get("component_versions")
                         )
                     except concurrent.futures.TimeoutError:
                         print(f"Scoring timed out for {lead.website} (>{PER_LEAD_TIMEOUT}s)")
@@ -1430,7 +1492,13 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
                     failure_summary[reason] = []
                 failure_summary[reason].append(fl["name"])
             
+            ai_review_ids = []
+            if mode == "triage":
+                ai_review_ids = select_for_ai_review(triage_scores, top_n=ai_top_n, min_score=ai_min_score)
+            
             return {
+                "mode": mode,
+                "ai_review_queued": ai_review_ids,
                 "count": len(scored_leads),
                 "leads": scored_leads,
                 "credits_used": credits_used,
@@ -1442,6 +1510,26 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
             }
         
         result = await asyncio.to_thread(_run_batch_scoring)
+        
+        # Only queue as many full reviews as the balance covers (best triage scores first)
+        result["ai_review_skipped_credits"] = []
+        if result["ai_review_queued"]:
+            queued_ids = result["ai_review_queued"]
+            has_credits, balance, cost = credit_manager.has_sufficient_credits(
+                current_user.id, "ai_scoring", len(queued_ids)
+            )
+            if not has_credits:
+                per_lead = cost // len(queued_ids)
+                affordable = balance // per_lead if per_lead else len(queued_ids)
+                result["ai_review_queued"] = queued_ids[:affordable]
+                result["ai_review_skipped_credits"] = queued_ids[affordable:]
+        
+        if result["ai_review_queued"]:
+            queued = set(result["ai_review_queued"])
+            review_dicts = [l.to_dict() for l in leads if l.id in queued]
+            background_tasks.add_task(auto_score_leads_background, review_dicts, current_user.id)
+            print(f"Triage queued {len(review_dicts)} of {len(leads_with_website)} leads for AI review")
+        
         return result
     
     except HTTPException:
@@ -1452,10 +1540,57 @@ async def api_score_leads(current_user: User = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail="Unable to score leads right now. Please try again.")
 
 
+@app.post("/api/leads/rescore-stale")
+async def api_rescore_stale_leads(
+    background_tasks: BackgroundTasks,
+    queue_full: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bring scored leads up to the current scorer component versions.
+    Leads whose heuristics or technographics are outdated are re-analyzed and
+    recombined with their stored AI review (no AI call, no credits). Leads that
+    need a new AI review are listed, and queued for background scoring
+    when queue_full is set (charged per lead like auto-scoring; 402 if the
+    balance does not cover all of them).
+    """
+    from helpers.rescore import rescore_user_leads
+    
+    try:
+        result = await asyncio.to_thread(rescore_user_leads, current_user.id)
+        
+        result["full_rescore_queued"] = False
+        if queue_full and result["needs_full_rescore"]:
+            needs_count = len(result["needs_full_rescore"])
+            has_credits, balance, cost = credit_manager.has_sufficient_credits(
+                current_user.id, "ai_scoring", needs_count
+            )
+            if not has_credits:
+                raise HTTPException(
+                    status_code=402,
+                    detail=f"Insufficient credits. Need {cost} credits to re-score {needs_count} leads, but only have {balance}. Please purchase more credits."
+                )
+            
+            needs_full = set(result["needs_full_rescore"])
+            lead_dicts = [l.to_dict() for l in db.get_all_leads(current_user.id) if l.id in needs_full]
+            background_tasks.add_task(auto_score_leads_background, lead_dicts, current_user.id)
+            result["full_rescore_queued"] = True
+        
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Unable to re-score leads right now. Please try again.")
+
+
 @app.post("/api/score-lead/{lead_id}")
 async def api_score_single_lead(lead_id: str, current_user: User = Depends(get_current_user)):
     """Score a single lead - used for progressive scoring with real-time updates"""
-    from helpers.hybrid_scorer import score_website_hybrid, create_backward_compatible_reasoning
+    from helpers.hybrid_scorer import score_website_hybrid_async, create_backward_compatible_reasoning
+    from helpers.engine_loop import run_async
+    from helpers.deadline import DEADLINE_GRACE_SECONDS, Deadline
     from helpers.enrichment import analyze_website, score_lead_with_ai
     from datetime import datetime
     
@@ -1479,9 +1614,6 @@ async def api_score_single_lead(lead_id: str, current_user: User = Depends(get_c
                     detail=f"Insufficient credits. Need 1 credit but only have {balance}."
                 )
         
-        def _do_single_score(website, use_cache):
-            return score_website_hybrid(website, use_cache=use_cache)
-        
         def _do_legacy_score(website, lead_dict):
             wa = analyze_website(website)
             return score_lead_with_ai(lead_dict, wa)
@@ -1489,8 +1621,10 @@ async def api_score_single_lead(lead_id: str, current_user: User = Depends(get_c
         try:
             use_cache = lead.last_scored_at is None
             hybrid_result = await asyncio.wait_for(
-                asyncio.to_thread(_do_single_score, lead.website, use_cache),
-                timeout=45.0
+                run_async(score_website_hybrid_async(
+                    lead.website, use_cache=use_cache, priority="interactive", deadline=Deadline(45.0)
+                )),
+                timeout=45.0 + DEADLINE_GRACE_SECONDS
             )
             
             render_pathway = hybrid_result.get("render_pathway", "")
@@ -1537,7 +1671,8 @@ async def api_score_single_lead(lead_id: str, current_user: User = Depends(get_c
                     score_breakdown=hybrid_result.get("breakdown"),
                     score_confidence=hybrid_result.get("confidence"),
                     last_scored_at=datetime.now(),
-                    technographics=hybrid_result.get("technographics")
+                    technographics=hybrid_result.get("technographics"),
+                    component_versions=hybrid_result.get("component_versions")
                 )
             
             return {
@@ -1670,6 +1805,9 @@ async def api_csv_template(current_user: User = Depends(get_current_user)):
 @app.post("/api/leads/import-csv")
 async def api_import_csv(
     file: UploadFile = File(...),
+    mode: str = "full",
+    ai_top_n: Optional[int] = None,
+    ai_min_score: Optional[int] = None,
     current_user: User = Depends(get_current_user)
 ):
     from helpers.csv_import import (
@@ -1677,6 +1815,9 @@ async def api_import_csv(
         score_import_leads_background
     )
 
+    if mode not in ("full", "triage"):
+        raise HTTPException(status_code=400, detail="mode must be 'full' or 'triage'")
+
     if not file.filename or not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail={
             "error": "invalid_format",
@@ -1699,7 +1840,10 @@ async def api_import_csv(
 
     lead_ids_to_score = result.pop("_lead_ids_to_score", [])
     if lead_ids_to_score:
-        score_import_leads_background(lead_ids_to_score, import_id, current_user.id)
+        score_import_leads_background(
+            lead_ids_to_score, import_id, current_user.id,
+            mode=mode, ai_top_n=ai_top_n, ai_min_score=ai_min_score
+        )
 
     return result
 
@@ -3903,6 +4047,49 @@ async def admin_toggle_admin(request: AdminToggleAdminRequest, current_user: Use
         db_session.close()
 
 
+@app.get("/api/admin/rendering/stats")
+async def admin_rendering_stats(current_user: User = Depends(require_admin)):
+    from helpers.rendering_service import get_cache_stats, get_pool_stats, get_render_queue_stats
+    return {
+        "render_cache": get_cache_stats(),
+        "browser_pool": get_pool_stats(),
+        "render_queue": get_render_queue_stats(),
+    }
+
+
+@app.get("/api/admin/scoring/metrics")
+async def admin_scoring_metrics(current_user: User = Depends(require_admin)):
+    from helpers.stage_timings import get_timing_stats
+    from helpers.ai_scorer import get_review_cache_stats
+    from helpers.http_client import get_client_stats
+    from helpers.single_flight import get_single_flight_stats
+    from helpers.hybrid_scorer import get_negative_cache_stats, get_score_cache_stats
+    from helpers.site_fetcher import get_fetch_stats
+    from helpers.snapshot_store import get_snapshot_stats
+    return {
+        "stage_latency": get_timing_stats(),
+        "ai_review_cache": get_review_cache_stats(),
+        "http_client": get_client_stats(),
+        "fetch": get_fetch_stats(),
+        "single_flight": get_single_flight_stats(),
+        "score_cache": get_score_cache_stats(),
+        "negative_cache": await asyncio.to_thread(get_negative_cache_stats),
+        "snapshots": await asyncio.to_thread(get_snapshot_stats),
+    }
+
+
+@app.get("/api/admin/score-cache/report")
+async def admin_score_cache_report(top_n: int = 20, current_user: User = Depends(require_admin)):
+    from helpers.score_cache_retention import get_score_cache_report
+    return await asyncio.to_thread(get_score_cache_report, safe_int(top_n, default=20, min_val=0, max_val=200))
+
+
+@app.post("/api/admin/score-cache/prune")
+async def admin_score_cache_prune(current_user: User = Depends(require_admin)):
+    from helpers.score_cache_retention import prune_score_cache
+    return await asyncio.to_thread(prune_score_cache)
+
+
 import re
 
 def validate_email_format(email: str) -> bool:
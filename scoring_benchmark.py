@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Offline scoring benchmark.
+Scores a synthetic corpus of small-business sites (static, WordPress, Wix, SPA
+shells and bot-block pages) served from a local HTTP stub, with the OpenAI API
+replaced by a local stub, and reports throughput, per-stage latency and peak
+RSS for score_website_hybrid(). Given a baseline report it exits non-zero when
+the run regresses past the threshold, so it can gate performance changes.
+
+Usage:
+    python scoring_benchmark.py --output bench_baseline.json
+    python scoring_benchmark.py --baseline bench_baseline.json --threshold 0.15
+
+Every site gets its own loopback address (127.0.x.y), so per-domain state such
+as the negative cache and the crawl politeness gates behaves as it does across
+real domains; this needs Linux, which routes all of 127.0.0.0/8 to lo.
+
+DATABASE_URL defaults to a throwaway SQLite file. Point it at a scratch
+Postgres database to include production cache I/O in the numbers. SPA shells
+and block pages go through Playwright as in production, so install Chromium
+(playwright install chromium) for representative render timings.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Share of the corpus per site kind
+CORPUS_MIX = [
+    ("static", 0.35),
+    ("wordpress", 0.25),
+    ("wix", 0.15),
+    ("spa", 0.15),
+    ("blocked", 0.10),
+]
+
+# Regression gates: metric path in the report, and whether higher is better
+GATED_METRICS = [
+    ("leads_per_sec", True),
+    ("latency_ms.p50", False),
+    ("latency_ms.p95", False),
+    ("peak_rss_mb", False),
+]
+
+TRADES = ["Plumbing", "Roofing", "Dental", "Bakery", "Landscaping", "Auto Repair", "Salon",
+          "Law Office", "Cleaning", "Fitness", "Electrical", "Pet Grooming", "Florist", "Cafe"]
+TOWNS = ["Oxford", "Baltimore", "Leeds", "Austin", "Dayton", "Bristol", "Tacoma", "Norwich",
+         "Fresno", "Utrecht", "Galway", "Boise"]
+FILLER = ("We are a family-owned business serving the local community for over twenty years. "
+          "Our team of certified professionals takes pride in honest pricing, quality work and "
+          "friendly service. Call today for a free estimate and find out why our neighbours "
+          "keep coming back. ")
+TESTIMONIALS = ["\"Fantastic service, would recommend to anyone!\" - Sarah K.",
+                "\"On time, on budget and really friendly.\" - Mike D.",
+                "\"Best in town, we have used them for years.\" - The Patels"]
+
+Page = Tuple[int, Dict[str, str], bytes]
+
+
+# ---------------------------------------------------------------------------
+# Corpus
+# ---------------------------------------------------------------------------
+
+def _html(title: str, head: str, body: str) -> bytes:
+    return (f"<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+            f"<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">"
+            f"<title>{title}</title>{head}</head><body>{body}</body></html>").encode()
+
+
+def _ok(body: bytes, content_type: str = "text/html; charset=utf-8") -> Page:
+    return 200, {"Content-Type": content_type}, body
+
+
+def _content_pages(rng: random.Random, name: str, town: str, head: str,
+                   wrap=lambda body: body) -> Dict[str, Page]:
+    """Homepage plus contact/about/services pages for a server-rendered site."""
+    phone = f"({rng.randint(200, 989)}) 555-{rng.randint(1000, 9999)}"
+    email = f"info@{name.lower().replace(' ', '')}.example"
+    nav = ("<nav><a href=\"/\">Home</a> <a href=\"/services\">Services</a> "
+           "<a href=\"/about\">About</a> <a href=\"/contact\">Contact Us</a></nav>")
+    cta = rng.choice(["<a class=\"btn\" href=\"/contact\">Get a Free Quote</a>",
+                      "<button>Book Now</button>", ""])
+    proof = "".join(f"<blockquote>{t}</blockquote>" for t in rng.sample(TESTIMONIALS, rng.randint(0, 3)))
+    paragraphs = "".join(f"<p>{FILLER}</p>" for _ in range(rng.randint(1, 6)))
+    images = "".join(f"<img src=\"/img/{i}.jpg\" alt=\"{name} work photo {i}\">"
+                     for i in range(rng.randint(0, 4)))
+    home = wrap(f"<header>{nav}</header><h1>{name} in {town}</h1>"
+                f"<h2>Trusted {town} professionals</h2>{cta}{paragraphs}{images}{proof}"
+                f"<footer>Call {phone} or email {email}</footer>")
+    pages = {
+        "/": _ok(_html(f"{name} | {town}", head, home)),
+        "/contact": _ok(_html(f"Contact | {name}", head, wrap(
+            f"{nav}<h1>Contact us</h1><p>Phone: <a href=\"tel:{phone}\">{phone}</a></p>"
+            f"<p>Email: <a href=\"mailto:{email}\">{email}</a></p>"
+            "<form><input name=\"name\"><textarea name=\"message\"></textarea>"
+            "<button type=\"submit\">Send</button></form>"))),
+        "/services": _ok(_html(f"Services | {name}", head, wrap(
+            f"{nav}<h1>Our services</h1><ul>"
+            + "".join(f"<li>Service {i}: {FILLER[:80]}</li>" for i in range(rng.randint(2, 8)))
+            + "</ul>"))),
+    }
+    if rng.random() < 0.7:
+        pages["/about"] = _ok(_html(f"About | {name}", head, wrap(f"{nav}<h1>About {name}</h1><p>{FILLER}</p>")))
+    return pages
+
+
+def _static_site(rng: random.Random, name: str, town: str) -> Dict[str, Page]:
+    head = "<link rel=\"stylesheet\" href=\"/style.css\">"
+    if rng.random() < 0.5:
+        head += "<script async src=\"https://www.googletagmanager.com/gtag/js?id=G-BENCH\"></script>"
+    return _content_pages(rng, name, town, head)
+
+
+def _wordpress_site(rng: random.Random, name: str, town: str) -> Dict[str, Page]:
+    version = rng.choice(["5.8.3", "6.2.2", "6.4.2"])
+    head = (f"<meta name=\"generator\" content=\"WordPress {version}\">"
+            "<link rel=\"stylesheet\" href=\"/wp-content/themes/astra/style.css?ver=4.1\">"
+            "<link rel=\"stylesheet\" href=\"/wp-content/plugins/elementor/assets/css/frontend.min.css\">"
+            "<script src=\"/wp-includes/js/jquery/jquery.min.js?ver=3.7.1\"></script>"
+            "<link rel=\"https://api.w.org/\" href=\"/wp-json/\">")
+    return _content_pages(rng, name, town, head,
+                          wrap=lambda body: f"<div id=\"page\" class=\"site\">{body}</div>")
+
+
+def _wix_site(rng: random.Random, name: str, town: str) -> Dict[str, Page]:
+    state = json.dumps({"siteId": hashlib.md5(name.encode()).hexdigest(), "pages": list(range(40))})
+    head = ("<meta name=\"generator\" content=\"Wix.com Website Builder\">"
+            "<script src=\"https://static.parastorage.com/unpkg/requirejs-bolt@2.3.6/requirejs.min.js\"></script>"
+            f"<script>window.viewerModel = {state};</script>")
+    return _content_pages(rng, name, town, head,
+                          wrap=lambda body: f"<div id=\"SITE_CONTAINER\"><main id=\"PAGES_CONTAINER\">{body}</main></div>")
+
+
+def _spa_site(rng: random.Random, name: str, town: str) -> Dict[str, Page]:
+    bundle = f"/static/js/main.{hashlib.md5(name.encode()).hexdigest()[:8]}.chunk.js"
+    shell = _html(name, f"<script defer src=\"{bundle}\"></script>",
+                  "<noscript>You need to enable JavaScript to run this app.</noscript><div id=\"root\"></div>")
+    script = (f"document.getElementById('root').innerHTML = '<h1>{name} in {town}</h1>"
+              f"<p>{FILLER}</p><a href=\"/contact\">Contact</a>';").encode()
+    return {
+        "/": _ok(shell),
+        bundle: _ok(script, "application/javascript"),
+    }
+
+
+def _blocked_site(rng: random.Random, name: str, town: str) -> Dict[str, Page]:
+    body = _html("Attention Required! | Cloudflare", "",
+                 "<h1>Sorry, you have been blocked</h1><p>You are unable to access this website.</p>"
+                 f"<p>Cloudflare Ray ID: {rng.getrandbits(64):016x}</p>"
+                 "<div id=\"challenge-platform\"></div>")
+    return {"/": (403, {"Content-Type": "text/html; charset=utf-8", "Server": "cloudflare"}, body)}
+
+
+SITE_BUILDERS = {
+    "static": _static_site,
+    "wordpress": _wordpress_site,
+    "wix": _wix_site,
+    "spa": _spa_site,
+    "blocked": _blocked_site,
+}
+
+
+def build_corpus(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic corpus of synthetic small-business sites.
+
+    Args:
+        count: Number of sites
+        seed: RNG seed; the same seed always yields the same corpus
+
+    Returns:
+        List of {ip, kind, name, pages}, pages mapping path -> (status, headers, body)
+    """
+    rng = random.Random(seed)
+    kinds = [kind for kind, share in CORPUS_MIX for _ in range(round(share * count))]
+    kinds = (kinds + ["static"] * count)[:count]
+    rng.shuffle(kinds)
+    corpus = []
+    for index, kind in enumerate(kinds):
+        name = f"{rng.choice(TOWNS)} {rng.choice(TRADES)} {index}"
+        town = rng.choice(TOWNS)
+        corpus.append({
+            # 127.0.1.1 upwards; 127.0.0.1 is left to the stubs themselves
+            "ip": f"127.0.{1 + index // 250}.{1 + index % 250}",
+            "kind": kind,
+            "name": name,
+            "pages": SITE_BUILDERS[kind](rng, name, town),
+        })
+    return corpus
+
+
+# ---------------------------------------------------------------------------
+# Stub servers
+# ---------------------------------------------------------------------------
+
+class _SiteHandler(BaseHTTPRequestHandler):
+    """Serves the corpus, choosing the site by the loopback address that was dialled."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        site = self.server.sites.get(self.connection.getsockname()[0])
+        page = site["pages"].get(self.path.split("?")[0].rstrip("/") or "/") if site else None
+        status, headers, body = page or (404, {"Content-Type": "text/html"}, b"<h1>Not Found</h1>")
+        self.send_response(status)
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _OpenAIHandler(BaseHTTPRequestHandler):
+    """Answers /v1/chat/completions with a review derived from the prompt, after a fixed delay."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        request = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        # The site stub's port changes between runs; keep reviews comparable
+        digest = hashlib.sha256(request.replace(self.server.site_port, b"")).digest()
+        review = {
+            "category_scores": {"brand": digest[0] % 13, "visual": digest[1] % 11,
+                                "conversion": digest[2] % 13, "trust": digest[3] % 11, "a11y": digest[4] % 7},
+            "confidence": 0.8,
+            "insufficient_evidence": False,
+            "justifications": {"brand": "Benchmark stub review"},
+            "plain_english_report": {"strengths": ["Stub"], "weaknesses": ["Stub"],
+                                     "technology_observations": "Stub", "sales_opportunities": ["Stub"]},
+        }
+        body = json.dumps({
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": json.dumps(review)}}],
+            "usage": {"prompt_tokens": len(request) // 4, "completion_tokens": 200,
+                      "total_tokens": len(request) // 4 + 200},
+        }).encode()
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(handler, host: str, **attrs) -> ThreadingHTTPServer:
+    ThreadingHTTPServer.request_queue_size = 256
+    server = ThreadingHTTPServer((host, 0), handler)
+    server.daemon_threads = True
+    for name, value in attrs.items():
+        setattr(server, name, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ---------------------------------------------------------------------------
+# Run and report
+# ---------------------------------------------------------------------------
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    from helpers.stage_timings import percentile
+    return percentile(samples, pct)
+
+
+def _peak_rss_mb() -> Dict[str, float]:
+    # ru_maxrss is in KiB on Linux
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+    }
+
+
+def run_benchmark(sites: int = 300, concurrency: int = 16, seed: int = 1,
+                  timeout: float = 30.0, ai_latency_ms: int = 50) -> Dict[str, Any]:
+    """
+    Score the synthetic corpus and collect throughput, latency and memory figures.
+
+    Args:
+        sites: Corpus size
+        concurrency: Leads scored in parallel (worker threads calling score_website_hybrid)
+        seed: Corpus seed
+        timeout: Per-lead scoring budget in seconds
+        ai_latency_ms: Delay added by the stub OpenAI endpoint per review
+
+    Returns:
+        Report dict (see --output)
+    """
+    corpus = build_corpus(sites + 3, seed)
+    warmup, corpus = corpus[:3], corpus[3:]
+    site_server = _serve(_SiteHandler, "0.0.0.0", sites={site["ip"]: site for site in warmup + corpus})
+    port = site_server.server_address[1]
+    ai_server = _serve(_OpenAIHandler, "127.0.0.1", latency=ai_latency_ms / 1000, site_port=f":{port}".encode())
+
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{ai_server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "sk-benchmark"
+    if not os.getenv("DATABASE_URL"):
+        os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='scoring-bench-')}/bench.db"
+
+    from helpers.models import init_db
+    from helpers.hybrid_scorer import score_website_hybrid
+    from helpers.stage_timings import get_timing_stats, reset_timing_stats
+    init_db()
+
+    def score(site: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"http://{site['ip']}:{port}/"
+        started = time.perf_counter()
+        try:
+            result = score_website_hybrid(url, timeout=timeout)
+            outcome = {"render_pathway": result.get("render_pathway"), "final_score": result.get("final_score")}
+        except Exception as e:
+            outcome = {"render_pathway": "error", "final_score": None, "error": f"{type(e).__name__}: {str(e)[:100]}"}
+        outcome.update(kind=site["kind"], url=url, seconds=time.perf_counter() - started)
+        return outcome
+
+    for site in warmup:
+        score(site)
+    reset_timing_stats()
+
+    print(f"🏁 Scoring {len(corpus)} sites, concurrency {concurrency}...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(score, corpus))
+    elapsed = time.perf_counter() - started
+    site_server.shutdown()
+    ai_server.shutdown()
+
+    latencies = [outcome["seconds"] * 1000 for outcome in outcomes]
+    pathways: Dict[str, int] = {}
+    for outcome in outcomes:
+        pathways[outcome["render_pathway"]] = pathways.get(outcome["render_pathway"], 0) + 1
+    rss = _peak_rss_mb()
+    return {
+        "config": {"sites": len(corpus), "concurrency": concurrency, "seed": seed,
+                   "timeout": timeout, "ai_latency_ms": ai_latency_ms,
+                   "database": os.environ["DATABASE_URL"].split(":", 1)[0]},
+        "elapsed_seconds": round(elapsed, 2),
+        "leads_per_sec": round(len(corpus) / elapsed, 2),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "max": round(max(latencies), 1),
+        },
+        "peak_rss_mb": rss["self"],
+        "peak_child_rss_mb": rss["children"],
+        "render_pathways": dict(sorted(pathways.items())),
+        "errors": [outcome for outcome in outcomes if outcome.get("error")][:20],
+        "stage_latency": get_timing_stats(),
+        "scores": {f"{outcome['kind']}:{index}": outcome["final_score"] for index, outcome in enumerate(outcomes)},
+    }
+
+
+def _metric(report: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = report
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Regressions of report against baseline.
+
+    Args:
+        report: This run's report
+        baseline: An earlier report for the same corpus
+        threshold: Allowed relative slowdown, e.g. 0.15 for 15%
+
+    Returns:
+        One message per gated metric that regressed past threshold, plus one
+        if any lead's score changed (the corpus and AI stub are deterministic)
+    """
+    regressions = []
+    for path, higher_is_better in GATED_METRICS:
+        current, previous = _metric(report, path), _metric(baseline, path)
+        if not current or not previous:
+            continue
+        change = (current - previous) / previous
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append(f"{path}: {previous} -> {current} ({change:+.1%}, threshold {threshold:.0%})")
+    if baseline.get("config", {}).get("seed") == report["config"]["seed"]:
+        changed = [key for key, score in report["scores"].items()
+                   if key in baseline.get("scores", {}) and baseline["scores"][key] != score]
+        if changed:
+            regressions.append(f"scores changed for {len(changed)} leads (e.g. {', '.join(changed[:5])})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline scoring benchmark against a synthetic site corpus")
+    parser.add_argument("--sites", type=int, default=300, help="corpus size (default 300)")
+    parser.add_argument("--concurrency", type=int, default=16, help="leads scored in parallel (default 16)")
+    parser.add_argument("--seed", type=int, default=1, help="corpus seed (default 1)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-lead scoring budget in seconds")
+    parser.add_argument("--ai-latency-ms", type=int, default=50, help="stub OpenAI response delay (default 50)")
+    parser.add_argument("--output", help="write the JSON report here (e.g. to use as a baseline)")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed relative regression before failing (default 0.15)")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sites, args.concurrency, args.seed, args.timeout, args.ai_latency_ms)
+
+    print("=" * 60)
+    print(f"⚡ {report['leads_per_sec']} leads/sec ({report['config']['sites']} sites in {report['elapsed_seconds']}s)")
+    print(f"⏱️  latency p50 {report['latency_ms']['p50']}ms, p95 {report['latency_ms']['p95']}ms, "
+          f"p99 {report['latency_ms']['p99']}ms")
+    print(f"🧠 peak RSS {report['peak_rss_mb']} MB (children {report['peak_child_rss_mb']} MB)")
+    print(f"🛣️  pathways: {report['render_pathways']}")
+    for pathway, stages in report["stage_latency"].items():
+        print(f"   {pathway}: " + ", ".join(f"{stage} p50 {s['p50_ms']}ms" for stage, s in stages.items()))
+    if report["errors"]:
+        print(f"❌ {len(report['errors'])} errors, first: {report['errors'][0]['error']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5860,7 +5860,7 @@ function startCsvProgressPolling(importId, total) {
             if (!resp.ok) { clearInterval(csvImportPollingId); return; }
             const status = await resp.json();
 
-            const done = status.scored + status.unreachable;
+            const done = status.scored + (status.triaged || 0) + status.unreachable;
             const pct = total > 0 ? Math.round((done / total) * 100) : 0;
             barEl.style.width = pct + '%';
             countEl.textContent = `${done}/${total} complete`;
@@ -5873,6 +5873,7 @@ function startCsvProgressPolling(importId, total) {
                 barEl.style.width = '100%';
 
                 let msg = `Import complete - ${status.scored} scored`;
+                if (status.triaged > 0) msg += `, ${status.triaged} triaged`;
                 if (status.unreachable > 0) msg += `, ${status.unreachable} unreachable`;
                 if (status.pending_credits > 0) {
                     showToast(`Scored ${status.scored} of ${total} leads. Upgrade to score the remaining ${status.pending_credits}.`, 'info', 8000);
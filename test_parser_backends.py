@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for the pluggable HTML parser backends.
+Every installed backend must give the same analyzer results as html.parser.
+"""
+
+import pytest
+
+from helpers.parsed_page import ParsedPage, available_parser_backends
+from helpers.site_heuristics import score_site_heuristics
+from helpers.technographics import detect_technographics
+from helpers.framework_detector import detect_js_framework
+from helpers.site_fetcher import extract_site_content_for_ai
+
+
+FINAL_URL = "https://joesplumbing.co.uk/"
+
+STATIC_SITE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<title>Joe's Plumbing &amp; Heating - Oxford</title>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<meta name="description" content="Family run plumbing and heating engineers serving Oxford and the surrounding villages for 30 years.">
+<meta property="og:title" content="Joe's Plumbing">
+<link rel="icon" href="/favicon.ico">
+<script type="application/ld+json">{"@type": "Plumber", "email": "mailto:office@joesplumbing.co.uk", "telephone": "+44 1865 000000", "address": {"streetAddress": "1 High St", "addressLocality": "Oxford"}}</script>
+</head>
+<body>
+<nav><a href="/">Home</a><a href="/contact-us">Contact us</a><a href="/about">About</a><a class="btn btn-primary" href="/quote">Get a free quote</a></nav>
+<h1>Emergency plumbers in Oxford</h1>
+<h2>What our clients say</h2>
+<p>Call 01865 123456 or email info [at] joesplumbing [dot] co [dot] uk. Our address: 1 High St, Oxford.</p>
+<p>Testimonial: "Fantastic service" - certified Gas Safe engineers, award winning team.</p>
+<form action="/contact"><input type="email" name="email"><textarea name="message"></textarea><button>Send message</button></form>
+<img src="/van.webp" alt="Our van" loading="lazy"><img src="/team.jpg" alt="The team">
+<a href="https://facebook.com/joesplumbing">Facebook</a><a href="https://instagram.com/joesplumbing">Instagram</a>
+<a href="/privacy-policy">Privacy Policy</a><a href="tel:+441865123456">Call now</a>
+</body>
+</html>"""
+
+WORDPRESS_SITE = """<!DOCTYPE html>
+<html><head><title>Oxford Dental Care</title>
+<meta name="generator" content="WordPress 5.8.1">
+<link rel="stylesheet" href="https://fonts.googleapis.com/css?family=Open+Sans">
+<link rel="stylesheet" href="/wp-content/themes/dental/style.css">
+<script src="https://oxforddental.co.uk/wp-includes/js/jquery/jquery.min.js?ver=3.6.0"></script>
+<script>gtag('config', 'G-XXXX'); fbq('init', '123');</script>
+<style>.cta { color: red; }</style>
+</head><body class="home page-template">
+<div class="cookie-notice">We use cookies</div>
+<header><a href="/book-appointment" class="cta">Book now</a></header>
+<h1>Gentle dentistry for the whole family</h1>
+<p>""" + " ".join(["Our friendly dentists offer check-ups, hygiene and cosmetic treatments."] * 25) + """</p>
+<div class="map-container"><iframe class="google-map" src="https://maps.google.com/embed"></iframe></div>
+<a href="mailto:reception@oxforddental.co.uk?subject=Enquiry">Email reception</a>
+<table><tr><td>Mon<td>9-5<tr><td>Tue<td>9-5</table>
+<p>Unclosed paragraph<p>Another paragraph with review stars
+</body></html>"""
+
+SPA_SHELL = """<!DOCTYPE html>
+<html><head><title>App</title>
+<script src="/static/js/main.3f2a1b.js"></script>
+<script src="/static/js/vendor.9c8d7e.js"></script>
+<script>window.__INITIAL_STATE__ = {"user": null, "items": []};</script>
+</head><body>
+<noscript>You need to enable JavaScript to run this app. <a href="/noscript-contact">Contact</a></noscript>
+<div id="root"></div>
+</body></html>"""
+
+MULTI_PAGE = (
+    "\n\n<!-- Page: homepage -->\n" + STATIC_SITE
+    + "\n\n<!-- Page: contact -->\n"
+    + "<html><head><title>Contact Joe's Plumbing</title></head><body>"
+    + "<h1>Get in <noscript>(js)</noscript>touch</h1><p>Email bookings@joesplumbing.co.uk</p>"
+    + "<form><input name='q'> Subscribe to our newsletter</form></body></html>"
+)
+
+DOCUMENTS = {
+    "static": STATIC_SITE,
+    "wordpress": WORDPRESS_SITE,
+    "spa_shell": SPA_SHELL,
+    "multi_page": MULTI_PAGE,
+}
+
+BACKENDS = available_parser_backends()
+
+
+def _analyze(html, backend):
+    page = ParsedPage(html, FINAL_URL, parser=backend)
+    return {
+        "heuristics": score_site_heuristics(html, FINAL_URL, page=page),
+        "technographics": detect_technographics(html, FINAL_URL, page=page),
+        "framework": detect_js_framework(html, page=page),
+        "content": extract_site_content_for_ai(html, page=page),
+    }
+
+
+def _normalize(result):
+    # Evidence lists built from sets have no stable order
+    heuristics = result["heuristics"]
+    evidence = heuristics.get("evidence", {})
+    for key in ("emails_found", "contact_forms"):
+        if key in evidence:
+            evidence[key] = sorted(evidence[key])
+    summary = evidence.get("contact_detection_summary", {})
+    if "forms" in summary:
+        summary["forms"] = sorted(summary["forms"])
+    if "contact_items" in evidence:
+        evidence["contact_items"] = sorted(evidence["contact_items"])
+    result["framework"]["framework_hints"] = sorted(result["framework"]["framework_hints"])
+    return result
+
+
+def test_html_parser_always_available():
+    assert "html.parser" in BACKENDS
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != "html.parser"])
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_backend_matches_html_parser(backend, name):
+    html = DOCUMENTS[name]
+    expected = _normalize(_analyze(html, "html.parser"))
+    actual = _normalize(_analyze(html, backend))
+    for analyzer in expected:
+        assert actual[analyzer] == expected[analyzer], f"{analyzer} differs on {backend} for {name}"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", sorted(DOCUMENTS))
+def test_parsed_page_text_matches_soup(backend, name):
+    from bs4 import BeautifulSoup
+
+    html = DOCUMENTS[name]
+    page = ParsedPage(html, FINAL_URL, parser=backend)
+    assert page.text == BeautifulSoup(html, backend).get_text(separator=' ', strip=True)
+
+    stripped = BeautifulSoup(html, backend)
+    for tag in stripped(['script', 'style', 'noscript']):
+        tag.decompose()
+    assert page.visible_text == stripped.get_text(separator=' ', strip=True)